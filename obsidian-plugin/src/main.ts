@@ -205,7 +205,7 @@ export default class MindLitePlugin extends Plugin {
       name: "Mind Lite: Weekly Deep Review",
       callback: async () => {
         try {
-          const response = await apiGet<JSONValue>("/runs");
+          const response = await apiGet<JSONValue>("/runs?order=desc");
           const runs = parseRunHistoryEntries(response);
           new RunHistoryModal(this.app, runs).open();
         } catch (error) {
@@ -198,7 +198,7 @@ async function run() {
         };
       }
 
-      if (url.endsWith("/runs")) {
+      if (url.endsWith("/runs?order=desc")) {
         return {
           ok: true,
           status: 200,
@@ -250,7 +250,7 @@ async function run() {
     await new Promise((resolve) => setTimeout(resolve, 0));
 
     assert.deepEqual(fetchCalls[1], {
-      url: "http://localhost:8000/runs",
+      url: "http://localhost:8000/runs?order=desc",
       method: "GET",
       body: undefined
     });
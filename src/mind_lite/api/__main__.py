@@ -5,7 +5,8 @@ from mind_lite.api.http_server import create_server
 
 def main() -> None:
     state_file = os.environ.get("MIND_LITE_STATE_FILE")
-    server = create_server(host="127.0.0.1", port=8000, state_file=state_file)
+    api_token = os.environ.get("MIND_LITE_API_TOKEN") or None
+    server = create_server(host="127.0.0.1", port=8000, state_file=state_file, api_token=api_token)
     print("Mind Lite API listening on http://127.0.0.1:8000")
     server.serve_forever()
 
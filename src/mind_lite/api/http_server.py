@@ -2,382 +2,245 @@ import json
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import parse_qs, urlsplit
 
+from mind_lite.api.routing import (
+    EVENT_STREAM_CONTENT_TYPE,
+    BodySchema,
+    Field,
+    Middleware,
+    Request,
+    Response,
+    Router,
+    bearer_auth_middleware,
+    gzip_middleware,
+    not_found_when,
+    status_when,
+    timing_middleware,
+)
 from mind_lite.api.service import ApiService
-
-
-def create_server(host: str = "127.0.0.1", port: int = 8000, state_file: str | None = None) -> ThreadingHTTPServer:
-    service = ApiService(state_file=state_file)
+from mind_lite.metrics import observe_request
+
+RUN_FILTERS = ("state", "created_after", "created_before", "order", "cursor", "limit")
+PROPOSAL_FILTERS = ("risk_tier", "action_mode", "status", "change_type", "cursor", "limit")
+
+# Only fields the service checks before anything else (such as a replay
+# lookup) are declared, so a request fails here exactly as it would there.
+_EVENT_ID = Field("event_id", required=False)
+ASK_BODY = BodySchema((Field("query"), _EVENT_ID))
+REPLAYED_PUBLISH_BODY = BodySchema((_EVENT_ID,))
+PUBLISH_DRAFT_BODY = BodySchema((Field("draft_id"), Field("title"), Field("prepared_content")))
+PUBLISH_PREPARE_BODY = BodySchema((Field("draft_id"), Field("content"), Field("target")))
+NOTES_BODY = BodySchema((Field("notes", kind="list"),))
+LINKS_PROPOSE_BODY = BodySchema((Field("source_note_id"), Field("candidate_notes", kind="list")))
+LINKS_APPLY_BODY = BodySchema((Field("source_note_id"), _EVENT_ID))
+RAG_RETRIEVE_BODY = BodySchema((Field("query"),))
+
+
+def _query_filters(query: dict[str, list[str]], keys: tuple[str, ...]) -> dict:
+    filters = {}
+    for key in keys:
+        values = query.get(key)
+        if values:
+            filters[key] = values[-1]
+    return filters
+
+
+def build_router(service: ApiService, middleware: list[Middleware] | None = None) -> Router:
+    """Route table of the Mind Lite HTTP API."""
+    router = Router(middleware)
+    run_not_found = not_found_when("unknown run id")
+    always_not_found = not_found_when("")
+    index_running = status_when("index already running", 409)
+
+    router.get("/health", lambda request: service.health())
+    router.get("/health/ready", lambda request: service.health_ready())
+    router.get(
+        "/metrics",
+        lambda request: Response(200, service.metrics(), "text/plain; version=0.0.4"),
+    )
+    router.get("/runs", lambda request: service.list_runs(_query_filters(request.query, RUN_FILTERS)))
+    router.get("/runs/{run_id}", lambda request: service.get_run(request.params["run_id"]), error_status=always_not_found)
+    router.get(
+        "/runs/{run_id}/proposals",
+        lambda request: service.get_run_proposals(
+            request.params["run_id"], _query_filters(request.query, PROPOSAL_FILTERS)
+        ),
+        error_status=run_not_found,
+    )
+    router.get("/policy/sensitivity", lambda request: service.get_sensitivity_policy())
+    router.get("/policy/routing", lambda request: service.get_routing_policy())
+    router.get("/publish/gom-queue", lambda request: service.list_gom_queue())
+    router.get("/publish/revision-queue", lambda request: service.list_revision_queue())
+    router.get("/publish/published", lambda request: service.list_published())
+    router.get("/rag/status", lambda request: service.rag_status())
+    router.get("/llm/models", lambda request: service.llm_list_models())
+    router.get("/llm/config", lambda request: service.llm_get_config())
+    router.get("/jobs", lambda request: service.list_jobs())
+    router.get("/jobs/{job_id}", lambda request: service.get_job(request.params["job_id"]), error_status=always_not_found)
+
+    router.post("/onboarding/analyze-folder", lambda request: service.analyze_folder(request.body))
+    router.post("/onboarding/analyze-folders", lambda request: service.analyze_folders(request.body))
+    router.post("/policy/sensitivity/check", lambda request: service.check_sensitivity(request.body))
+    router.post("/ask", lambda request: service.ask(request.body), body=ASK_BODY)
+    router.post(
+        "/ask/stream",
+        lambda request: Response(200, service.ask_stream(request.body), EVENT_STREAM_CONTENT_TYPE),
+        body=ASK_BODY,
+    )
+    router.post("/publish/score", lambda request: service.publish_score(request.body))
+    router.post(
+        "/publish/prepare", lambda request: service.publish_prepare(request.body), body=PUBLISH_PREPARE_BODY
+    )
+    router.post(
+        "/publish/mark-for-gom", lambda request: service.mark_for_gom(request.body), body=REPLAYED_PUBLISH_BODY
+    )
+    router.post(
+        "/publish/mark-for-revision",
+        lambda request: service.mark_for_revision(request.body),
+        body=PUBLISH_DRAFT_BODY,
+    )
+    router.post(
+        "/publish/export-for-gom", lambda request: service.export_for_gom(request.body), body=REPLAYED_PUBLISH_BODY
+    )
+    router.post(
+        "/publish/confirm-gom", lambda request: service.confirm_gom(request.body), body=REPLAYED_PUBLISH_BODY
+    )
+    router.post("/organize/classify", lambda request: service.organize_classify(request.body), body=NOTES_BODY)
+    router.post(
+        "/organize/propose-structure",
+        lambda request: service.organize_propose_structure(request.body),
+        body=NOTES_BODY,
+    )
+    router.post("/links/propose", lambda request: service.links_propose(request.body), body=LINKS_PROPOSE_BODY)
+    router.post("/links/apply", lambda request: service.links_apply(request.body), body=LINKS_APPLY_BODY)
+    router.post("/rag/index-vault", lambda request: service.rag_index_vault(request.body), error_status=index_running)
+    router.post(
+        "/rag/index-folder", lambda request: service.rag_index_folder(request.body), error_status=index_running
+    )
+    router.post("/rag/retrieve", lambda request: service.rag_retrieve(request.body), body=RAG_RETRIEVE_BODY)
+    router.post("/llm/config", lambda request: service.llm_set_config(request.body))
+    router.post("/llm/config/api-key", lambda request: service.llm_set_api_key(request.body))
+    router.post("/jobs", lambda request: service.submit_job(request.body), status=202)
+    router.post(
+        "/jobs/{job_id}/cancel",
+        lambda request: service.cancel_job(request.params["job_id"]),
+        error_status=not_found_when("unknown job id", 409),
+    )
+    router.post(
+        "/jobs/{job_id}/resume",
+        lambda request: service.resume_job(request.params["job_id"]),
+        error_status=not_found_when("unknown job id", 409),
+    )
+    router.post(
+        "/runs/{run_id}/approve",
+        lambda request: service.approve_run(request.params["run_id"], request.body),
+        error_status=run_not_found,
+    )
+    router.post(
+        "/runs/{run_id}/apply",
+        lambda request: service.apply_run(request.params["run_id"], request.body),
+        error_status=run_not_found,
+    )
+    router.post(
+        "/runs/{run_id}/rollback",
+        lambda request: service.rollback_run(request.params["run_id"], request.body),
+        error_status=run_not_found,
+    )
+
+    router.delete("/llm/config/api-key", lambda request: service.llm_clear_api_key())
+    return router
+
+
+def create_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    state_file: str | None = None,
+    api_token: str | None = None,
+    middleware: list[Middleware] | None = None,
+    service: ApiService | None = None,
+) -> ThreadingHTTPServer:
+    """Build the threaded HTTP server around one shared ``ApiService``.
+
+    ``service`` serves the requests instead of a new ``ApiService`` built
+    from ``state_file``; the benchmark and load harnesses pass one wired to
+    offline providers.
+
+    Every request goes through ``timing_middleware``, which feeds the
+    per-route latency histogram in ``/metrics``, the bearer token check
+    when ``api_token`` is set, ``gzip_middleware`` and then any extra
+    ``middleware``, in that order.
+    """
+    if service is None:
+        service = ApiService(state_file=state_file)
+    chain: list[Middleware] = [timing_middleware(observe_request)]
+    if api_token:
+        chain.append(bearer_auth_middleware(api_token))
+    chain.append(gzip_middleware())
+    chain.extend(middleware or [])
+    router = build_router(service, chain)
 
     class MindLiteHandler(BaseHTTPRequestHandler):
         def do_GET(self) -> None:  # noqa: N802
-            parsed_url = urlsplit(self.path)
-            path = parsed_url.path
-            query = parse_qs(parsed_url.query)
-
-            if path == "/health":
-                self._write_json(200, service.health())
-                return
-
-            if path == "/health/ready":
-                self._write_json(200, service.health_ready())
-                return
-
-            if path == "/metrics":
-                self._write_text(200, service.metrics(), "text/plain; version=0.0.4")
-                return
-
-            if path == "/runs":
-                filters = self._extract_run_filters(query)
-                try:
-                    runs = service.list_runs(filters)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, runs)
-                return
-
-            if path == "/policy/sensitivity":
-                self._write_json(200, service.get_sensitivity_policy())
-                return
-
-            if path == "/policy/routing":
-                self._write_json(200, service.get_routing_policy())
-                return
-
-            if path == "/publish/gom-queue":
-                self._write_json(200, service.list_gom_queue())
-                return
-
-            if path == "/publish/revision-queue":
-                self._write_json(200, service.list_revision_queue())
-                return
-
-            if path == "/publish/published":
-                self._write_json(200, service.list_published())
-                return
-
-            if path == "/rag/status":
-                self._write_json(200, service.rag_status())
-                return
-
-            if path == "/llm/models":
-                self._write_json(200, service.llm_list_models())
-                return
-
-            if path == "/llm/config":
-                self._write_json(200, service.llm_get_config())
-                return
-
-            run_route = self._parse_run_route(path)
-            if run_route is not None and run_route[1] == "proposals":
-                run_id = run_route[0]
-                filters = self._extract_proposal_filters(query)
-                try:
-                    proposals = service.get_run_proposals(run_id, filters)
-                except ValueError as exc:
-                    error_message = str(exc)
-                    status = 404 if "unknown run id" in error_message else 400
-                    self._write_json(status, {"error": error_message})
-                    return
-                self._write_json(200, proposals)
-                return
-
-            if run_route is not None and run_route[1] is None:
-                run_id = run_route[0]
-                try:
-                    run = service.get_run(run_id)
-                except ValueError as exc:
-                    self._write_json(404, {"error": str(exc)})
-                    return
-                self._write_json(200, run)
-                return
-
-            self._write_json(404, {"error": "not found"})
+            self._dispatch("GET")
 
         def do_POST(self) -> None:  # noqa: N802
-            path = self.path.split("?", 1)[0]
-            body = self._read_json_body()
-            if body is None:
-                self._write_json(400, {"error": "invalid json"})
-                return
-
-            if path == "/onboarding/analyze-folder":
-                try:
-                    result = service.analyze_folder(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-
-                self._write_json(200, result)
-                return
-
-            if path == "/onboarding/analyze-folders":
-                try:
-                    result = service.analyze_folders(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-
-                self._write_json(200, result)
-                return
-
-            if path == "/policy/sensitivity/check":
-                try:
-                    result = service.check_sensitivity(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/ask":
-                try:
-                    result = service.ask(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/publish/score":
-                try:
-                    result = service.publish_score(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/publish/prepare":
-                try:
-                    result = service.publish_prepare(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/publish/mark-for-gom":
-                try:
-                    result = service.mark_for_gom(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/publish/mark-for-revision":
-                try:
-                    result = service.mark_for_revision(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/publish/export-for-gom":
-                try:
-                    result = service.export_for_gom(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/publish/confirm-gom":
-                try:
-                    result = service.confirm_gom(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/organize/classify":
-                try:
-                    result = service.organize_classify(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/organize/propose-structure":
-                try:
-                    result = service.organize_propose_structure(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/links/propose":
-                try:
-                    result = service.links_propose(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/links/apply":
-                try:
-                    result = service.links_apply(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/rag/index-vault":
-                try:
-                    result = service.rag_index_vault(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/rag/index-folder":
-                try:
-                    result = service.rag_index_folder(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/rag/retrieve":
-                try:
-                    result = service.rag_retrieve(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/llm/config":
-                try:
-                    result = service.llm_set_config(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            if path == "/llm/config/api-key":
-                try:
-                    result = service.llm_set_api_key(body)
-                except ValueError as exc:
-                    self._write_json(400, {"error": str(exc)})
-                    return
-                self._write_json(200, result)
-                return
-
-            run_route = self._parse_run_route(path)
-            if run_route is not None and run_route[1] == "apply":
-                run_id = run_route[0]
-                try:
-                    result = service.apply_run(run_id, body)
-                except ValueError as exc:
-                    error_message = str(exc)
-                    status = 404 if "unknown run id" in error_message else 400
-                    self._write_json(status, {"error": error_message})
-                    return
-                self._write_json(200, result)
-                return
-
-            if run_route is not None and run_route[1] == "approve":
-                run_id = run_route[0]
-                try:
-                    result = service.approve_run(run_id, body)
-                except ValueError as exc:
-                    error_message = str(exc)
-                    status = 404 if "unknown run id" in error_message else 400
-                    self._write_json(status, {"error": error_message})
-                    return
-                self._write_json(200, result)
-                return
-
-            if run_route is not None and run_route[1] == "rollback":
-                run_id = run_route[0]
-                try:
-                    result = service.rollback_run(run_id, body)
-                except ValueError as exc:
-                    error_message = str(exc)
-                    status = 404 if "unknown run id" in error_message else 400
-                    self._write_json(status, {"error": error_message})
-                    return
-                self._write_json(200, result)
-                return
-
-            self._write_json(404, {"error": "not found"})
+            self._dispatch("POST")
 
         def do_DELETE(self) -> None:  # noqa: N802
-            path = self.path.split("?", 1)[0]
-
-            if path == "/llm/config/api-key":
-                result = service.llm_clear_api_key()
-                self._write_json(200, result)
-                return
-
-            self._write_json(404, {"error": "not found"})
-
-        def _parse_run_route(self, path: str) -> tuple[str, str | None] | None:
-            parts = path.split("/")
-            if len(parts) == 3 and parts[1] == "runs" and parts[2]:
-                return parts[2], None
-            if len(parts) == 4 and parts[1] == "runs" and parts[2] and parts[3]:
-                return parts[2], parts[3]
-            return None
+            self._dispatch("DELETE")
 
-        def _extract_proposal_filters(self, query: dict[str, list[str]]) -> dict:
-            filters = {}
-            for key in ("risk_tier", "action_mode", "status"):
-                values = query.get(key)
-                if not values:
-                    continue
-                filters[key] = values[-1]
-            return filters
-
-        def _extract_run_filters(self, query: dict[str, list[str]]) -> dict:
-            filters = {}
-            values = query.get("state")
-            if values:
-                filters["state"] = values[-1]
-            return filters
+        def _dispatch(self, method: str) -> None:
+            parsed_url = urlsplit(self.path)
+            request = Request(
+                method=method,
+                path=parsed_url.path,
+                query=parse_qs(parsed_url.query),
+                headers={name.lower(): value for name, value in self.headers.items()},
+                raw_body=self._read_body() if method == "POST" else b"",
+            )
+            response = router.dispatch(request)
+            if response.is_stream:
+                self._write_event_stream(response)
+            else:
+                self._write_response(response)
 
         def log_message(self, format: str, *args) -> None:  # noqa: A003
             return
 
-        def _read_json_body(self) -> dict | None:
+        def _read_body(self) -> bytes:
             try:
                 content_len = int(self.headers.get("Content-Length", "0"))
             except ValueError:
-                return None
-            raw = self.rfile.read(content_len)
-            try:
-                parsed = json.loads(raw.decode("utf-8"))
-            except (UnicodeDecodeError, json.JSONDecodeError):
-                return None
-            if not isinstance(parsed, dict):
-                return None
-            return parsed
+                return b""
+            return self.rfile.read(content_len)
 
-        def _write_json(self, status_code: int, payload: dict) -> None:
-            encoded = json.dumps(payload).encode("utf-8")
-            self.send_response(status_code)
-            self.send_header("Content-Type", "application/json")
+        def _write_response(self, response: Response) -> None:
+            encoded = response.encode()
+            self.send_response(response.status)
+            self.send_header("Content-Type", response.content_type)
             self.send_header("Content-Length", str(len(encoded)))
+            for name, value in response.headers.items():
+                self.send_header(name, value)
             self.end_headers()
             self.wfile.write(encoded)
 
-        def _write_text(self, status_code: int, payload: str, content_type: str) -> None:
-            encoded = payload.encode("utf-8")
-            self.send_response(status_code)
-            self.send_header("Content-Type", content_type)
-            self.send_header("Content-Length", str(len(encoded)))
+        def _write_event_stream(self, response: Response) -> None:
+            events = response.payload
+            self.send_response(response.status)
+            self.send_header("Content-Type", EVENT_STREAM_CONTENT_TYPE)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            for name, value in response.headers.items():
+                self.send_header(name, value)
             self.end_headers()
-            self.wfile.write(encoded)
+            self.close_connection = True
+            try:
+                for event in events:
+                    frame = f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+                    self.wfile.write(frame.encode("utf-8"))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                events.close()
 
     return ThreadingHTTPServer((host, port), MindLiteHandler)
@@ -0,0 +1,320 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Callable
+
+from mind_lite.api.records import FrozenDict, freeze
+
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+_ALLOWED_TRANSITIONS: dict[JobState, set[JobState]] = {
+    JobState.QUEUED: {JobState.RUNNING, JobState.CANCELLED},
+    JobState.RUNNING: {JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED},
+    JobState.COMPLETED: set(),
+    JobState.FAILED: {JobState.QUEUED},
+    JobState.CANCELLED: {JobState.QUEUED},
+}
+
+UNFINISHED_JOB_STATES = (JobState.QUEUED.value, JobState.RUNNING.value)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobContext:
+    """Handle a running job uses to report progress and save checkpoints."""
+
+    def __init__(self, manager: "JobManager", job_id: str, checkpoint: dict):
+        self._manager = manager
+        self.job_id = job_id
+        self.checkpoint = checkpoint
+
+    def report_progress(self, completed: int, total: int, **counters: int) -> None:
+        self._manager._report_progress(self.job_id, completed, total, counters)
+        self.raise_if_cancelled()
+
+    def save_checkpoint(self, **values) -> None:
+        self.checkpoint.update(values)
+        self._manager._save_checkpoint(self.job_id, self.checkpoint)
+
+    def update_checkpoint(self, **values) -> None:
+        """Like ``save_checkpoint``, but persisted at most once per persist interval.
+
+        For checkpoints updated after every item; the latest values are
+        always saved when the job stops.
+        """
+        self.checkpoint.update(values)
+        self._manager._save_checkpoint(self.job_id, self.checkpoint, throttled=True)
+
+    def raise_if_cancelled(self) -> None:
+        if self._manager._is_cancel_requested(self.job_id):
+            raise JobCancelled(self.job_id)
+
+
+class JobManager:
+    """Runs long operations on a bounded worker pool and tracks their progress.
+
+    Each job kind maps to a runner ``(payload, context) -> result``. Runners
+    call ``context.report_progress`` as they go, which also serves as the
+    cancellation point, and ``context.save_checkpoint`` (or the throttled
+    ``update_checkpoint``) with whatever they need to pick up where they
+    left off. Records survive restarts through
+    ``export_records``/``import_records``; jobs that were queued or running
+    when the process stopped are queued again with their last checkpoint.
+
+    ``on_change(job_id)`` is called after every state change and checkpoint,
+    and at most once per ``persist_interval_seconds`` for progress updates
+    and ``update_checkpoint`` calls.
+
+    Job records are read-only ``FrozenDict`` values that are replaced on every
+    update, so ``get`` and ``list_jobs`` hand them out without copying.
+    """
+
+    def __init__(
+        self,
+        runners: dict[str, Callable[[dict, JobContext], dict]],
+        max_workers: int = 2,
+        on_change: Callable[[str], None] | None = None,
+        persist_interval_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be > 0")
+        self._runners = dict(runners)
+        self._max_workers = max_workers
+        self._on_change = on_change
+        self._persist_interval_seconds = persist_interval_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._jobs: dict[str, FrozenDict] = {}
+        self._checkpoints: dict[str, dict] = {}
+        self._cancel_requested: set[str] = set()
+        self._started_clock: dict[str, float] = {}
+        self._last_persist = 0.0
+        self._counter = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def kinds(self) -> tuple[str, ...]:
+        return tuple(sorted(self._runners))
+
+    def submit(self, kind: str, payload: dict) -> dict:
+        if kind not in self._runners:
+            raise ValueError(f"job type must be one of {', '.join(self.kinds)}")
+        with self._lock:
+            self._counter += 1
+            job_id = f"job_{self._counter:04d}"
+            job = self._jobs[job_id] = freeze(
+                {
+                    "job_id": job_id,
+                    "type": kind,
+                    "state": JobState.QUEUED.value,
+                    "payload": deepcopy(payload),
+                    "progress": {"completed": 0, "total": None, "eta_seconds": None},
+                    "result": None,
+                    "error": None,
+                    "resumed_count": 0,
+                    "created_at": _now(),
+                    "started_at": None,
+                    "finished_at": None,
+                }
+            )
+            self._checkpoints[job_id] = {}
+        self._notify(job_id)
+        self._dispatch(job_id)
+        return job
+
+    def get(self, job_id: str) -> dict:
+        with self._lock:
+            if job_id not in self._jobs:
+                raise ValueError(f"unknown job id: {job_id}")
+            return self._jobs[job_id]
+
+    def list_jobs(self) -> list[dict]:
+        with self._lock:
+            return [self._jobs[job_id] for job_id in sorted(self._jobs)]
+
+    def cancel(self, job_id: str) -> dict:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise ValueError(f"unknown job id: {job_id}")
+            state = JobState(job["state"])
+            if state == JobState.QUEUED:
+                job = self._update(job_id, JobState.CANCELLED, finished_at=_now())
+            elif state == JobState.RUNNING:
+                self._cancel_requested.add(job_id)
+            else:
+                raise ValueError(f"job {job_id} is already {state.value}")
+        self._notify(job_id)
+        return job
+
+    def resume(self, job_id: str) -> dict:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise ValueError(f"unknown job id: {job_id}")
+            if job["state"] not in (JobState.CANCELLED.value, JobState.FAILED.value):
+                raise ValueError(f"job {job_id} is {job['state']} and cannot be resumed")
+            job = self._requeue(job)
+        self._notify(job_id)
+        self._dispatch(job_id)
+        return job
+
+    @property
+    def counter(self) -> int:
+        return self._counter
+
+    def export_record(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {**job, "checkpoint": deepcopy(self._checkpoints.get(job_id, {}))}
+
+    def export_records(self) -> dict:
+        with self._lock:
+            return {
+                "counter": self._counter,
+                "jobs": {job_id: self.export_record(job_id) for job_id in self._jobs},
+            }
+
+    def import_records(self, payload: dict) -> list[str]:
+        """Load persisted jobs and return the ids of the ones that were interrupted."""
+        interrupted = []
+        with self._lock:
+            self._counter = int(payload.get("counter", 0))
+            for job_id, record in payload.get("jobs", {}).items():
+                if not isinstance(record, dict):
+                    continue
+                job = dict(record)
+                checkpoint = job.pop("checkpoint", {})
+                self._checkpoints[job_id] = checkpoint if isinstance(checkpoint, dict) else {}
+                if job.get("state") in UNFINISHED_JOB_STATES and job.get("type") in self._runners:
+                    job["state"] = JobState.QUEUED.value
+                    job["resumed_count"] = int(job.get("resumed_count", 0)) + 1
+                    interrupted.append(job_id)
+                self._jobs[job_id] = freeze(job)
+        return interrupted
+
+    def resume_interrupted(self, job_ids: list[str]) -> None:
+        for job_id in job_ids:
+            self._dispatch(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _requeue(self, job: dict) -> FrozenDict:
+        self._cancel_requested.discard(job["job_id"])
+        return self._update(
+            job["job_id"],
+            JobState.QUEUED,
+            resumed_count=int(job.get("resumed_count", 0)) + 1,
+            error=None,
+            finished_at=None,
+        )
+
+    def _dispatch(self, job_id: str) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="mind-lite-job"
+                )
+            executor = self._executor
+        executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            if job["state"] != JobState.QUEUED.value:
+                return
+            self._update(job_id, JobState.RUNNING, started_at=_now())
+            self._started_clock[job_id] = self._clock()
+            runner = self._runners[job["type"]]
+            payload = deepcopy(job["payload"])
+            context = JobContext(self, job_id, deepcopy(self._checkpoints.get(job_id, {})))
+        self._notify(job_id)
+
+        try:
+            result = runner(payload, context)
+        except JobCancelled:
+            outcome, result, error = JobState.CANCELLED, None, None
+        except Exception as exc:  # noqa: BLE001 - surfaced on the job record
+            outcome, result, error = JobState.FAILED, None, str(exc)
+        else:
+            outcome, error = JobState.COMPLETED, None
+
+        with self._lock:
+            self._checkpoints[job_id] = deepcopy(context.checkpoint)
+            self._update(
+                job_id,
+                outcome,
+                result=result,
+                error=error,
+                finished_at=_now(),
+                progress={**self._jobs[job_id]["progress"], "eta_seconds": None},
+            )
+            self._cancel_requested.discard(job_id)
+            self._started_clock.pop(job_id, None)
+        self._notify(job_id)
+
+    def _update(self, job_id: str, target: JobState | None = None, **changes) -> FrozenDict:
+        """Replace the record of ``job_id`` with one that has ``changes`` applied."""
+        job = self._jobs[job_id]
+        if target is not None:
+            current = JobState(job["state"])
+            if target not in _ALLOWED_TRANSITIONS[current]:
+                raise ValueError(f"invalid job state transition: {current.value} -> {target.value}")
+            changes["state"] = target.value
+        record = self._jobs[job_id] = freeze({**job, **changes})
+        return record
+
+    def _report_progress(self, job_id: str, completed: int, total: int, counters: dict) -> None:
+        with self._lock:
+            progress = {"completed": completed, "total": total, **counters}
+            elapsed = self._clock() - self._started_clock.get(job_id, self._clock())
+            eta = None
+            if total and 0 < completed < total and elapsed > 0:
+                eta = round(elapsed / completed * (total - completed), 1)
+            elif total and completed >= total:
+                eta = 0.0
+            progress["eta_seconds"] = eta
+            self._update(job_id, progress=progress)
+            due = self._clock() - self._last_persist >= self._persist_interval_seconds
+        if due:
+            self._notify(job_id)
+
+    def _save_checkpoint(self, job_id: str, checkpoint: dict, throttled: bool = False) -> None:
+        with self._lock:
+            if throttled and self._clock() - self._last_persist < self._persist_interval_seconds:
+                return
+            self._checkpoints[job_id] = deepcopy(checkpoint)
+        self._notify(job_id)
+
+    def _is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancel_requested
+
+    def _notify(self, job_id: str) -> None:
+        with self._lock:
+            self._last_persist = self._clock()
+        if self._on_change is not None:
+            self._on_change(job_id)
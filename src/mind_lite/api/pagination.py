@@ -0,0 +1,111 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Callable, Sequence, TypeVar
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 500
+
+_Key = TypeVar("_Key", str, int)
+
+
+def parse_limit(value: object, default: int | None = DEFAULT_PAGE_LIMIT) -> int | None:
+    """Validate a ``limit`` filter given as an int or a decimal string (query parameters)."""
+    if value is None:
+        return default
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_PAGE_LIMIT:
+        raise ValueError(f"limit must be an integer between 1 and {MAX_PAGE_LIMIT}")
+    return value
+
+
+def parse_order(value: object) -> bool:
+    """Return ``True`` for descending order."""
+    if value is None or value == "asc":
+        return False
+    if value == "desc":
+        return True
+    raise ValueError("order must be asc or desc")
+
+
+def parse_timestamp(name: str, value: object) -> datetime | None:
+    if value is None:
+        return None
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"{name} must be an ISO 8601 timestamp")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an ISO 8601 timestamp") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def index_add(
+    keys: list[_Key], key: _Key, order: Callable[[_Key], Any] | None = None
+) -> list[_Key]:
+    """Return a copy of the sorted list ``keys`` with ``key`` inserted in order.
+
+    ``order`` is the sort key ``keys`` are kept in, as for ``sorted``.
+    Indexes are copied rather than edited in place so that a reader paging
+    through the old list is never affected by a concurrent writer.
+    """
+    position = bisect_left(keys, key if order is None else order(key), key=order)
+    if position < len(keys) and keys[position] == key:
+        return keys
+    return [*keys[:position], key, *keys[position:]]
+
+
+def index_remove(
+    keys: list[_Key], key: _Key, order: Callable[[_Key], Any] | None = None
+) -> list[_Key]:
+    position = bisect_left(keys, key if order is None else order(key), key=order)
+    if position < len(keys) and keys[position] == key:
+        return [*keys[:position], *keys[position + 1 :]]
+    return keys
+
+
+def page_keys(
+    keys: Sequence[_Key],
+    *,
+    limit: int | None,
+    after: _Key | None = None,
+    descending: bool = False,
+    accept: Callable[[_Key], bool] | None = None,
+    order: Callable[[_Key], Any] | None = None,
+    lo: int = 0,
+    hi: int | None = None,
+) -> tuple[list[_Key], _Key | None]:
+    """Walk the sorted ``keys`` from the cursor and return one page plus the next cursor.
+
+    The cursor is the last key of the previous page, so pages stay stable
+    while new keys are added. Only the keys that are visited are passed to
+    ``accept``; a page costs ``limit`` accepted keys plus the rejected ones
+    in between, not the length of ``keys``. ``next`` is ``None`` once the end
+    has been reached. ``order`` is the sort key of ``keys`` (see
+    ``index_add``), and ``lo``/``hi`` limit the walk to ``keys[lo:hi]``.
+    """
+    hi = len(keys) if hi is None else max(lo, hi)
+    bound = after if after is None or order is None else order(after)
+    if descending:
+        stop = bisect_left(keys, bound, lo, hi, key=order) if after is not None else hi
+        positions = range(stop - 1, lo - 1, -1)
+    else:
+        start = bisect_right(keys, bound, lo, hi, key=order) if after is not None else lo
+        positions = range(start, hi)
+
+    page: list[_Key] = []
+    last_position = None
+    for position in positions:
+        if limit is not None and len(page) == limit:
+            break
+        last_position = position
+        key = keys[position]
+        if accept is None or accept(key):
+            page.append(key)
+    else:
+        return page, None
+
+    exhausted = last_position == (lo if descending else hi - 1)
+    return page, None if exhausted else page[-1]
@@ -0,0 +1,65 @@
+from typing import Any
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenDict(dict):
+    """A ``dict`` that refuses mutation, so stored records can be handed out without copying.
+
+    It stays a real ``dict`` subclass: ``json.dumps`` serialises it directly
+    and it compares equal to plain dicts. Updates build a new record, e.g.
+    ``freeze({**record, "state": "applied"})``, which shares every unchanged
+    nested value with the old one.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "FrozenDict":
+        return self
+
+
+class FrozenList(list):
+    """Read-only ``list`` counterpart of ``FrozenDict``."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "FrozenList":
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """Return ``value`` with every dict and list replaced by its read-only form.
+
+    Values that are already frozen are returned as they are, so freezing a
+    shallow copy of a record only converts the parts that changed.
+    """
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a fully mutable deep copy of a (possibly frozen) value."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
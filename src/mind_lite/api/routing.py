@@ -0,0 +1,319 @@
+import gzip
+import hmac
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+JSON_CONTENT_TYPE = "application/json"
+EVENT_STREAM_CONTENT_TYPE = "text/event-stream"
+
+_PARAM_PATTERN = re.compile(r"\{([a-z_]+)\}")
+
+
+@dataclass(frozen=True)
+class Field:
+    """One declared body field.
+
+    ``text`` fields must be strings that are not blank and ``list`` fields
+    non-empty lists. A missing optional field is accepted; a present one must
+    still be valid. Messages match the ones ``ApiService`` raises itself.
+    """
+
+    name: str
+    kind: str = "text"
+    required: bool = True
+
+    def error(self, payload: dict) -> str | None:
+        if self.name not in payload and not self.required:
+            return None
+        value = payload.get(self.name)
+        if self.kind == "list":
+            if not isinstance(value, list) or not value:
+                return f"{self.name} must be a non-empty list"
+            return None
+        if not isinstance(value, str) or not value.strip():
+            return f"{self.name} is required" if self.required else f"{self.name} must be a non-empty string"
+        return None
+
+
+@dataclass(frozen=True)
+class BodySchema:
+    """JSON object body of a route; the fields are checked in declaration order."""
+
+    fields: tuple[Field, ...] = ()
+
+    def validate(self, raw: bytes) -> dict:
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise InvalidBody("invalid json") from exc
+        if not isinstance(payload, dict):
+            raise InvalidBody("invalid json")
+        for item in self.fields:
+            message = item.error(payload)
+            if message is not None:
+                raise InvalidBody(message)
+        return payload
+
+
+JSON_OBJECT = BodySchema()
+
+
+class InvalidBody(ValueError):
+    pass
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, list[str]] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)
+    raw_body: bytes = b""
+    params: dict[str, str] = field(default_factory=dict)
+    body: dict | None = None
+    route: "Route | None" = None
+
+    def header(self, name: str, default: str = "") -> str:
+        return self.headers.get(name.lower(), default)
+
+    def query_value(self, name: str) -> str | None:
+        values = self.query.get(name)
+        return values[-1] if values else None
+
+
+@dataclass
+class Response:
+    status: int
+    payload: Any = None
+    content_type: str = JSON_CONTENT_TYPE
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes | None = None
+
+    @property
+    def is_stream(self) -> bool:
+        return self.content_type == EVENT_STREAM_CONTENT_TYPE
+
+    def encode(self) -> bytes:
+        """Serialise the payload once; middleware may replace ``body`` afterwards."""
+        if self.body is None:
+            if self.content_type == JSON_CONTENT_TYPE:
+                self.body = json.dumps(self.payload).encode("utf-8")
+            else:
+                self.body = str(self.payload).encode("utf-8")
+        return self.body
+
+
+def error_response(status: int, message: str) -> Response:
+    return Response(status, {"error": message})
+
+
+def status_when(marker: str, status: int, otherwise: int = 400) -> Callable[[str], int]:
+    """Map a ``ValueError`` message to ``status`` when it contains ``marker``, else to ``otherwise``."""
+    return lambda message: status if marker in message else otherwise
+
+
+def not_found_when(marker: str, otherwise: int = 400) -> Callable[[str], int]:
+    """Map a ``ValueError`` message to 404 when it contains ``marker``, else to ``otherwise``."""
+    return status_when(marker, 404, otherwise)
+
+
+Handler = Callable[[Request], Any]
+Middleware = Callable[[Request, Callable[[Request], Response]], Response]
+
+
+@dataclass(frozen=True)
+class Route:
+    method: str
+    pattern: str
+    handler: Handler
+    body: BodySchema | None = None
+    status: int = 200
+    error_status: Callable[[str], int] = lambda message: 400
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.pattern}"
+
+
+class Router:
+    """Dispatches requests through a route table and a middleware chain.
+
+    Literal paths are found with one dict lookup; parameterised paths such
+    as ``/runs/{run_id}/proposals`` are compiled to regular expressions once,
+    when the route is added. Handlers take a ``Request`` and return either a
+    ``Response`` or a JSON payload sent with the route's success status. A
+    ``ValueError`` from a handler becomes ``{"error": ...}`` with the status
+    picked by the route's ``error_status``.
+
+    Middleware wraps every matched and unmatched request as
+    ``middleware(request, call_next) -> Response``, outermost first.
+    """
+
+    def __init__(self, middleware: list[Middleware] | None = None):
+        self._exact: dict[tuple[str, str], Route] = {}
+        self._patterns: dict[str, list[tuple[re.Pattern[str], Route]]] = {}
+        self._middleware: list[Middleware] = []
+        self._call: Callable[[Request], Response] = self._handle
+        for item in middleware or []:
+            self.use(item)
+
+    def add(self, method: str, pattern: str, handler: Handler, **options) -> Route:
+        route = Route(method, pattern, handler, **options)
+        if _PARAM_PATTERN.search(pattern) is None:
+            self._exact[(method, pattern)] = route
+        else:
+            self._patterns.setdefault(method, []).append((_compile(pattern), route))
+        return route
+
+    def get(self, pattern: str, handler: Handler, **options) -> Route:
+        return self.add("GET", pattern, handler, **options)
+
+    def post(self, pattern: str, handler: Handler, **options) -> Route:
+        options.setdefault("body", JSON_OBJECT)
+        return self.add("POST", pattern, handler, **options)
+
+    def delete(self, pattern: str, handler: Handler, **options) -> Route:
+        return self.add("DELETE", pattern, handler, **options)
+
+    def use(self, middleware: Middleware) -> None:
+        """Add ``middleware`` inside the ones already installed; the chain is built here, not per request."""
+        self._middleware.append(middleware)
+        call: Callable[[Request], Response] = self._handle
+        for item in reversed(self._middleware):
+            call = _chain(item, call)
+        self._call = call
+
+    @property
+    def routes(self) -> list[Route]:
+        return [*self._exact.values(), *(route for items in self._patterns.values() for _, route in items)]
+
+    def match(self, method: str, path: str) -> tuple[Route, dict[str, str]] | None:
+        route = self._exact.get((method, path))
+        if route is not None:
+            return route, {}
+        for regex, candidate in self._patterns.get(method, ()):
+            matched = regex.fullmatch(path)
+            if matched is not None:
+                return candidate, matched.groupdict()
+        return None
+
+    def dispatch(self, request: Request) -> Response:
+        matched = self.match(request.method, request.path)
+        if matched is not None:
+            request.route, request.params = matched
+        return self._call(request)
+
+    def _handle(self, request: Request) -> Response:
+        route = request.route
+        if route is None:
+            return error_response(404, "not found")
+        if route.body is not None:
+            try:
+                request.body = route.body.validate(request.raw_body)
+            except InvalidBody as exc:
+                return error_response(400, str(exc))
+        try:
+            result = route.handler(request)
+        except ValueError as exc:
+            message = str(exc)
+            return error_response(route.error_status(message), message)
+        if isinstance(result, Response):
+            return result
+        return Response(route.status, result)
+
+
+def _compile(pattern: str) -> re.Pattern[str]:
+    parts = []
+    position = 0
+    for param in _PARAM_PATTERN.finditer(pattern):
+        parts.append(re.escape(pattern[position : param.start()]))
+        parts.append(f"(?P<{param.group(1)}>[^/]+)")
+        position = param.end()
+    parts.append(re.escape(pattern[position:]))
+    return re.compile("".join(parts))
+
+
+def _chain(middleware: Middleware, call_next: Callable[[Request], Response]) -> Callable[[Request], Response]:
+    return lambda request: middleware(request, call_next)
+
+
+def _until_first_event(events: Iterator[Any], done: Callable[[], None]) -> Iterator[Any]:
+    """Yield ``events``, calling ``done`` once the first one is ready (or the stream ends empty)."""
+    try:
+        for event in events:
+            done()
+            yield event
+    finally:
+        done()
+        close = getattr(events, "close", None)
+        if close is not None:
+            close()
+
+
+def timing_middleware(record: Callable[[str, int, float], None] | None = None) -> Middleware:
+    """Add a ``Server-Timing`` header and report ``(route name, status, seconds)`` to ``record``.
+
+    Handlers of streaming routes only return an unstarted generator, so a
+    stream is timed until its first event is produced. Its headers are sent
+    before that, so streams carry no ``Server-Timing`` header.
+    """
+
+    def middleware(request: Request, call_next: Callable[[Request], Response]) -> Response:
+        started = time.perf_counter()
+        response = call_next(request)
+        route = request.route.name if request.route is not None else "unmatched"
+        recorded = False
+
+        def done() -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            elapsed = time.perf_counter() - started
+            if record is not None:
+                record(route, response.status, elapsed)
+            if not response.is_stream:
+                response.headers["Server-Timing"] = f"app;dur={elapsed * 1000:.1f}"
+
+        if response.is_stream:
+            response.payload = _until_first_event(response.payload, done)
+        else:
+            done()
+        return response
+
+    return middleware
+
+
+def gzip_middleware(min_bytes: int = 1024, level: int = 5) -> Middleware:
+    """Gzip non-streaming bodies of at least ``min_bytes`` for clients that accept it."""
+
+    def middleware(request: Request, call_next: Callable[[Request], Response]) -> Response:
+        response = call_next(request)
+        if response.is_stream or "gzip" not in request.header("accept-encoding"):
+            return response
+        body = response.encode()
+        if len(body) >= min_bytes:
+            response.body = gzip.compress(body, compresslevel=level)
+            response.headers["Content-Encoding"] = "gzip"
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    return middleware
+
+
+def bearer_auth_middleware(token: str, public_paths: frozenset[str] = frozenset({"/health", "/health/ready"})) -> Middleware:
+    """Reject requests without ``Authorization: Bearer <token>``, except for ``public_paths``."""
+    expected = f"Bearer {token}".encode("utf-8")
+
+    def middleware(request: Request, call_next: Callable[[Request], Response]) -> Response:
+        if request.path in public_paths:
+            return call_next(request)
+        supplied = request.header("authorization").encode("utf-8")
+        if not hmac.compare_digest(supplied, expected):
+            return Response(401, {"error": "unauthorized"}, headers={"WWW-Authenticate": "Bearer"})
+        return call_next(request)
+
+    return middleware
@@ -1,8 +1,23 @@
-from copy import deepcopy
+from bisect import bisect_left, bisect_right
 from dataclasses import asdict
+from datetime import datetime, timezone
+import functools
 import json
 from pathlib import Path
-
+import threading
+from typing import Callable, Iterator
+
+from mind_lite.api.jobs import JobContext, JobManager
+from mind_lite.api.pagination import (
+    index_add,
+    index_remove,
+    page_keys,
+    parse_limit,
+    parse_order,
+    parse_timestamp,
+)
+from mind_lite.api.records import FrozenDict, freeze
+from mind_lite.api.state_store import StateStore, state_db_path
 from mind_lite.contracts.action_tiering import decide_action_mode
 from mind_lite.contracts.budget_guardrails import evaluate_budget
 from mind_lite.contracts.idempotency_replay import RunReplayLedger, apply_event
@@ -17,25 +32,91 @@ from mind_lite.contracts.sensitivity_gate import (
 )
 from mind_lite.contracts.rollback_validation import validate_rollback_request
 from mind_lite.contracts.snapshot_rollback import SnapshotStore, apply_batch
+from mind_lite.metrics import REGISTRY
 from mind_lite.onboarding.analyze_readonly import analyze_folder
 from mind_lite.onboarding.proposal_llm import build_note_prompt, parse_llm_candidates
 
+_REPLAY_STATE_KINDS = {
+    "ask_replay": "_ask_response_by_event",
+    "links_apply_replay": "_links_apply_response_by_event",
+    "publish_mark_replay": "_publish_mark_response_by_event",
+    "publish_export_replay": "_publish_export_response_by_event",
+    "publish_confirm_replay": "_publish_confirm_response_by_event",
+}
+_APPEND_ONLY_STATE_KINDS = {
+    "revision_queue": "_revision_queue",
+    "gom_published": "_gom_published",
+}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _run_id_order(run_id: str) -> tuple[int, str]:
+    """Sort key of the run id indexes: ``run_10000`` comes after ``run_9999``."""
+    return len(run_id), run_id
+
+
+def _synchronized(lock_name: str):
+    """Run the decorated ``ApiService`` method while holding the lock attribute ``lock_name``."""
+
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with getattr(self, lock_name):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
 
 class ApiService:
-    def __init__(self, state_file: str | None = None) -> None:
+    """Service layer shared by every request thread of the HTTP server.
+
+    Stored records are immutable (see ``mind_lite.api.records``) and are
+    replaced wholesale, so read endpoints take no locks. Writers serialise
+    per subsystem: ``_runs_lock`` guards runs, proposals, their indexes,
+    snapshots and the run counter; ``_publish_lock`` the publish queues and
+    their replay caches; ``_replay_lock`` the /ask and /links/apply replay
+    caches; ``_rag_lock`` the lazy RAG setup. An event id enters a replay
+    ledger only together with its response, and a concurrent /ask with the
+    same event id waits for the one already answering it. ``_state_lock`` serialises
+    persistence and is only ever taken last, so the locks cannot deadlock.
+    Slow work such as LLM calls runs outside every lock.
+    """
+
+    def __init__(
+        self,
+        state_file: str | None = None,
+        job_workers: int = 2,
+        job_persist_interval_seconds: float = 1.0,
+    ) -> None:
         self._runs: dict[str, dict] = {}
         self._proposals_by_run: dict[str, list[dict]] = {}
+        self._proposal_count = 0
+        self._run_ids: list[str] = []
+        self._run_ids_by_state: dict[str, list[str]] = {}
+        self._proposal_positions: dict[str, dict[str, int]] = {}
+        self._proposal_positions_by_status: dict[str, dict[str, list[int]]] = {}
         self._gom_queue: list[dict] = []
         self._revision_queue: list[dict] = []
         self._gom_published: list[dict] = []
         self._snapshot_store = SnapshotStore()
         self._run_counter = 0
         self._state_file = Path(state_file) if state_file is not None else None
+        self._state_store = StateStore(state_db_path(state_file)) if state_file is not None else None
+        self._dirty_state: set[tuple[str, str | None]] = set()
         self._monthly_budget_cap = 30.0
         self._monthly_spend = 0.0
         self._local_confidence_threshold = 0.70
         self._ask_replay_ledger = RunReplayLedger()
         self._ask_response_by_event: dict[str, dict] = {}
+        self._ask_pending_events: dict[str, threading.Event] = {}
         self._links_apply_replay_ledger = RunReplayLedger()
         self._links_apply_response_by_event: dict[str, dict] = {}
         self._publish_mark_replay_ledger = RunReplayLedger()
@@ -44,7 +125,24 @@ class ApiService:
         self._publish_export_response_by_event: dict[str, dict] = {}
         self._publish_confirm_replay_ledger = RunReplayLedger()
         self._publish_confirm_response_by_event: dict[str, dict] = {}
+        self._state_lock = threading.RLock()
+        self._runs_lock = threading.RLock()
+        self._publish_lock = threading.RLock()
+        self._replay_lock = threading.RLock()
+        self._rag_lock = threading.Lock()
+        self._job_manager = JobManager(
+            runners={
+                "rag_index_vault": self._run_index_vault_job,
+                "analyze_folders": self._run_analyze_folders_job,
+                "organize_classify": self._run_classify_job,
+            },
+            max_workers=job_workers,
+            on_change=self._on_job_change,
+            persist_interval_seconds=job_persist_interval_seconds,
+        )
+        self._interrupted_job_ids: list[str] = []
         self._load_state_if_present()
+        self._job_manager.resume_interrupted(self._interrupted_job_ids)
 
     def health(self) -> dict:
         return {"status": "ok"}
@@ -53,9 +151,14 @@ class ApiService:
         return {"status": "ready"}
 
     def metrics(self) -> str:
+        """Prometheus text: this service's record gauges, then the process-wide ``mind_lite.metrics`` registry.
+
+        Every gauge is a stored count, kept up to date as records change, so a
+        scrape does not walk runs or proposals.
+        """
         run_count = len(self._runs)
-        proposal_count = sum(len(items) for items in self._proposals_by_run.values())
-        snapshot_count = len(self._snapshot_store.export_records())
+        proposal_count = self._proposal_count
+        snapshot_count = self._snapshot_store.run_count
         publish_queue_count = len(self._gom_queue)
         published_count = len(self._gom_published)
         lines = [
@@ -74,40 +177,87 @@ class ApiService:
             "# HELP mind_lite_publish_published_total Total drafts published",
             "# TYPE mind_lite_publish_published_total gauge",
             f"mind_lite_publish_published_total {published_count}",
-            "",
         ]
+        lines.extend(self._rag_cache_metric_lines())
+        lines.extend(REGISTRY.render())
+        lines.append("")
         return "\n".join(lines)
 
+    def _rag_cache_metric_lines(self) -> list[str]:
+        retrieval = getattr(self, "_rag_retrieval", None)
+        stats_fn = getattr(retrieval, "cache_stats", None)
+        if not callable(stats_fn):
+            return []
+        cache_stats = stats_fn()
+        if not isinstance(cache_stats, dict) or not cache_stats:
+            return []
+
+        lines = []
+        for field, kind, help_text in (
+            ("hits", "counter", "RAG cache lookups served from cache"),
+            ("misses", "counter", "RAG cache lookups that missed"),
+            ("evictions", "counter", "RAG cache entries evicted for capacity"),
+            ("entries", "gauge", "RAG cache entries currently held"),
+        ):
+            metric = f"mind_lite_rag_cache_{field}" + ("_total" if kind == "counter" else "")
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for cache_name in sorted(cache_stats):
+                lines.append(f'{metric}{{cache="{cache_name}"}} {cache_stats[cache_name][field]}')
+        return lines
+
     def analyze_folder(self, payload: dict) -> dict:
         folder_path = payload.get("folder_path")
         mode = payload.get("mode", "analyze")
-        run = self._analyze_folder_run(folder_path, mode=mode, persist=True)
-        return deepcopy(run)
+        return self._analyze_folder_run(folder_path, mode=mode, persist=True)
 
     def analyze_folders(self, payload: dict) -> dict:
+        folder_paths, mode = self._validate_analyze_folders(payload)
+        run = self._start_batch_run(folder_paths)
+        return self._analyze_folder_batches(run["run_id"], folder_paths, mode)
+
+    def _validate_analyze_folders(self, payload: dict) -> tuple[list[str], str]:
         folder_paths = payload.get("folder_paths")
         if not isinstance(folder_paths, list) or not folder_paths:
             raise ValueError("folder_paths must be a non-empty list of non-empty strings")
         if any(not isinstance(path, str) or not path.strip() for path in folder_paths):
             raise ValueError("folder_paths must be a non-empty list of non-empty strings")
+        return folder_paths, payload.get("mode", "analyze")
 
-        mode = payload.get("mode", "analyze")
-        run_id = self._next_run_id()
+    def _start_batch_run(self, folder_paths: list[str]) -> dict:
+        run_id, created_at = self._next_run_id()
         run = {
             "run_id": run_id,
             "state": RunState.QUEUED.value,
+            "created_at": created_at,
             "batch_total": len(folder_paths),
             "batch_completed": 0,
             "batches": [],
             "applied_batch_ids": [],
             "diagnostics": [],
         }
-        self._runs[run_id] = run
         self._transition_run_state(run, RunState.ANALYZING)
+        self._store_run(run)
+        return run
 
-        child_states: list[str] = []
+    def _analyze_folder_batches(
+        self, run_id: str, folder_paths: list[str], mode: str, job: JobContext | None = None
+    ) -> FrozenDict:
+        """Analyze the folders that do not have a batch entry yet, then settle the run state.
+
+        Every batch is added to the stored run as a locked read-modify-write,
+        so a batch checkpoint written meanwhile by applying a finished child
+        run is kept. With a ``job`` the run is also checkpointed after every
+        batch, so a resumed job continues with the first folder that has no
+        batch entry.
+        """
         for index, folder_path in enumerate(folder_paths, start=1):
+            if index <= len(self._runs[run_id]["batches"]):
+                continue
+            if job is not None:
+                job.raise_if_cancelled()
             batch_id = f"batch_{index:04d}"
+            diagnostic = None
             try:
                 child_run = self._analyze_folder_run(folder_path, mode=mode, persist=False)
                 child_run_id = child_run.get("run_id")
@@ -126,32 +276,41 @@ class ApiService:
                     "diagnostics_count": child_diagnostics_count,
                     "snapshot_id": None,
                 }
-                run["batches"].append(batch_summary)
-                if isinstance(batch_summary["state"], str):
-                    child_states.append(batch_summary["state"])
             except (ValueError, OSError) as exc:
-                run["batches"].append(
-                    {
-                        "batch_id": batch_id,
-                        "folder_path": folder_path,
-                        "run_id": None,
-                        "state": RunState.FAILED_NEEDS_ATTENTION.value,
-                        "proposal_count": 0,
-                        "diagnostics_count": 1,
-                        "snapshot_id": None,
-                    }
-                )
-                run["diagnostics"].append(
-                    {
-                        "batch_id": batch_id,
-                        "folder_path": folder_path,
-                        "error": str(exc),
-                    }
-                )
-                child_states.append(RunState.FAILED_NEEDS_ATTENTION.value)
-            finally:
+                batch_summary = {
+                    "batch_id": batch_id,
+                    "folder_path": folder_path,
+                    "run_id": None,
+                    "state": RunState.FAILED_NEEDS_ATTENTION.value,
+                    "proposal_count": 0,
+                    "diagnostics_count": 1,
+                    "snapshot_id": None,
+                }
+                diagnostic = {
+                    "batch_id": batch_id,
+                    "folder_path": folder_path,
+                    "error": str(exc),
+                }
+
+            def add_batch(run: dict, batch: dict = batch_summary, diagnostic: dict | None = diagnostic) -> None:
+                run["batches"] = [*run["batches"], batch]
+                if diagnostic is not None:
+                    run["diagnostics"] = [*run["diagnostics"], diagnostic]
                 run["batch_completed"] = int(run["batch_completed"]) + 1
 
+            run = self._update_run(run_id, add_batch)
+            if job is not None:
+                self._persist_state()
+                job.report_progress(run["batch_completed"], len(folder_paths))
+
+        record = self._update_run(run_id, self._settle_batch_run)
+        self._persist_state()
+        return record
+
+    def _settle_batch_run(self, run: dict) -> None:
+        child_states = [
+            batch["state"] for batch in run["batches"] if isinstance(batch.get("state"), str)
+        ]
         all_failed = bool(child_states) and all(
             state == RunState.FAILED_NEEDS_ATTENTION.value for state in child_states
         )
@@ -164,68 +323,170 @@ class ApiService:
         else:
             self._transition_run_state(run, RunState.AWAITING_REVIEW)
 
-        self._persist_state()
-        return deepcopy(run)
-
-    def _analyze_folder_run(self, folder_path: object, *, mode: str, persist: bool) -> dict:
+    def _analyze_folder_run(self, folder_path: object, *, mode: str, persist: bool) -> FrozenDict:
         del mode
         if not isinstance(folder_path, str) or not folder_path:
             raise ValueError("folder_path is required")
 
         profile = analyze_folder(folder_path)
         profile_payload = asdict(profile)
-        run_id = self._next_run_id()
+        run_id, created_at = self._next_run_id()
         run = {
             "run_id": run_id,
             "state": RunState.QUEUED.value,
+            "created_at": created_at,
             "profile": profile_payload,
             "diagnostics": [],
         }
-        self._runs[run_id] = run
         self._transition_run_state(run, RunState.ANALYZING)
+        self._store_run(run)
         note_proposals, diagnostics, note_success_count = self._build_note_candidate_proposals(
             run_id, profile_payload.get("notes", [])
         )
         run["diagnostics"] = diagnostics
         note_count = profile_payload.get("note_count", 0)
 
+        proposals: list[dict] = []
         if note_success_count == 0 and diagnostics:
             self._transition_run_state(run, RunState.FAILED_NEEDS_ATTENTION)
-            self._proposals_by_run[run_id] = []
         elif note_count == 0:
-            self._proposals_by_run[run_id] = []
             self._transition_run_state(run, RunState.AWAITING_REVIEW)
         else:
             proposals = note_proposals or self._build_initial_proposals(run_id)
-            self._proposals_by_run[run_id] = proposals
             if any(proposal.get("action_mode") == "auto" for proposal in proposals):
                 self._transition_run_state(run, RunState.READY_SAFE_AUTO)
             else:
                 self._transition_run_state(run, RunState.AWAITING_REVIEW)
+        self._store_proposals(run_id, proposals)
+        record = self._store_run(run)
         if persist:
             self._persist_state()
-        return run
+        return record
+
+    def _store_run(self, run: dict) -> FrozenDict:
+        """Publish ``run`` as the stored record for its id and mark it for persistence."""
+        record = freeze(run)
+        run_id = record["run_id"]
+        with self._runs_lock:
+            previous = self._runs.get(run_id)
+            self._runs[run_id] = record
+            self._index_run(run_id, previous.get("state") if previous is not None else None, record.get("state"))
+            self._mark_state("runs", run_id)
+        return record
+
+    def _update_run(self, run_id: str, update: Callable[[dict], None]) -> FrozenDict:
+        """Apply ``update`` to a shallow copy of the stored run and store the result atomically."""
+        with self._runs_lock:
+            run = dict(self._runs[run_id])
+            update(run)
+            return self._store_run(run)
+
+    def _index_run(self, run_id: str, previous_state: object, state: object) -> None:
+        # Index lists are replaced rather than edited so lock-free readers never see them change.
+        if previous_state is None:
+            self._run_ids = index_add(self._run_ids, run_id, _run_id_order)
+        if previous_state == state:
+            return
+        if isinstance(previous_state, str):
+            self._run_ids_by_state[previous_state] = index_remove(
+                self._run_ids_by_state.get(previous_state, []), run_id, _run_id_order
+            )
+        if isinstance(state, str):
+            self._run_ids_by_state[state] = index_add(
+                self._run_ids_by_state.get(state, []), run_id, _run_id_order
+            )
+
+    def _store_proposals(self, run_id: str, proposals: list[dict]) -> None:
+        with self._runs_lock:
+            self._proposal_count += len(proposals) - len(self._proposals_by_run.get(run_id, ()))
+            self._proposals_by_run[run_id] = freeze(proposals)
+            self._index_proposals(run_id)
+            self._mark_state("proposals", run_id)
+
+    def _index_proposals(self, run_id: str) -> None:
+        positions: dict[str, int] = {}
+        by_status: dict[str, list[int]] = {}
+        for position, proposal in enumerate(self._proposals_by_run.get(run_id, [])):
+            positions[str(proposal.get("proposal_id"))] = position
+            by_status.setdefault(str(proposal.get("status")), []).append(position)
+        self._proposal_positions[run_id] = positions
+        self._proposal_positions_by_status[run_id] = by_status
+
+    def _rebuild_indexes(self) -> None:
+        self._run_ids = []
+        self._run_ids_by_state = {}
+        for run_id, run in self._runs.items():
+            self._index_run(run_id, None, run.get("state"))
+        self._proposal_positions = {}
+        self._proposal_positions_by_status = {}
+        for run_id in self._proposals_by_run:
+            self._index_proposals(run_id)
+        self._proposal_count = sum(len(items) for items in self._proposals_by_run.values())
+
+    def _set_proposal_status(self, run_id: str, selected: list[dict], status: str) -> None:
+        selected_ids = {id(proposal) for proposal in selected}
+        self._store_proposals(
+            run_id,
+            [
+                {**proposal, "status": status} if id(proposal) in selected_ids else proposal
+                for proposal in self._proposals_by_run.get(run_id, [])
+            ],
+        )
 
     def get_run(self, run_id: str) -> dict:
         if run_id not in self._runs:
             raise ValueError(f"unknown run id: {run_id}")
-        return deepcopy(self._runs[run_id])
+        return self._runs[run_id]
 
     def list_runs(self, filters: dict | None = None) -> dict:
+        """Return one page of runs ordered by run id.
+
+        Filters: ``state``, ``created_after``/``created_before`` (ISO 8601),
+        ``order`` (``asc`` or ``desc``), ``limit`` and ``cursor``, the
+        ``next_cursor`` of the previous page. Without ``limit`` every matching
+        run is returned, as before pagination existed. The state index keeps
+        the cost of a page proportional to its size rather than to the run history,
+        and since run ids are allocated in creation order, the time window is
+        found by bisecting the index.
+        """
         if filters is not None and not isinstance(filters, dict):
             raise ValueError("filters must be an object")
+        filters = filters or {}
 
         active_state = None
-        if filters is not None and "state" in filters:
+        if "state" in filters:
             state_value = filters.get("state")
             if not isinstance(state_value, str) or not state_value:
                 raise ValueError("state filter must be a non-empty string")
             active_state = state_value
 
-        ordered = [deepcopy(self._runs[run_id]) for run_id in sorted(self._runs.keys())]
-        if active_state is not None:
-            ordered = [run for run in ordered if run.get("state") == active_state]
-        return {"runs": ordered}
+        created_after = parse_timestamp("created_after", filters.get("created_after"))
+        created_before = parse_timestamp("created_before", filters.get("created_before"))
+        limit = parse_limit(filters.get("limit"), default=None)
+        descending = parse_order(filters.get("order"))
+        cursor = filters.get("cursor")
+        if cursor is not None and (not isinstance(cursor, str) or not cursor):
+            raise ValueError("cursor must be a non-empty string")
+
+        def created(run_id: str) -> datetime:
+            created_at = self._runs[run_id].get("created_at")
+            if not isinstance(created_at, str):
+                return _EPOCH
+            return parse_timestamp("created_at", created_at)
+
+        run_ids = self._run_ids if active_state is None else self._run_ids_by_state.get(active_state, [])
+        lo = bisect_right(run_ids, created_after, key=created) if created_after is not None else 0
+        hi = bisect_left(run_ids, created_before, key=created) if created_before is not None else None
+        page, next_cursor = page_keys(
+            run_ids,
+            limit=limit,
+            after=cursor,
+            descending=descending,
+            order=_run_id_order,
+            lo=lo,
+            hi=hi,
+        )
+        return {"runs": [self._runs[run_id] for run_id in page], "next_cursor": next_cursor}
 
     def get_run_proposals(self, run_id: str, filters: dict | None = None) -> dict:
         if run_id not in self._runs:
@@ -234,20 +495,48 @@ class ApiService:
         if filters is not None and not isinstance(filters, dict):
             raise ValueError("filters must be an object")
 
-        allowed_keys = {"risk_tier", "action_mode", "status"}
+        filters = dict(filters or {})
+        limit = parse_limit(filters.pop("limit", None), default=None)
+        cursor = filters.pop("cursor", None)
+        allowed_keys = {"risk_tier", "action_mode", "status", "change_type"}
         active_filters = {}
-        for key, value in (filters or {}).items():
+        for key, value in filters.items():
             if key not in allowed_keys:
                 raise ValueError(f"unsupported proposal filter: {key}")
             if not isinstance(value, str) or not value:
                 raise ValueError(f"{key} filter must be a non-empty string")
             active_filters[key] = value
 
-        proposals = [deepcopy(item) for item in self._proposals_by_run.get(run_id, [])]
-        for key, value in active_filters.items():
-            proposals = [item for item in proposals if item.get(key) == value]
-        return {"run_id": run_id, "proposals": proposals}
+        after = None
+        if cursor is not None:
+            if not isinstance(cursor, str) or cursor not in self._proposal_positions.get(run_id, {}):
+                raise ValueError(f"unknown proposal cursor: {cursor}")
+            after = self._proposal_positions[run_id][cursor]
+
+        proposals = self._proposals_by_run.get(run_id, [])
+        status = active_filters.pop("status", None)
+        if status is None:
+            positions = range(len(proposals))
+        else:
+            positions = self._proposal_positions_by_status.get(run_id, {}).get(status, [])
+
+        def matches(position: int) -> bool:
+            proposal = proposals[position]
+            return all(proposal.get(key) == value for key, value in active_filters.items())
 
+        if status is not None:
+            # The status index may trail a concurrent writer by one update; re-check.
+            active_filters["status"] = status
+        page, next_position = page_keys(
+            positions, limit=limit, after=after, accept=matches if active_filters else None
+        )
+        return {
+            "run_id": run_id,
+            "proposals": [proposals[position] for position in page],
+            "next_cursor": proposals[next_position]["proposal_id"] if next_position is not None else None,
+        }
+
+    @_synchronized("_runs_lock")
     def approve_run(self, run_id: str, payload: dict) -> dict:
         if run_id not in self._runs:
             raise ValueError(f"unknown run id: {run_id}")
@@ -275,12 +564,13 @@ class ApiService:
         if not selected:
             raise ValueError("no matching proposals to approve")
 
-        for proposal in selected:
-            proposal["status"] = "approved"
+        self._set_proposal_status(run_id, selected, "approved")
 
+        run = dict(run)
         if run.get("state") == RunState.READY_SAFE_AUTO.value:
             self._transition_run_state(run, RunState.AWAITING_REVIEW)
         self._transition_run_state(run, RunState.APPROVED)
+        self._store_run(run)
         self._persist_state()
 
         return {
@@ -289,6 +579,7 @@ class ApiService:
             "approved_count": len(selected),
         }
 
+    @_synchronized("_runs_lock")
     def apply_run(self, run_id: str, payload: dict) -> dict:
         if run_id not in self._runs:
             raise ValueError(f"unknown run id: {run_id}")
@@ -316,19 +607,21 @@ class ApiService:
         if not selected:
             raise ValueError("no matching proposals to apply")
 
-        for proposal in selected:
-            proposal["status"] = "applied"
+        self._set_proposal_status(run_id, selected, "applied")
 
         changed_note_ids = [proposal["proposal_id"] for proposal in selected]
         snapshot = apply_batch(self._snapshot_store, run_id, changed_note_ids)
 
+        run = dict(run)
         self._transition_run_state(run, RunState.APPLIED)
         run["snapshot_id"] = snapshot.snapshot_id
-        self._persist_state()
+        self._store_run(run)
+        self._mark_state("snapshots", run_id)
 
         parent_run_id = self._find_parent_run_for_child(run_id)
         if parent_run_id is not None:
             self._update_batch_checkpoint(parent_run_id, run_id, snapshot.snapshot_id)
+        self._persist_state()
 
         return {
             "run_id": run_id,
@@ -337,6 +630,7 @@ class ApiService:
             "applied_count": len(selected),
         }
 
+    @_synchronized("_runs_lock")
     def rollback_run(self, run_id: str, payload: dict) -> dict:
         if run_id not in self._runs:
             raise ValueError(f"unknown run id: {run_id}")
@@ -352,9 +646,10 @@ class ApiService:
         if not decision.allowed:
             raise ValueError(decision.reason)
 
-        run = self._runs[run_id]
+        run = dict(self._runs[run_id])
         run["state"] = "rolled_back"
         run["rolled_back_snapshot_id"] = requested_snapshot
+        self._store_run(run)
         self._persist_state()
 
         return {
@@ -452,6 +747,136 @@ class ApiService:
         }
 
     def ask(self, payload: dict) -> dict:
+        context = self._prepare_ask(payload)
+        duplicate = context.get("duplicate_response") or self._claim_ask_event(context["event_id"])
+        if duplicate is not None:
+            return duplicate
+
+        try:
+            llm_result = None
+            llm_trace = {"provider": None, "model": None, "success": False, "error": None}
+
+            try:
+                from mind_lite.llm import generate_answer, get_llm_config
+                llm_config = get_llm_config()
+                llm_result = generate_answer(context["query"], context["citations"], llm_config)
+                llm_trace = self._llm_trace(llm_result)
+            except Exception as e:
+                llm_trace["error"] = str(e)
+
+            return self._finish_ask(context, llm_result, llm_trace)
+        finally:
+            self._release_ask_event(context["event_id"])
+
+    def ask_stream(self, payload: dict) -> Iterator[dict]:
+        """Validate an /ask payload eagerly and return a generator of stream events.
+
+        Events are ``citations`` (sent before generation starts), one
+        ``token`` per completion delta and a final ``trace`` carrying the full
+        /ask response. Validation errors raise here, before any event is sent.
+        """
+        context = self._prepare_ask(payload)
+        return self._iter_ask_events(context)
+
+    def _iter_ask_events(self, context: dict) -> Iterator[dict]:
+        duplicate = context.get("duplicate_response") or self._claim_ask_event(context["event_id"])
+        if duplicate is not None:
+            yield {
+                "event": "citations",
+                "data": {
+                    "citations": duplicate["citations"],
+                    "retrieval_trace": duplicate["retrieval_trace"],
+                },
+            }
+            yield {"event": "token", "data": {"text": duplicate["answer"]["text"]}}
+            yield {"event": "trace", "data": duplicate}
+            return
+
+        try:
+            yield {
+                "event": "citations",
+                "data": {
+                    "citations": freeze(context["citations"]),
+                    "retrieval_trace": freeze(context["retrieval_trace"]),
+                },
+            }
+
+            llm_result = None
+            llm_trace = {"provider": None, "model": None, "success": False, "error": None}
+            try:
+                from mind_lite.llm import get_llm_config, stream_answer
+                llm_config = get_llm_config()
+                for event in stream_answer(context["query"], context["citations"], llm_config):
+                    if event.get("type") == "token":
+                        yield {"event": "token", "data": {"text": event["content"]}}
+                    elif event.get("type") == "done":
+                        llm_result = event
+                if llm_result is not None:
+                    llm_trace = self._llm_trace(llm_result)
+            except Exception as e:
+                llm_trace["error"] = str(e)
+
+            yield {"event": "trace", "data": self._finish_ask(context, llm_result, llm_trace)}
+        finally:
+            self._release_ask_event(context["event_id"])
+
+    def _claim_ask_event(self, event_id: str | None) -> dict | None:
+        """Make this request the one answering ``event_id``, or return the response to replay.
+
+        A concurrent request for the same event id waits for the first one.
+        If that one fails or is abandoned, the waiting request answers instead.
+        """
+        if event_id is None:
+            return None
+        while True:
+            with self._replay_lock:
+                duplicate = self._replayed_response(
+                    self._ask_replay_ledger, "ask", self._ask_response_by_event, event_id
+                )
+                if duplicate is not None:
+                    return duplicate
+                pending = self._ask_pending_events.get(event_id)
+                if pending is None:
+                    self._ask_pending_events[event_id] = threading.Event()
+                    return None
+            pending.wait()
+
+    def _release_ask_event(self, event_id: str | None) -> None:
+        if event_id is None:
+            return
+        with self._replay_lock:
+            pending = self._ask_pending_events.pop(event_id, None)
+        if pending is not None:
+            pending.set()
+
+    def _replayed_response(
+        self, ledger: RunReplayLedger, run_id: str, responses: dict[str, dict], event_id: str
+    ) -> dict | None:
+        """The stored response for a repeated ``event_id``, marked as a duplicate, or None.
+
+        Callers hold the lock guarding ``responses``.
+        """
+        cached = responses.get(event_id)
+        if cached is None:
+            return None
+        replay = apply_event(ledger, run_id, event_id)
+        duplicated = dict(cached)
+        duplicated["idempotency"] = {
+            "event_id": event_id,
+            "duplicate": True,
+            "reason": replay.reason,
+        }
+        return duplicated
+
+    def _llm_trace(self, llm_result: dict) -> dict:
+        return {
+            "provider": llm_result.get("provider"),
+            "model": llm_result.get("model"),
+            "success": llm_result.get("success", False),
+            "error": llm_result.get("error"),
+        }
+
+    def _prepare_ask(self, payload: dict) -> dict:
         query = payload.get("query")
         if not isinstance(query, str) or not query.strip():
             raise ValueError("query is required")
@@ -461,19 +886,15 @@ class ApiService:
             raise ValueError("event_id must be a non-empty string")
         normalized_event_id = event_id.strip() if isinstance(event_id, str) else None
 
+        # The event id only enters the ledger with its response (see
+        # ``_finish_ask``), so an abandoned stream can be retried.
         if normalized_event_id is not None:
-            replay = apply_event(self._ask_replay_ledger, "ask", normalized_event_id)
-            if replay.duplicate:
-                cached = self._ask_response_by_event.get(normalized_event_id)
-                if cached is None:
-                    raise ValueError("missing replay cache for duplicate event")
-                duplicated = deepcopy(cached)
-                duplicated["idempotency"] = {
-                    "event_id": normalized_event_id,
-                    "duplicate": True,
-                    "reason": replay.reason,
-                }
-                return duplicated
+            with self._replay_lock:
+                duplicated = self._replayed_response(
+                    self._ask_replay_ledger, "ask", self._ask_response_by_event, normalized_event_id
+                )
+            if duplicated is not None:
+                return {"duplicate_response": duplicated}
 
         allow_fallback = payload.get("allow_fallback", True)
         if not isinstance(allow_fallback, bool):
@@ -552,23 +973,28 @@ class ApiService:
                     "error": "retrieval_failed",
                 }
 
-        llm_result = None
-        llm_trace = {"provider": None, "model": None, "success": False, "error": None}
-        
-        try:
-            from mind_lite.llm import generate_answer, get_llm_config
-            llm_config = get_llm_config()
-            llm_result = generate_answer(query.strip(), citations, llm_config)
-            llm_trace = {
-                "provider": llm_result.get("provider"),
-                "model": llm_result.get("model"),
-                "success": llm_result.get("success", False),
-                "error": llm_result.get("error"),
-            }
-        except Exception as e:
-            llm_trace["error"] = str(e)
+        return {
+            "query": query.strip(),
+            "event_id": normalized_event_id,
+            "local_confidence": local_confidence,
+            "citations": citations,
+            "retrieval_trace": retrieval_trace,
+            "routing": routing,
+            "sensitivity": sensitivity,
+            "budget_decision": budget_decision,
+        }
 
-        answer_text = f"Draft answer for: {query.strip()}"
+    def _finish_ask(self, context: dict, llm_result: dict | None, llm_trace: dict) -> dict:
+        query = context["query"]
+        normalized_event_id = context["event_id"]
+        local_confidence = context["local_confidence"]
+        citations = context["citations"]
+        retrieval_trace = context["retrieval_trace"]
+        routing = context["routing"]
+        sensitivity = context["sensitivity"]
+        budget_decision = context["budget_decision"]
+
+        answer_text = f"Draft answer for: {query}"
         answer_confidence = local_confidence
         
         if llm_result and llm_result.get("success"):
@@ -607,7 +1033,10 @@ class ApiService:
             "reason": "accepted" if normalized_event_id is not None else "not_provided",
         }
         if normalized_event_id is not None:
-            self._ask_response_by_event[normalized_event_id] = deepcopy(response)
+            with self._replay_lock:
+                apply_event(self._ask_replay_ledger, "ask", normalized_event_id)
+                self._ask_response_by_event[normalized_event_id] = freeze(response)
+                self._mark_state("ask_replay", normalized_event_id)
             self._persist_state()
         return response
 
@@ -699,6 +1128,7 @@ class ApiService:
             "sanitized": True,
         }
 
+    @_synchronized("_publish_lock")
     def mark_for_gom(self, payload: dict) -> dict:
         event_id = payload.get("event_id")
         if event_id is not None and (not isinstance(event_id, str) or not event_id.strip()):
@@ -706,17 +1136,13 @@ class ApiService:
         normalized_event_id = event_id.strip() if isinstance(event_id, str) else None
 
         if normalized_event_id is not None:
-            replay = apply_event(self._publish_mark_replay_ledger, "publish_mark", normalized_event_id)
-            if replay.duplicate:
-                cached = self._publish_mark_response_by_event.get(normalized_event_id)
-                if cached is None:
-                    raise ValueError("missing replay cache for duplicate event")
-                duplicated = deepcopy(cached)
-                duplicated["idempotency"] = {
-                    "event_id": normalized_event_id,
-                    "duplicate": True,
-                    "reason": replay.reason,
-                }
+            duplicated = self._replayed_response(
+                self._publish_mark_replay_ledger,
+                "publish_mark",
+                self._publish_mark_response_by_event,
+                normalized_event_id,
+            )
+            if duplicated is not None:
                 return duplicated
 
         draft_id = payload.get("draft_id")
@@ -742,19 +1168,24 @@ class ApiService:
             "duplicate": False,
             "reason": "accepted" if normalized_event_id is not None else "not_provided",
         }
-        self._gom_queue.append(item)
+        record = freeze(item)
+        self._gom_queue = [*self._gom_queue, record]
+        self._mark_state("gom_queue")
         if normalized_event_id is not None:
-            self._publish_mark_response_by_event[normalized_event_id] = deepcopy(item)
+            apply_event(self._publish_mark_replay_ledger, "publish_mark", normalized_event_id)
+            self._publish_mark_response_by_event[normalized_event_id] = record
+            self._mark_state("publish_mark_replay", normalized_event_id)
         self._persist_state()
-        return deepcopy(item)
+        return record
 
     def list_gom_queue(self) -> dict:
-        items = deepcopy(self._gom_queue)
+        items = list(self._gom_queue)
         return {
             "count": len(items),
             "items": items,
         }
 
+    @_synchronized("_publish_lock")
     def mark_for_revision(self, payload: dict) -> dict:
         draft_id = payload.get("draft_id")
         if not isinstance(draft_id, str) or not draft_id.strip():
@@ -786,17 +1217,20 @@ class ApiService:
             "recommended_actions": list(recommended_actions),
             "status": "queued_for_revision",
         }
-        self._revision_queue.append(item)
+        record = freeze(item)
+        self._revision_queue.append(record)
+        self._mark_state("revision_queue", str(len(self._revision_queue) - 1))
         self._persist_state()
-        return deepcopy(item)
+        return record
 
     def list_revision_queue(self) -> dict:
-        items = deepcopy(self._revision_queue)
+        items = list(self._revision_queue)
         return {
             "count": len(items),
             "items": items,
         }
 
+    @_synchronized("_publish_lock")
     def export_for_gom(self, payload: dict) -> dict:
         event_id = payload.get("event_id")
         if event_id is not None and (not isinstance(event_id, str) or not event_id.strip()):
@@ -804,17 +1238,13 @@ class ApiService:
         normalized_event_id = event_id.strip() if isinstance(event_id, str) else None
 
         if normalized_event_id is not None:
-            cached = self._publish_export_response_by_event.get(normalized_event_id)
-            if cached is not None:
-                replay = apply_event(self._publish_export_replay_ledger, "publish_export", normalized_event_id)
-                if not replay.duplicate:
-                    replay = apply_event(self._publish_export_replay_ledger, "publish_export", normalized_event_id)
-                duplicated = deepcopy(cached)
-                duplicated["idempotency"] = {
-                    "event_id": normalized_event_id,
-                    "duplicate": True,
-                    "reason": replay.reason,
-                }
+            duplicated = self._replayed_response(
+                self._publish_export_replay_ledger,
+                "publish_export",
+                self._publish_export_response_by_event,
+                normalized_event_id,
+            )
+            if duplicated is not None:
                 return duplicated
 
         draft_id = payload.get("draft_id")
@@ -862,13 +1292,13 @@ class ApiService:
             "reason": "accepted" if normalized_event_id is not None else "not_provided",
         }
         if normalized_event_id is not None:
-            replay = apply_event(self._publish_export_replay_ledger, "publish_export", normalized_event_id)
-            if replay.duplicate:
-                raise ValueError("missing replay cache for duplicate event")
-            self._publish_export_response_by_event[normalized_event_id] = deepcopy(response)
+            apply_event(self._publish_export_replay_ledger, "publish_export", normalized_event_id)
+            self._publish_export_response_by_event[normalized_event_id] = freeze(response)
+            self._mark_state("publish_export_replay", normalized_event_id)
             self._persist_state()
         return response
 
+    @_synchronized("_publish_lock")
     def confirm_gom(self, payload: dict) -> dict:
         event_id = payload.get("event_id")
         if event_id is not None and (not isinstance(event_id, str) or not event_id.strip()):
@@ -876,17 +1306,13 @@ class ApiService:
         normalized_event_id = event_id.strip() if isinstance(event_id, str) else None
 
         if normalized_event_id is not None:
-            replay = apply_event(self._publish_confirm_replay_ledger, "publish_confirm", normalized_event_id)
-            if replay.duplicate:
-                cached = self._publish_confirm_response_by_event.get(normalized_event_id)
-                if cached is None:
-                    raise ValueError("missing replay cache for duplicate event")
-                duplicated = deepcopy(cached)
-                duplicated["idempotency"] = {
-                    "event_id": normalized_event_id,
-                    "duplicate": True,
-                    "reason": replay.reason,
-                }
+            duplicated = self._replayed_response(
+                self._publish_confirm_replay_ledger,
+                "publish_confirm",
+                self._publish_confirm_response_by_event,
+                normalized_event_id,
+            )
+            if duplicated is not None:
                 return duplicated
 
         draft_id = payload.get("draft_id")
@@ -906,7 +1332,8 @@ class ApiService:
         if match_index is None:
             raise ValueError(f"unknown draft id: {draft_id}")
 
-        queued_item = self._gom_queue.pop(match_index)
+        queued_item = self._gom_queue[match_index]
+        self._gom_queue = self._gom_queue[:match_index] + self._gom_queue[match_index + 1 :]
         published = {
             "draft_id": queued_item["draft_id"],
             "title": queued_item["title"],
@@ -918,27 +1345,33 @@ class ApiService:
             "duplicate": False,
             "reason": "accepted" if normalized_event_id is not None else "not_provided",
         }
-        self._gom_published.append(published)
+        record = freeze(published)
+        self._gom_published.append(record)
+        self._mark_state("gom_queue")
+        self._mark_state("gom_published", str(len(self._gom_published) - 1))
         if normalized_event_id is not None:
-            self._publish_confirm_response_by_event[normalized_event_id] = deepcopy(published)
+            apply_event(self._publish_confirm_replay_ledger, "publish_confirm", normalized_event_id)
+            self._publish_confirm_response_by_event[normalized_event_id] = record
+            self._mark_state("publish_confirm_replay", normalized_event_id)
         self._persist_state()
-        return deepcopy(published)
+        return record
 
     def list_published(self) -> dict:
-        items = deepcopy(self._gom_published)
+        items = list(self._gom_published)
         return {
             "count": len(items),
             "items": items,
         }
 
     def organize_classify(self, payload: dict) -> dict:
-        from mind_lite.organize.classify_llm import classify_note
+        notes = self._validate_classify_notes(payload)
+        return {"results": self._classify_notes(notes)}
 
+    def _validate_classify_notes(self, payload: dict) -> list[dict]:
         notes = payload.get("notes")
         if not isinstance(notes, list) or not notes:
             raise ValueError("notes must be a non-empty list")
 
-        results = []
         for note in notes:
             if not isinstance(note, dict):
                 raise ValueError("each note must be an object")
@@ -946,19 +1379,30 @@ class ApiService:
             note_id = note.get("note_id")
             if not isinstance(note_id, str) or not note_id.strip():
                 raise ValueError("note_id is required")
+        return notes
+
+    def _classify_notes(
+        self, notes: list[dict], job: JobContext | None = None, results: list[dict] | None = None
+    ) -> list[dict]:
+        from mind_lite.organize.classify_llm import classify_note
 
+        results = list(results or [])
+        for note in notes[len(results):]:
             classified = classify_note(note)
             confidence = classified.get("confidence", 0.5)
             action_mode = decide_action_mode("low", confidence).value
             results.append({
-                "note_id": note_id.strip(),
+                "note_id": note["note_id"].strip(),
                 "primary_para": classified.get("primary", "resource"),
                 "secondary_para": classified.get("secondary", []),
                 "confidence": confidence,
                 "action_mode": action_mode,
             })
+            if job is not None:
+                job.update_checkpoint(results=results)
+                job.report_progress(len(results), len(notes))
 
-        return {"results": results}
+        return results
 
     def organize_propose_structure(self, payload: dict) -> dict:
         notes = payload.get("notes")
@@ -1025,6 +1469,7 @@ class ApiService:
             "suggestions": suggestions,
         }
 
+    @_synchronized("_replay_lock")
     def links_apply(self, payload: dict) -> dict:
         source_note_id = payload.get("source_note_id")
         if not isinstance(source_note_id, str) or not source_note_id.strip():
@@ -1036,17 +1481,13 @@ class ApiService:
         normalized_event_id = event_id.strip() if isinstance(event_id, str) else None
 
         if normalized_event_id is not None:
-            replay = apply_event(self._links_apply_replay_ledger, "links_apply", normalized_event_id)
-            if replay.duplicate:
-                cached = self._links_apply_response_by_event.get(normalized_event_id)
-                if cached is None:
-                    raise ValueError("missing replay cache for duplicate event")
-                duplicated = deepcopy(cached)
-                duplicated["idempotency"] = {
-                    "event_id": normalized_event_id,
-                    "duplicate": True,
-                    "reason": replay.reason,
-                }
+            duplicated = self._replayed_response(
+                self._links_apply_replay_ledger,
+                "links_apply",
+                self._links_apply_response_by_event,
+                normalized_event_id,
+            )
+            if duplicated is not None:
                 return duplicated
 
         links = payload.get("links")
@@ -1093,10 +1534,76 @@ class ApiService:
             "reason": "accepted" if normalized_event_id is not None else "not_provided",
         }
         if normalized_event_id is not None:
-            self._links_apply_response_by_event[normalized_event_id] = deepcopy(response)
+            apply_event(self._links_apply_replay_ledger, "links_apply", normalized_event_id)
+            self._links_apply_response_by_event[normalized_event_id] = freeze(response)
+            self._mark_state("links_apply_replay", normalized_event_id)
             self._persist_state()
         return response
 
+    def submit_job(self, payload: dict) -> dict:
+        job_type = payload.get("type")
+        if job_type not in self._job_manager.kinds:
+            raise ValueError(f"type must be one of {', '.join(self._job_manager.kinds)}")
+        job_payload = payload.get("payload", {})
+        if not isinstance(job_payload, dict):
+            raise ValueError("payload must be an object")
+
+        if job_type == "rag_index_vault":
+            self._validate_index_payload(job_payload, "vault_path")
+        elif job_type == "analyze_folders":
+            self._validate_analyze_folders(job_payload)
+        else:
+            self._validate_classify_notes(job_payload)
+        return self._job_manager.submit(job_type, job_payload)
+
+    def get_job(self, job_id: str) -> dict:
+        return self._job_manager.get(job_id)
+
+    def list_jobs(self) -> dict:
+        items = self._job_manager.list_jobs()
+        return {
+            "count": len(items),
+            "items": items,
+        }
+
+    def cancel_job(self, job_id: str) -> dict:
+        return self._job_manager.cancel(job_id)
+
+    def resume_job(self, job_id: str) -> dict:
+        return self._job_manager.resume(job_id)
+
+    def _run_index_vault_job(self, payload: dict, job: JobContext) -> dict:
+        # Indexing commits in one transaction and reverts its vector writes
+        # when it is rolled back, so a cancelled or interrupted run leaves
+        # nothing behind to skip; re-running it is cheap because chunks
+        # embedded before the interruption come from the embedding cache.
+        vault_path, incremental = self._validate_index_payload(payload, "vault_path")
+        self._ensure_rag_components()
+
+        def report(progress: dict) -> None:
+            job.report_progress(
+                progress["files_done"],
+                progress["files_total"],
+                chunks_embedded=progress["chunks_embedded"],
+            )
+
+        return self._rag_indexing.index_vault(vault_path, incremental=incremental, progress=report)
+
+    def _run_analyze_folders_job(self, payload: dict, job: JobContext) -> dict:
+        folder_paths, mode = self._validate_analyze_folders(payload)
+        run_id = job.checkpoint.get("run_id")
+        run = self._runs.get(run_id) if isinstance(run_id, str) else None
+        if run is None or run.get("state") != RunState.ANALYZING.value:
+            run = self._start_batch_run(folder_paths)
+            job.save_checkpoint(run_id=run["run_id"])
+        record = self._analyze_folder_batches(run["run_id"], folder_paths, mode, job)
+        return {"run_id": record["run_id"], "state": record["state"]}
+
+    def _run_classify_job(self, payload: dict, job: JobContext) -> dict:
+        notes = self._validate_classify_notes(payload)
+        results = job.checkpoint.get("results")
+        return {"results": self._classify_notes(notes, job, results if isinstance(results, list) else None)}
+
     def _find_parent_run_for_child(self, child_run_id: str) -> str | None:
         for run_id, run in self._runs.items():
             batches = run.get("batches", [])
@@ -1114,21 +1621,25 @@ class ApiService:
         batches = parent.get("batches", [])
         if not isinstance(batches, list):
             return
-        for batch in batches:
-            if isinstance(batch, dict) and batch.get("run_id") == child_run_id:
-                batch["snapshot_id"] = snapshot_id
-                break
+        updated = dict(parent)
+        updated["batches"] = [
+            {**batch, "snapshot_id": snapshot_id}
+            if isinstance(batch, dict) and batch.get("run_id") == child_run_id
+            else batch
+            for batch in batches
+        ]
         applied_batch_ids = parent.get("applied_batch_ids", [])
         if not isinstance(applied_batch_ids, list):
             applied_batch_ids = []
         if child_run_id not in applied_batch_ids:
-            applied_batch_ids.append(child_run_id)
-            parent["applied_batch_ids"] = applied_batch_ids
-        self._persist_state()
+            updated["applied_batch_ids"] = [*applied_batch_ids, child_run_id]
+        self._store_run(updated)
 
-    def _next_run_id(self) -> str:
-        self._run_counter += 1
-        return f"run_{self._run_counter:04d}"
+    def _next_run_id(self) -> tuple[str, str]:
+        """Allocate a run id and its ``created_at``; both grow in the same order."""
+        with self._runs_lock:
+            self._run_counter += 1
+            return f"run_{self._run_counter:04d}", _now()
 
     def _transition_run_state(self, run: dict, target: RunState) -> None:
         current_value = run.get("state")
@@ -1142,38 +1653,68 @@ class ApiService:
         run["state"] = target.value
 
     def _load_state_if_present(self) -> None:
-        if self._state_file is None or not self._state_file.exists():
+        """Restore state from the SQLite store, importing a legacy JSON state file once."""
+        if self._state_store is None:
             return
-        payload = json.loads(self._state_file.read_text(encoding="utf-8"))
+        self._state_store.init_schema()
+        legacy_file = self._state_file
+        if self._state_store.is_empty():
+            if legacy_file != self._state_store.db_path and legacy_file.exists():
+                self._restore_state(json.loads(legacy_file.read_text(encoding="utf-8")))
+                self._mark_all_state_dirty()
+                self._persist_state()
+            return
+        self._restore_state(self._stored_state_payload())
+
+    def _stored_state_payload(self) -> dict:
+        store = self._state_store
+        payload: dict = {
+            "run_counter": store.get_meta("run_counter", 0),
+            "runs": dict(store.load("runs")),
+            "proposals": dict(store.load("proposals")),
+            "snapshots": dict(store.load("snapshots")),
+            "gom_queue": [item for _, item in store.load("gom_queue")],
+            "jobs": {
+                "counter": store.get_meta("job_counter", 0),
+                "jobs": dict(store.load("jobs")),
+            },
+        }
+        for kind in _APPEND_ONLY_STATE_KINDS:
+            payload[kind] = [item for _, item in sorted(store.load(kind), key=lambda row: int(row[0]))]
+        for kind in _REPLAY_STATE_KINDS:
+            payload[kind] = dict(store.load(kind))
+        return payload
+
+    def _restore_state(self, payload: dict) -> None:
         self._run_counter = int(payload.get("run_counter", 0))
         self._runs = {
-            key: dict(value)
+            key: freeze(value)
             for key, value in payload.get("runs", {}).items()
             if isinstance(value, dict)
         }
         self._proposals_by_run = {
-            key: [dict(item) for item in value]
+            key: freeze(value)
             for key, value in payload.get("proposals", {}).items()
             if isinstance(value, list)
         }
         self._gom_queue = [
-            dict(item)
+            freeze(item)
             for item in payload.get("gom_queue", [])
             if isinstance(item, dict)
         ]
         self._revision_queue = [
-            dict(item)
+            freeze(item)
             for item in payload.get("revision_queue", [])
             if isinstance(item, dict)
         ]
         self._gom_published = [
-            dict(item)
+            freeze(item)
             for item in payload.get("gom_published", [])
             if isinstance(item, dict)
         ]
         ask_replay_payload = payload.get("ask_replay", {})
         self._ask_response_by_event = {
-            key: dict(value)
+            key: freeze(value)
             for key, value in ask_replay_payload.items()
             if isinstance(key, str) and isinstance(value, dict)
         }
@@ -1182,7 +1723,7 @@ class ApiService:
             apply_event(self._ask_replay_ledger, "ask", event_id)
         links_apply_replay_payload = payload.get("links_apply_replay", {})
         self._links_apply_response_by_event = {
-            key: dict(value)
+            key: freeze(value)
             for key, value in links_apply_replay_payload.items()
             if isinstance(key, str) and isinstance(value, dict)
         }
@@ -1191,7 +1732,7 @@ class ApiService:
             apply_event(self._links_apply_replay_ledger, "links_apply", event_id)
         publish_mark_replay_payload = payload.get("publish_mark_replay", {})
         self._publish_mark_response_by_event = {
-            key: dict(value)
+            key: freeze(value)
             for key, value in publish_mark_replay_payload.items()
             if isinstance(key, str) and isinstance(value, dict)
         }
@@ -1200,7 +1741,7 @@ class ApiService:
             apply_event(self._publish_mark_replay_ledger, "publish_mark", event_id)
         publish_export_replay_payload = payload.get("publish_export_replay", {})
         self._publish_export_response_by_event = {
-            key: dict(value)
+            key: freeze(value)
             for key, value in publish_export_replay_payload.items()
             if isinstance(key, str) and isinstance(value, dict)
         }
@@ -1209,7 +1750,7 @@ class ApiService:
             apply_event(self._publish_export_replay_ledger, "publish_export", event_id)
         publish_confirm_replay_payload = payload.get("publish_confirm_replay", {})
         self._publish_confirm_response_by_event = {
-            key: dict(value)
+            key: freeze(value)
             for key, value in publish_confirm_replay_payload.items()
             if isinstance(key, str) and isinstance(value, dict)
         }
@@ -1219,27 +1760,74 @@ class ApiService:
         snapshot_payload = payload.get("snapshots", {})
         if isinstance(snapshot_payload, dict):
             self._snapshot_store.import_records(snapshot_payload)
+        jobs_payload = payload.get("jobs", {})
+        if isinstance(jobs_payload, dict):
+            self._interrupted_job_ids = self._job_manager.import_records(jobs_payload)
+        self._rebuild_indexes()
+
+    def _mark_state(self, kind: str, key: str | None = None) -> None:
+        """Record that one entity changed; ``key=None`` rewrites the whole collection."""
+        if self._state_store is None:
+            return
+        with self._state_lock:
+            self._dirty_state.add((kind, key))
+
+    def _mark_all_state_dirty(self) -> None:
+        for run_id in self._runs:
+            self._mark_state("runs", run_id)
+        for run_id in self._proposals_by_run:
+            self._mark_state("proposals", run_id)
+        for run_id in self._snapshot_store.export_records():
+            self._mark_state("snapshots", run_id)
+        for job in self._job_manager.list_jobs():
+            self._mark_state("jobs", job["job_id"])
+        self._mark_state("gom_queue")
+        for kind, attr in _APPEND_ONLY_STATE_KINDS.items():
+            for index in range(len(getattr(self, attr))):
+                self._mark_state(kind, str(index))
+        for kind, attr in _REPLAY_STATE_KINDS.items():
+            for event_id in getattr(self, attr):
+                self._mark_state(kind, event_id)
+
+    def _on_job_change(self, job_id: str) -> None:
+        self._mark_state("jobs", job_id)
+        self._persist_state()
 
     def _persist_state(self) -> None:
-        if self._state_file is None:
+        if self._state_store is None:
             return
-        if self._state_file.parent != Path(""):
-            self._state_file.parent.mkdir(parents=True, exist_ok=True)
-        payload = {
-            "run_counter": self._run_counter,
-            "runs": self._runs,
-            "proposals": self._proposals_by_run,
-            "gom_queue": self._gom_queue,
-            "revision_queue": self._revision_queue,
-            "gom_published": self._gom_published,
-            "ask_replay": self._ask_response_by_event,
-            "links_apply_replay": self._links_apply_response_by_event,
-            "publish_mark_replay": self._publish_mark_response_by_event,
-            "publish_export_replay": self._publish_export_response_by_event,
-            "publish_confirm_replay": self._publish_confirm_response_by_event,
-            "snapshots": self._snapshot_store.export_records(),
-        }
-        self._state_file.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        with self._state_lock:
+            dirty, self._dirty_state = self._dirty_state, set()
+            with self._state_store.transaction():
+                self._state_store.set_meta("run_counter", self._run_counter)
+                self._state_store.set_meta("job_counter", self._job_manager.counter)
+                for kind, key in sorted(dirty, key=lambda item: (item[0], item[1] or "")):
+                    self._write_state_entity(kind, key)
+
+    def _write_state_entity(self, kind: str, key: str | None) -> None:
+        store = self._state_store
+        if kind == "gom_queue":
+            store.replace_kind(kind, [(str(index), item) for index, item in enumerate(self._gom_queue)])
+            return
+
+        if kind == "runs":
+            body = self._runs.get(key)
+        elif kind == "proposals":
+            body = self._proposals_by_run.get(key)
+        elif kind == "snapshots":
+            body = self._snapshot_store.export_run_records(key) or None
+        elif kind == "jobs":
+            body = self._job_manager.export_record(key)
+        elif kind in _APPEND_ONLY_STATE_KINDS:
+            items = getattr(self, _APPEND_ONLY_STATE_KINDS[kind])
+            body = items[int(key)] if int(key) < len(items) else None
+        else:
+            body = getattr(self, _REPLAY_STATE_KINDS[kind]).get(key)
+
+        if body is None:
+            store.delete(kind, key)
+        else:
+            store.put(kind, key, body)
 
     def _build_initial_proposals(self, run_id: str) -> list[dict]:
         proposal_specs = [
@@ -1388,6 +1976,12 @@ class ApiService:
         return "Resources"
 
     def _ensure_rag_components(self) -> None:
+        if getattr(self, "_rag_indexing", None) is not None:
+            return
+        with self._rag_lock:
+            self._create_rag_components()
+
+    def _create_rag_components(self) -> None:
         if not hasattr(self, "_rag_sqlite_store") or self._rag_sqlite_store is None:
             from mind_lite.rag.config import get_rag_config
             from mind_lite.rag.sqlite_store import SqliteStore
@@ -1401,55 +1995,77 @@ class ApiService:
             from mind_lite.rag.embeddings import EmbeddingAdapter
 
             cfg = get_rag_config()
-            self._rag_embedder = EmbeddingAdapter(model_name=cfg.embed_model)
+            cache = None
+            if cfg.embed_cache_path:
+                from mind_lite.rag.embedding_cache import EmbeddingCache
+
+                cache = EmbeddingCache(cfg.embed_cache_path, max_entries=cfg.embed_cache_max_entries)
+            self._rag_embedder = EmbeddingAdapter(model_name=cfg.embed_model, cache=cache)
 
         if not hasattr(self, "_rag_qdrant_index") or self._rag_qdrant_index is None:
-            from qdrant_client import QdrantClient
             from mind_lite.rag.config import get_rag_config
-            from mind_lite.rag.vector_index import QdrantIndex
+            from mind_lite.rag.vector_index import create_vector_index
 
             cfg = get_rag_config()
-            client = QdrantClient(url=cfg.qdrant_url)
-            self._rag_qdrant_index = QdrantIndex(client=client, collection_name=cfg.collection_name)
+            self._rag_qdrant_index = create_vector_index(cfg)
             self._rag_qdrant_index.ensure_collection(vector_size=384)
 
         if not hasattr(self, "_rag_retrieval") or self._rag_retrieval is None:
+            from mind_lite.rag.config import get_rag_config
             from mind_lite.rag.retrieval import RetrievalService
 
+            cfg = get_rag_config()
             self._rag_retrieval = RetrievalService(
                 sqlite_store=self._rag_sqlite_store,
                 qdrant_index=self._rag_qdrant_index,
                 embedder=self._rag_embedder,
+                hydrate=cfg.hydrate_chunks,
+                mode=cfg.retrieval_mode,
+                query_cache_size=cfg.query_cache_size,
+                result_cache_ttl_seconds=cfg.result_cache_ttl_seconds,
             )
 
         if not hasattr(self, "_rag_indexing") or self._rag_indexing is None:
+            from mind_lite.rag.config import get_rag_config
             from mind_lite.rag.indexing import IndexingService
 
+            cfg = get_rag_config()
             self._rag_indexing = IndexingService(
                 sqlite_store=self._rag_sqlite_store,
                 qdrant_index=self._rag_qdrant_index,
                 embedder=self._rag_embedder,
+                embed_batch_size=cfg.embed_batch_size,
+                read_workers=cfg.index_read_workers,
+                read_queue_size=cfg.index_queue_size,
             )
 
-    def rag_index_vault(self, payload: dict) -> dict:
-        vault_path = payload.get("vault_path")
-        if not isinstance(vault_path, str) or not vault_path.strip():
-            raise ValueError("vault_path is required")
+    def _validate_index_payload(self, payload: dict, path_key: str) -> tuple[str, bool]:
+        path = payload.get(path_key)
+        if not isinstance(path, str) or not path.strip():
+            raise ValueError(f"{path_key} is required")
+
+        incremental = payload.get("incremental", True)
+        if not isinstance(incremental, bool):
+            raise ValueError("incremental must be a boolean")
+        return path.strip(), incremental
 
+    def rag_index_vault(self, payload: dict) -> dict:
+        vault_path, incremental = self._validate_index_payload(payload, "vault_path")
         self._ensure_rag_components()
-        return self._rag_indexing.index_vault(vault_path.strip())
+        return self._rag_indexing.index_vault(vault_path, incremental=incremental)
 
     def rag_index_folder(self, payload: dict) -> dict:
-        folder_path = payload.get("folder_path")
-        if not isinstance(folder_path, str) or not folder_path.strip():
-            raise ValueError("folder_path is required")
-
+        folder_path, incremental = self._validate_index_payload(payload, "folder_path")
         self._ensure_rag_components()
-        return self._rag_indexing.index_folder(folder_path.strip())
+        return self._rag_indexing.index_folder(folder_path, incremental=incremental)
 
     def rag_status(self) -> dict:
         self._ensure_rag_components()
-        return self._rag_sqlite_store.get_status_summary()
+        status = self._rag_sqlite_store.get_status_summary()
+        cache = getattr(self._rag_embedder, "cache", None)
+        if isinstance(status, dict) and cache is not None and hasattr(cache, "stats"):
+            status["embedding_cache"] = cache.stats()
+        return status
 
     def rag_retrieve(self, payload: dict) -> dict:
         query = payload.get("query")
@@ -1466,8 +2082,14 @@ class ApiService:
             else:
                 raise ValueError("top_k must be an integer")
 
+        from mind_lite.rag.retrieval import RETRIEVAL_MODES
+
+        mode = payload.get("mode")
+        if mode is not None and mode not in RETRIEVAL_MODES:
+            raise ValueError(f"mode must be one of {', '.join(RETRIEVAL_MODES)}")
+
         self._ensure_rag_components()
-        citations = self._rag_retrieval.retrieve(query.strip(), top_k=top_k)
+        citations = self._rag_retrieval.retrieve(query.strip(), top_k=top_k, mode=mode)
         return {"citations": citations}
 
     def llm_list_models(self) -> dict:
@@ -1486,62 +2108,45 @@ class ApiService:
         }
 
     def llm_set_config(self, payload: dict) -> dict:
-        from mind_lite.llm.config import get_llm_config, save_llm_config, LlmConfig
-        
+        from dataclasses import replace
+
+        from mind_lite.llm.config import update_llm_config
+
         provider = payload.get("provider")
         model = payload.get("model")
-        
+
         if provider not in ("lmstudio", "openrouter"):
             raise ValueError("provider must be 'lmstudio' or 'openrouter'")
         if not isinstance(model, str) or not model.strip():
             raise ValueError("model is required")
-        
-        current = get_llm_config()
-        
-        new_config = LlmConfig(
-            active_provider=provider,
-            active_model=model.strip(),
-            openrouter_api_key=current.openrouter_api_key,
-            lmstudio_url=current.lmstudio_url,
-            recently_used=current.recently_used,
+
+        new_config = update_llm_config(
+            lambda current: replace(current, active_provider=provider, active_model=model.strip())
         )
-        save_llm_config(new_config)
-        
+
         return {
             "active_provider": new_config.active_provider,
             "active_model": new_config.active_model,
         }
 
     def llm_set_api_key(self, payload: dict) -> dict:
-        from mind_lite.llm.config import get_llm_config, save_llm_config, LlmConfig
-        
+        from dataclasses import replace
+
+        from mind_lite.llm.config import update_llm_config
+
         api_key = payload.get("api_key")
         if not isinstance(api_key, str):
             raise ValueError("api_key must be a string")
-        
-        current = get_llm_config()
-        new_config = LlmConfig(
-            active_provider=current.active_provider,
-            active_model=current.active_model,
-            openrouter_api_key=api_key.strip(),
-            lmstudio_url=current.lmstudio_url,
-            recently_used=current.recently_used,
-        )
-        save_llm_config(new_config)
-        
+
+        update_llm_config(lambda current: replace(current, openrouter_api_key=api_key.strip()))
+
         return {"status": "saved", "has_key": bool(api_key.strip())}
 
     def llm_clear_api_key(self) -> dict:
-        from mind_lite.llm.config import get_llm_config, save_llm_config, LlmConfig
-        
-        current = get_llm_config()
-        new_config = LlmConfig(
-            active_provider=current.active_provider,
-            active_model=current.active_model,
-            openrouter_api_key="",
-            lmstudio_url=current.lmstudio_url,
-            recently_used=current.recently_used,
-        )
-        save_llm_config(new_config)
-        
+        from dataclasses import replace
+
+        from mind_lite.llm.config import update_llm_config
+
+        update_llm_config(lambda current: replace(current, openrouter_api_key=""))
+
         return {"status": "cleared"}
@@ -0,0 +1,156 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+SCHEMA_VERSION = 1
+
+
+def state_db_path(state_file: str | Path) -> Path:
+    """SQLite file that backs ``state_file``: the path itself if it ends in ``.db``, else a ``.db`` sibling."""
+    path = Path(state_file)
+    return path if path.suffix == ".db" else path.with_suffix(".db")
+
+
+class StateStore:
+    """Durable ``ApiService`` state, one SQLite row per entity.
+
+    Records are JSON bodies addressed by ``(kind, key)``. Rows keep their
+    insertion order across updates, so ordered collections can be read back
+    in the order they were written. Writes made inside ``transaction()`` are
+    committed together; outside it each write commits on its own.
+    """
+
+    def __init__(self, db_path: str | Path, busy_timeout_ms: int = 5_000):
+        self.db_path = Path(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._depth = 0
+        if self.db_path.parent != Path(""):
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                isolation_level=None,
+                check_same_thread=False,
+                timeout=self.busy_timeout_ms / 1000,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._conn = conn
+        return self._conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._connection()
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._depth -= 1
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def init_schema(self) -> None:
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for target, migration in self._migrations():
+                if version < target:
+                    migration(conn)
+                    version = target
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+
+    def _migrations(self) -> list[tuple[int, Callable[[sqlite3.Connection], None]]]:
+        return [(1, self._create_tables)]
+
+    def _create_tables(self, conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS state_records (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                body TEXT NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS state_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            conn = self._connection()
+            has_meta = conn.execute("SELECT 1 FROM state_meta LIMIT 1").fetchone()
+            has_records = conn.execute("SELECT 1 FROM state_records LIMIT 1").fetchone()
+        return has_meta is None and has_records is None
+
+    def put(self, kind: str, key: str, body: Any) -> None:
+        encoded = json.dumps(body, sort_keys=True)
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO state_records (kind, key, body) VALUES (?, ?, ?)
+                ON CONFLICT(kind, key) DO UPDATE SET body = excluded.body
+                """,
+                (kind, key, encoded),
+            )
+
+    def delete(self, kind: str, key: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM state_records WHERE kind = ? AND key = ?", (kind, key))
+
+    def replace_kind(self, kind: str, items: list[tuple[str, Any]]) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM state_records WHERE kind = ?", (kind,))
+            conn.executemany(
+                "INSERT INTO state_records (kind, key, body) VALUES (?, ?, ?)",
+                [(kind, key, json.dumps(body, sort_keys=True)) for key, body in items],
+            )
+
+    def load(self, kind: str) -> list[tuple[str, Any]]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT key, body FROM state_records WHERE kind = ? ORDER BY rowid", (kind,)
+            ).fetchall()
+        return [(key, json.loads(body)) for key, body in rows]
+
+    def set_meta(self, key: str, value: Any) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO state_meta (key, value) VALUES (?, ?)",
+                (key, json.dumps(value)),
+            )
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value FROM state_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return default if row is None else json.loads(row[0])
@@ -0,0 +1,23 @@
+"""Offline benchmarks: a synthetic vault generator and timed scenarios with JSON reports.
+
+Run ``python -m mind_lite.bench --help``.
+"""
+
+from mind_lite.bench.fakes import HashEmbedder, stub_llm, stub_llm_transport
+from mind_lite.bench.stats import percentile, summarize
+from mind_lite.bench.suite import SCENARIOS, BenchConfig, compare_reports, run_suite
+from mind_lite.bench.vault import VaultSpec, generate_vault
+
+__all__ = [
+    "HashEmbedder",
+    "stub_llm",
+    "stub_llm_transport",
+    "percentile",
+    "summarize",
+    "SCENARIOS",
+    "BenchConfig",
+    "compare_reports",
+    "run_suite",
+    "VaultSpec",
+    "generate_vault",
+]
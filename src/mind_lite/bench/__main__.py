@@ -0,0 +1,79 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from mind_lite.bench.suite import SCENARIOS, BenchConfig, compare_reports, run_suite
+from mind_lite.bench.vault import VaultSpec
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m mind_lite.bench",
+        description="Run the offline Mind Lite benchmarks and write a JSON report.",
+    )
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="repeat to pick several; default: all")
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--folders", type=int, default=8)
+    parser.add_argument("--min-words", type=int, default=80)
+    parser.add_argument("--max-words", type=int, default=600)
+    parser.add_argument("--links-per-note", type=float, default=3.0)
+    parser.add_argument("--tags-per-note", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated LLM response time")
+    parser.add_argument("--embed-delay-ms", type=float, default=0.0, help="simulated embedding cost per text")
+    parser.add_argument("--output", type=Path, help="write the report here instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="earlier report to compare p50 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="p50 growth counted as a regression")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    try:
+        config = BenchConfig(
+            vault=VaultSpec(
+                notes=args.notes,
+                folders=args.folders,
+                min_words=args.min_words,
+                max_words=args.max_words,
+                links_per_note=args.links_per_note,
+                tags_per_note=args.tags_per_note,
+                seed=args.seed,
+            ),
+            scenarios=tuple(args.scenario or SCENARIOS),
+            repeat=args.repeat,
+            warmup=args.warmup,
+            queries=args.queries,
+            llm_latency_seconds=args.llm_latency_ms / 1000,
+            embed_delay_per_text_seconds=args.embed_delay_ms / 1000,
+        )
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    report = run_suite(config)
+    encoded = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is not None:
+        args.output.write_text(encoded + "\n", encoding="utf-8")
+    else:
+        print(encoded)
+
+    if args.baseline is None:
+        return 0
+    rows = compare_reports(json.loads(args.baseline.read_text(encoding="utf-8")), report, args.threshold)
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else "ok"
+        print(
+            f"{row['measurement']:<40} {row['baseline_p50_ms']:>10.3f} -> {row['current_p50_ms']:>10.3f} ms"
+            f" ({row['change']:+.1%}) {flag}",
+            file=sys.stderr,
+        )
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
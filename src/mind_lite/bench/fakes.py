@@ -0,0 +1,106 @@
+import hashlib
+import json
+import re
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import httpx
+import numpy as np
+
+from mind_lite.rag.embeddings import normalize_rows
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class HashEmbedder:
+    """Deterministic offline stand-in for ``EmbeddingAdapter``.
+
+    Each word is hashed into one of ``dimensions`` buckets, so texts that
+    share words get similar vectors and retrieval returns meaningful
+    neighbours without loading a model. ``delay_per_text_seconds`` adds a
+    fixed cost per text to approximate a real encoder.
+    """
+
+    def __init__(self, dimensions: int = 384, delay_per_text_seconds: float = 0.0):
+        self.dimensions = dimensions
+        self.delay_per_text_seconds = delay_per_text_seconds
+        self._buckets: dict[str, int] = {}
+
+    def _bucket(self, token: str) -> int:
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = self._buckets[token] = int.from_bytes(digest, "little") % self.dimensions
+        return bucket
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        if self.delay_per_text_seconds:
+            time.sleep(self.delay_per_text_seconds * len(texts))
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN_PATTERN.findall(text.lower()):
+                vectors[row, self._bucket(token)] += 1.0
+        return vectors
+
+    def embed_texts_array(self, texts: list[str], normalize: bool = False) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        vectors = self._encode(texts)
+        return normalize_rows(vectors) if normalize else vectors
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        return self._encode(texts).tolist() if texts else []
+
+    def embed_query(self, query: str) -> list[float]:
+        return self._encode([query])[0].tolist()
+
+
+def stub_llm_transport(latency_seconds: float = 0.0, answer: str = "Stub answer grounded in the cited notes.") -> httpx.MockTransport:
+    """OpenAI-compatible chat completions endpoint answering every prompt with ``answer``.
+
+    Streaming requests get one delta per word and a final usage chunk. Token
+    counts are word counts, which is enough for the metrics to move.
+    """
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        if latency_seconds:
+            time.sleep(latency_seconds)
+        body = json.loads(request.content or b"{}")
+        prompt = " ".join(str(message.get("content", "")) for message in body.get("messages", []))
+        usage = {"prompt_tokens": len(prompt.split()), "completion_tokens": len(answer.split())}
+        if not body.get("stream"):
+            return httpx.Response(
+                200,
+                json={"choices": [{"message": {"role": "assistant", "content": answer}}], "usage": usage},
+            )
+        frames = [
+            "data: " + json.dumps({"choices": [{"delta": {"content": word}}]})
+            for word in answer.split(" ")
+        ]
+        frames.append("data: " + json.dumps({"choices": [], "usage": usage}))
+        frames.append("data: [DONE]")
+        return httpx.Response(
+            200, headers={"Content-Type": "text/event-stream"}, content="\n\n".join(frames) + "\n\n"
+        )
+
+    return httpx.MockTransport(handle)
+
+
+@contextmanager
+def stub_llm(latency_seconds: float = 0.0) -> Iterator[None]:
+    """Route LM Studio calls to ``stub_llm_transport`` for the duration of the block."""
+    from mind_lite.llm.clients import get_client_registry
+
+    registry = get_client_registry()
+    client = httpx.Client(transport=stub_llm_transport(latency_seconds))
+    previous = registry.install("lmstudio", client)
+    try:
+        yield
+    finally:
+        if previous is not None:
+            registry.install("lmstudio", previous)
+        else:
+            # Drops the stub so the next call builds a real client again.
+            registry.configure("lmstudio", registry.settings_for("lmstudio"))
+        client.close()
@@ -0,0 +1,345 @@
+"""HTTP load generator for ``create_server``.
+
+``run_load`` drives a running server with a weighted mix of endpoints,
+either closed-loop (``concurrency`` clients that each send the next request
+as soon as the previous one returns) or open-loop (requests scheduled at
+``rate_per_second`` and sent by up to ``concurrency`` clients).
+``run_profiles`` starts an in-process server on the offline benchmark
+vault and runs one step per profile. Run ``python -m mind_lite.bench.load --help``.
+"""
+
+import argparse
+import json
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.client import HTTPConnection
+from pathlib import Path
+from typing import Callable
+
+from mind_lite.bench.fakes import stub_llm
+from mind_lite.bench.stats import summarize
+from mind_lite.bench.suite import (
+    SCHEMA_VERSION,
+    BenchConfig,
+    BenchContext,
+    bench_environment,
+    environment_summary,
+    vault_summary,
+)
+from mind_lite.bench.vault import VaultSpec
+
+
+@dataclass(frozen=True)
+class Target:
+    method: str
+    path: str
+    payload: Callable[[str], dict] | None = None
+
+
+TARGETS: dict[str, Target] = {
+    "ask": Target("POST", "/ask", lambda query: {"query": query}),
+    "ask_stream": Target("POST", "/ask/stream", lambda query: {"query": query}),
+    "rag_retrieve": Target("POST", "/rag/retrieve", lambda query: {"query": query, "top_k": 5}),
+    "health": Target("GET", "/health"),
+    "runs": Target("GET", "/runs?limit=20"),
+    "metrics": Target("GET", "/metrics"),
+}
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """One load step.
+
+    With ``rate_per_second`` unset the step is closed-loop. With a rate,
+    latency is measured from each request's scheduled send time, so time
+    spent waiting for a free client counts (no coordinated omission), and
+    requests still queued when the step ends are reported as ``not_sent``.
+    Only requests started after ``warmup_seconds`` are recorded.
+    """
+
+    concurrency: int = 8
+    duration_seconds: float = 5.0
+    warmup_seconds: float = 0.5
+    rate_per_second: float | None = None
+    mix: tuple[tuple[str, float], ...] = (("ask", 1.0), ("rag_retrieve", 1.0))
+    timeout_seconds: float = 30.0
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.concurrency <= 0:
+            raise ValueError("concurrency must be > 0")
+        if self.duration_seconds <= 0 or self.warmup_seconds < 0:
+            raise ValueError("duration_seconds must be > 0 and warmup_seconds >= 0")
+        if self.rate_per_second is not None and self.rate_per_second <= 0:
+            raise ValueError("rate_per_second must be > 0")
+        if not self.mix or any(weight <= 0 for _, weight in self.mix):
+            raise ValueError("mix must name at least one endpoint with a positive weight")
+        unknown = [name for name, _ in self.mix if name not in TARGETS]
+        if unknown:
+            raise ValueError(f"unknown endpoint: {', '.join(unknown)}; expected one of {', '.join(TARGETS)}")
+
+
+@dataclass
+class _Recorder:
+    measure_from: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def record(self, name: str, started: float, finished: float, error: str | None) -> None:
+        if started < self.measure_from:
+            return
+        with self.lock:
+            self.latencies.setdefault(name, []).append(finished - started)
+            if error is not None:
+                kinds = self.errors.setdefault(name, {})
+                kinds[error] = kinds.get(error, 0) + 1
+
+
+def send_request(host: str, port: int, target: Target, query: str, timeout: float) -> str | None:
+    """Send one request and read the whole response; return an error kind, or ``None`` on success."""
+    body = json.dumps(target.payload(query)) if target.payload is not None else None
+    conn = HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request(target.method, target.path, body=body, headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        response.read()
+        return f"http_{response.status}" if response.status >= 400 else None
+    except Exception as exc:  # noqa: BLE001 - every failure is a data point
+        return type(exc).__name__
+    finally:
+        conn.close()
+
+
+def _summarize_endpoint(latencies: list[float], errors: dict[str, int], window: float) -> dict:
+    error_count = sum(errors.values())
+    return {
+        "requests": len(latencies),
+        "errors": error_count,
+        "error_rate": round(error_count / len(latencies), 4) if latencies else 0.0,
+        "error_kinds": dict(sorted(errors.items())),
+        "throughput_per_second": round((len(latencies) - error_count) / window, 2),
+        "latency": summarize(latencies),
+    }
+
+
+def run_load(host: str, port: int, profile: LoadProfile, queries: list[str]) -> dict:
+    """Drive the server at ``host:port`` for one profile and return overall and per-endpoint results."""
+    if not queries:
+        raise ValueError("queries must not be empty")
+    names = [name for name, _ in profile.mix]
+    weights = [weight for _, weight in profile.mix]
+    started = time.perf_counter()
+    measure_from = started + profile.warmup_seconds
+    deadline = measure_from + profile.duration_seconds
+    recorder = _Recorder(measure_from)
+    schedule: queue.Queue | None = queue.Queue() if profile.rate_per_second is not None else None
+    not_sent = 0
+
+    def issue(rng: random.Random, scheduled: float) -> None:
+        name = rng.choices(names, weights)[0]
+        error = send_request(host, port, TARGETS[name], rng.choice(queries), profile.timeout_seconds)
+        recorder.record(name, scheduled, time.perf_counter(), error)
+
+    def closed_loop(worker: int) -> None:
+        rng = random.Random(profile.seed * 1_000 + worker)
+        while time.perf_counter() < deadline:
+            issue(rng, time.perf_counter())
+
+    def open_loop(worker: int) -> None:
+        rng = random.Random(profile.seed * 1_000 + worker)
+        while True:
+            scheduled = schedule.get()
+            if scheduled is None:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            issue(rng, scheduled)
+
+    workers = [
+        threading.Thread(target=open_loop if schedule is not None else closed_loop, args=(index,), daemon=True)
+        for index in range(profile.concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    if schedule is not None:
+        interval = 1.0 / profile.rate_per_second
+        scheduled = started
+        while scheduled < deadline:
+            schedule.put(scheduled)
+            scheduled += interval
+            pause = scheduled - time.perf_counter()
+            if pause > 0:
+                time.sleep(pause)
+        # Whatever no client has picked up by the end of the step is backlog, not sent.
+        while True:
+            try:
+                schedule.get_nowait()
+            except queue.Empty:
+                break
+            not_sent += 1
+        for _ in workers:
+            schedule.put(None)
+    for worker in workers:
+        worker.join()
+
+    window = max(time.perf_counter(), deadline) - measure_from
+    all_latencies = [value for values in recorder.latencies.values() for value in values]
+    all_errors: dict[str, int] = {}
+    for kinds in recorder.errors.values():
+        for kind, count in kinds.items():
+            all_errors[kind] = all_errors.get(kind, 0) + count
+    overall = _summarize_endpoint(all_latencies, all_errors, window)
+    if schedule is not None:
+        overall["not_sent"] = not_sent
+    return {
+        "window_seconds": round(window, 3),
+        "overall": overall,
+        "endpoints": {
+            name: _summarize_endpoint(recorder.latencies.get(name, []), recorder.errors.get(name, {}), window)
+            for name in names
+        },
+    }
+
+
+def run_profiles(
+    profiles: list[LoadProfile],
+    vault: VaultSpec = VaultSpec(),
+    llm_latency_seconds: float = 0.0,
+    embed_delay_per_text_seconds: float = 0.0,
+    queries: int = 200,
+) -> dict:
+    """Serve the benchmark vault from an in-process ``create_server`` and run each profile against it.
+
+    Providers are the offline benchmark stand-ins (``HashEmbedder`` and
+    ``stub_llm``); the LLM and embedding delays model slower real ones.
+    """
+    from mind_lite.api.http_server import create_server
+
+    config = BenchConfig(
+        vault=vault,
+        queries=queries,
+        llm_latency_seconds=llm_latency_seconds,
+        embed_delay_per_text_seconds=embed_delay_per_text_seconds,
+    )
+    steps = []
+    with tempfile.TemporaryDirectory(prefix="mind-lite-load-") as tmp:
+        workdir = Path(tmp)
+        with bench_environment(workdir), stub_llm(llm_latency_seconds):
+            context = BenchContext(config, workdir)
+            server = create_server(host="127.0.0.1", port=0, service=context.service())
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            host, port = server.server_address
+            try:
+                for profile in profiles:
+                    steps.append({"profile": asdict(profile), **run_load(host, port, profile, context.queries)})
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join(timeout=5)
+            summary = vault_summary(context.note_paths)
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment_summary(),
+        "vault": summary,
+        "llm_latency_seconds": llm_latency_seconds,
+        "embed_delay_per_text_seconds": embed_delay_per_text_seconds,
+        "steps": steps,
+    }
+
+
+def parse_mix(value: str) -> tuple[tuple[str, float], ...]:
+    """Parse ``ask=1,rag_retrieve=3``; a bare name has weight 1."""
+    mix = []
+    for item in value.split(","):
+        name, _, weight = item.strip().partition("=")
+        try:
+            mix.append((name, float(weight) if weight else 1.0))
+        except ValueError as exc:
+            raise ValueError(f"invalid weight for {name}: {weight}") from exc
+    return tuple(mix)
+
+
+def _parse_numbers(value: str, kind: Callable[[str], float]) -> list:
+    return [kind(item) for item in value.split(",") if item.strip()]
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m mind_lite.bench.load",
+        description="Load-test an in-process Mind Lite HTTP server with offline providers.",
+    )
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated client counts, one step each")
+    parser.add_argument("--rate", help="comma-separated request rates per second (open loop); default closed loop")
+    parser.add_argument("--mix", default="ask=1,rag_retrieve=1", help=f"endpoint weights from: {', '.join(TARGETS)}")
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=0.5, help="unrecorded seconds before each step")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated LLM response time")
+    parser.add_argument("--embed-delay-ms", type=float, default=0.0, help="simulated embedding cost per text")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    try:
+        rates = _parse_numbers(args.rate, float) if args.rate else [None]
+        profiles = [
+            LoadProfile(
+                concurrency=concurrency,
+                duration_seconds=args.duration,
+                warmup_seconds=args.warmup,
+                rate_per_second=rate,
+                mix=parse_mix(args.mix),
+                timeout_seconds=args.timeout,
+                seed=args.seed,
+            )
+            for concurrency in _parse_numbers(args.concurrency, int)
+            for rate in rates
+        ]
+        vault = VaultSpec(notes=args.notes, seed=args.seed)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    report = run_profiles(
+        profiles,
+        vault=vault,
+        llm_latency_seconds=args.llm_latency_ms / 1000,
+        embed_delay_per_text_seconds=args.embed_delay_ms / 1000,
+    )
+    encoded = json.dumps(report, indent=2, sort_keys=True)
+    if args.output is not None:
+        args.output.write_text(encoded + "\n", encoding="utf-8")
+    else:
+        print(encoded)
+
+    print(f"{'clients':>7} {'rate':>7} {'rps':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}", file=sys.stderr)
+    for step in report["steps"]:
+        overall = step["overall"]
+        latency = overall["latency"]
+        rate = step["profile"]["rate_per_second"]
+        print(
+            f"{step['profile']['concurrency']:>7} {rate if rate is not None else '-':>7} "
+            f"{overall['throughput_per_second']:>9.1f} {overall['error_rate']:>7.1%} "
+            f"{latency.get('p50_ms', 0):>9.2f} {latency.get('p95_ms', 0):>9.2f} {latency.get('p99_ms', 0):>9.2f}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+import math
+
+
+def percentile(values: list[float], q: float) -> float:
+    """``q``-th percentile (0-100) of ``values`` with linear interpolation between ranks."""
+    if not values:
+        raise ValueError("percentile of an empty sample")
+    if not 0 <= q <= 100:
+        raise ValueError("q must be between 0 and 100")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(seconds: list[float]) -> dict:
+    """Latency summary in milliseconds; an empty sample only reports its count."""
+    if not seconds:
+        return {"count": 0}
+    milliseconds = [value * 1000 for value in seconds]
+    return {
+        "count": len(milliseconds),
+        "min_ms": round(min(milliseconds), 3),
+        "mean_ms": round(sum(milliseconds) / len(milliseconds), 3),
+        "p50_ms": round(percentile(milliseconds, 50), 3),
+        "p95_ms": round(percentile(milliseconds, 95), 3),
+        "p99_ms": round(percentile(milliseconds, 99), 3),
+        "max_ms": round(max(milliseconds), 3),
+    }
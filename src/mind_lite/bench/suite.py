@@ -0,0 +1,348 @@
+import json
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.client import HTTPConnection
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from mind_lite.bench.fakes import HashEmbedder, stub_llm
+from mind_lite.bench.stats import summarize
+from mind_lite.bench.vault import WORDS, VaultSpec, generate_vault
+from mind_lite.rag.retrieval import RETRIEVAL_MODES
+
+SCHEMA_VERSION = 1
+SCENARIOS = (
+    "analyze_folder",
+    "chunk_documents",
+    "index_folder",
+    "retrieve",
+    "ask",
+    "http",
+)
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    vault: VaultSpec = field(default_factory=VaultSpec)
+    scenarios: tuple[str, ...] = SCENARIOS
+    repeat: int = 5
+    warmup: int = 1
+    queries: int = 50
+    top_k: int = 5
+    retrieval_modes: tuple[str, ...] = RETRIEVAL_MODES
+    llm_latency_seconds: float = 0.0
+    embed_delay_per_text_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        unknown = [name for name in self.scenarios if name not in SCENARIOS]
+        if unknown:
+            raise ValueError(f"unknown scenario: {', '.join(unknown)}")
+        unknown_modes = [mode for mode in self.retrieval_modes if mode not in RETRIEVAL_MODES]
+        if unknown_modes:
+            raise ValueError(f"retrieval_modes must be drawn from {', '.join(RETRIEVAL_MODES)}")
+        if self.repeat <= 0 or self.queries <= 0 or self.top_k <= 0:
+            raise ValueError("repeat, queries and top_k must be > 0")
+        if self.warmup < 0:
+            raise ValueError("warmup must be >= 0")
+
+
+def measurement(seconds: list[float], items_per_call: int, unit: str) -> dict:
+    """One timed measurement: latency per call plus ``unit`` processed per second."""
+    total = sum(seconds)
+    return {
+        "latency": summarize(seconds),
+        "unit": unit,
+        "items_per_call": items_per_call,
+        "throughput_per_second": round(items_per_call * len(seconds) / total, 2) if total > 0 else None,
+    }
+
+
+def time_calls(
+    call: Callable[[Any], object],
+    repeat: int,
+    warmup: int = 0,
+    setup: Callable[[], Any] | None = None,
+) -> list[float]:
+    """Time ``repeat`` calls of ``call(setup())``; ``setup`` and the ``warmup`` calls are not timed."""
+    samples = []
+    for index in range(warmup + repeat):
+        argument = setup() if setup is not None else None
+        started = time.perf_counter()
+        call(argument)
+        elapsed = time.perf_counter() - started
+        if index >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+@contextmanager
+def bench_environment(workdir: Path) -> Iterator[None]:
+    """Point ``MIND_LITE_STATE_FILE`` (and with it the LLM config file) into ``workdir`` for the block."""
+    from mind_lite.llm.config import flush_llm_config
+
+    previous = os.environ.get("MIND_LITE_STATE_FILE")
+    os.environ["MIND_LITE_STATE_FILE"] = str(workdir / "state" / "state.json")
+    try:
+        yield
+    finally:
+        flush_llm_config()
+        if previous is None:
+            os.environ.pop("MIND_LITE_STATE_FILE", None)
+        else:
+            os.environ["MIND_LITE_STATE_FILE"] = previous
+
+
+class BenchContext:
+    """Shared state of one suite run: the vault, the embedder and a lazily built index."""
+
+    def __init__(self, config: BenchConfig, workdir: Path):
+        self.config = config
+        self.workdir = workdir
+        self.vault_dir = workdir / "vault"
+        self.note_paths = generate_vault(self.vault_dir, config.vault)
+        self.embedder = HashEmbedder(delay_per_text_seconds=config.embed_delay_per_text_seconds)
+        rng = random.Random(config.vault.seed)
+        self.queries = [" ".join(rng.sample(WORDS[:80], 3)) for _ in range(config.queries)]
+        self._components: tuple[Any, Any] | None = None
+        self._index_runs = 0
+        self._service = None
+
+    def new_index(self) -> tuple[Any, Any, Any]:
+        """A fresh, empty SQLite store and local flat vector index with an ``IndexingService`` over them."""
+        from mind_lite.rag.indexing import IndexingService
+        from mind_lite.rag.local_index import LocalVectorIndex
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        self._index_runs += 1
+        directory = self.workdir / f"index-{self._index_runs:03d}"
+        store = SqliteStore(str(directory / "rag.db"))
+        store.init_schema()
+        vector_index = LocalVectorIndex(str(directory / "vectors"), index_type="flat")
+        vector_index.ensure_collection(vector_size=self.embedder.dimensions)
+        indexing = IndexingService(sqlite_store=store, qdrant_index=vector_index, embedder=self.embedder)
+        return store, vector_index, indexing
+
+    def indexed(self) -> tuple[Any, Any]:
+        if self._components is None:
+            store, vector_index, indexing = self.new_index()
+            indexing.index_folder(str(self.vault_dir), incremental=False)
+            self._components = (store, vector_index)
+        return self._components
+
+    def retrieval(self, mode: str) -> Any:
+        from mind_lite.rag.retrieval import RetrievalService
+
+        store, vector_index = self.indexed()
+        # Caches off: every query pays for embedding, search and hydration.
+        return RetrievalService(
+            sqlite_store=store,
+            qdrant_index=vector_index,
+            embedder=self.embedder,
+            mode=mode,
+            query_cache_size=0,
+        )
+
+    def service(self) -> Any:
+        """An ``ApiService`` whose RAG components are the indexed vault and the hash embedder."""
+        if self._service is None:
+            from mind_lite.api.service import ApiService
+
+            store, vector_index = self.indexed()
+            service = ApiService()
+            service._rag_sqlite_store = store
+            service._rag_qdrant_index = vector_index
+            service._rag_embedder = self.embedder
+            service._rag_retrieval = self.retrieval("vector")
+            service._rag_indexing = self.new_index()[2]
+            self._service = service
+        return self._service
+
+
+def _bench_analyze_folder(context: BenchContext) -> dict:
+    from mind_lite.onboarding.analyze_readonly import analyze_folder
+
+    config = context.config
+    samples = time_calls(lambda _: analyze_folder(str(context.vault_dir)), config.repeat, config.warmup)
+    return {"default": measurement(samples, len(context.note_paths), "notes")}
+
+
+def _bench_chunk_documents(context: BenchContext) -> dict:
+    from mind_lite.rag.chunking import chunk_documents
+
+    config = context.config
+    documents = {str(path): path.read_text(encoding="utf-8") for path in context.note_paths}
+    chunk_count = len(chunk_documents(documents))
+    samples = time_calls(lambda _: chunk_documents(documents), config.repeat, config.warmup)
+    return {"default": measurement(samples, chunk_count, "chunks")}
+
+
+def _bench_index_folder(context: BenchContext) -> dict:
+    config = context.config
+    vault = str(context.vault_dir)
+    chunk_counts = []
+
+    def full(components):
+        chunk_counts.append(components[2].index_folder(vault, incremental=False)["chunks_created"])
+
+    full_samples = time_calls(full, config.repeat, config.warmup, setup=context.new_index)
+
+    _, _, indexing = context.new_index()
+    indexing.index_folder(vault, incremental=False)
+    unchanged_samples = time_calls(
+        lambda _: indexing.index_folder(vault, incremental=True), config.repeat, config.warmup
+    )
+    return {
+        "full": measurement(full_samples, chunk_counts[-1], "chunks"),
+        "incremental_unchanged": measurement(unchanged_samples, len(context.note_paths), "notes"),
+    }
+
+
+def _time_queries(context: BenchContext, call: Callable[[str], object]) -> list[float]:
+    for query in context.queries[: context.config.warmup]:
+        call(query)
+    samples = []
+    for query in context.queries:
+        started = time.perf_counter()
+        call(query)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _bench_retrieve(context: BenchContext) -> dict:
+    results = {}
+    for mode in context.config.retrieval_modes:
+        retrieval = context.retrieval(mode)
+        samples = _time_queries(context, lambda query: retrieval.retrieve(query, top_k=context.config.top_k))
+        results[mode] = measurement(samples, 1, "queries")
+    return results
+
+
+def _bench_ask(context: BenchContext) -> dict:
+    service = context.service()
+    samples = _time_queries(context, lambda query: service.ask({"query": query}))
+    return {"default": measurement(samples, 1, "queries")}
+
+
+def _bench_http(context: BenchContext) -> dict:
+    from mind_lite.api.http_server import create_server
+
+    server = create_server(host="127.0.0.1", port=0, service=context.service())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+
+    def round_trip(method: str, path: str, payload: dict | None) -> None:
+        conn = HTTPConnection(host, port, timeout=30)
+        try:
+            body = json.dumps(payload) if payload is not None else None
+            conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                raise RuntimeError(f"{method} {path} returned {response.status}")
+        finally:
+            conn.close()
+
+    top_k = context.config.top_k
+    try:
+        return {
+            "health": measurement(_time_queries(context, lambda query: round_trip("GET", "/health", None)), 1, "requests"),
+            "rag_retrieve": measurement(
+                _time_queries(
+                    context, lambda query: round_trip("POST", "/rag/retrieve", {"query": query, "top_k": top_k})
+                ),
+                1,
+                "requests",
+            ),
+            "ask": measurement(
+                _time_queries(context, lambda query: round_trip("POST", "/ask", {"query": query})), 1, "requests"
+            ),
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+_SCENARIO_RUNNERS: dict[str, Callable[[BenchContext], dict]] = {
+    "analyze_folder": _bench_analyze_folder,
+    "chunk_documents": _bench_chunk_documents,
+    "index_folder": _bench_index_folder,
+    "retrieve": _bench_retrieve,
+    "ask": _bench_ask,
+    "http": _bench_http,
+}
+
+
+def vault_summary(paths: list[Path]) -> dict:
+    sizes = [path.stat().st_size for path in paths]
+    return {"notes": len(paths), "bytes": sum(sizes), "mean_note_bytes": round(sum(sizes) / len(sizes), 1)}
+
+
+def environment_summary() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(config: BenchConfig = BenchConfig()) -> dict:
+    """Run the configured scenarios offline and return a JSON-serialisable report.
+
+    Everything happens in a temporary directory: a synthetic vault from
+    ``config.vault``, SQLite stores, a local flat vector index,
+    ``HashEmbedder`` instead of a model and ``stub_llm`` instead of
+    LM Studio. Scenario results map a measurement name to ``measurement``.
+    """
+    with tempfile.TemporaryDirectory(prefix="mind-lite-bench-") as tmp:
+        workdir = Path(tmp)
+        with bench_environment(workdir), stub_llm(config.llm_latency_seconds):
+            context = BenchContext(config, workdir)
+            scenarios = {name: _SCENARIO_RUNNERS[name](context) for name in config.scenarios}
+            vault = vault_summary(context.note_paths)
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment_summary(),
+        "config": asdict(config),
+        "vault": vault,
+        "scenarios": scenarios,
+    }
+
+
+def compare_reports(baseline: dict, current: dict, threshold: float = 0.10) -> list[dict]:
+    """Compare p50 latency of every measurement present in both reports.
+
+    A measurement is ``regressed`` when its p50 grew by more than
+    ``threshold`` (a fraction) over the baseline.
+    """
+    rows = []
+    for scenario, measurements in current.get("scenarios", {}).items():
+        for name, result in measurements.items():
+            before = baseline.get("scenarios", {}).get(scenario, {}).get(name)
+            if before is None:
+                continue
+            old = before["latency"].get("p50_ms")
+            new = result["latency"].get("p50_ms")
+            if not old or new is None:
+                continue
+            change = new / old - 1
+            rows.append(
+                {
+                    "measurement": f"{scenario}.{name}",
+                    "baseline_p50_ms": old,
+                    "current_p50_ms": new,
+                    "change": round(change, 4),
+                    "regressed": change > threshold,
+                }
+            )
+    return rows
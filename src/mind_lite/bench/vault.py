@@ -0,0 +1,105 @@
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+WORDS = (
+    "atlas", "archive", "budget", "calendar", "capture", "chapter", "client", "context", "decision",
+    "deadline", "design", "draft", "energy", "estimate", "evidence", "experiment", "feedback", "focus",
+    "garden", "goal", "habit", "hypothesis", "idea", "index", "insight", "interview", "journal",
+    "kanban", "lecture", "lesson", "library", "meeting", "memory", "method", "metric", "milestone",
+    "model", "network", "notebook", "outline", "pattern", "people", "planning", "principle", "priority",
+    "process", "project", "prototype", "question", "reading", "recipe", "reference", "research",
+    "resource", "review", "risk", "roadmap", "routine", "sample", "schedule", "signal", "sketch",
+    "source", "sprint", "strategy", "summary", "survey", "system", "task", "template", "theory",
+    "timeline", "topic", "tracker", "travel", "vector", "version", "vision", "weekly", "workflow",
+    "writing", "the", "and", "with", "from", "into", "about", "over", "after", "before", "while",
+    "because", "should", "could", "every", "first", "next", "last", "small", "large", "open",
+)
+_START_DATE = date(2024, 1, 1)
+
+
+@dataclass(frozen=True)
+class VaultSpec:
+    """Shape of a synthetic Obsidian vault.
+
+    ``links_per_note`` and ``tags_per_note`` are means: each note gets the
+    integer part plus one more with the fractional part as probability.
+    The same spec always produces byte-identical files.
+    """
+
+    notes: int = 200
+    folders: int = 8
+    min_words: int = 80
+    max_words: int = 600
+    links_per_note: float = 3.0
+    tags_per_note: float = 2.0
+    tag_pool: int = 40
+    frontmatter: bool = True
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.notes <= 0:
+            raise ValueError("notes must be > 0")
+        if self.folders <= 0:
+            raise ValueError("folders must be > 0")
+        if not 0 < self.min_words <= self.max_words:
+            raise ValueError("min_words must be > 0 and <= max_words")
+        if self.links_per_note < 0 or self.tags_per_note < 0:
+            raise ValueError("links_per_note and tags_per_note must be >= 0")
+        if self.tag_pool <= 0:
+            raise ValueError("tag_pool must be > 0")
+
+
+def note_title(index: int) -> str:
+    return f"Note {index:05d}"
+
+
+def _draw_count(rng: random.Random, mean: float) -> int:
+    whole = int(mean)
+    return whole + (1 if rng.random() < mean - whole else 0)
+
+
+def _note_text(rng: random.Random, spec: VaultSpec, index: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(spec.min_words, spec.max_words))]
+    tags = sorted({f"topic-{rng.randrange(spec.tag_pool):03d}" for _ in range(_draw_count(rng, spec.tags_per_note))})
+    insertions = [f"#{tag}" for tag in tags]
+    if spec.notes > 1:
+        for _ in range(_draw_count(rng, spec.links_per_note)):
+            target = rng.randrange(spec.notes - 1)
+            insertions.append(f"[[{note_title(target if target < index else target + 1)}]]")
+    for token in insertions:
+        words.insert(rng.randrange(len(words) + 1), token)
+
+    paragraphs = []
+    position = 0
+    while position < len(words):
+        size = rng.randint(40, 90)
+        sentence = " ".join(words[position : position + size])
+        paragraphs.append(sentence[0].upper() + sentence[1:] + ".")
+        position += size
+
+    lines = []
+    if spec.frontmatter:
+        created = _START_DATE + timedelta(days=index % 730)
+        lines += ["---", f"tags: [{', '.join(tags)}]", f"created: {created.isoformat()}", "---", ""]
+    lines += [f"# {note_title(index)} {rng.choice(WORDS)} {rng.choice(WORDS)}", ""]
+    for paragraph_index, paragraph in enumerate(paragraphs):
+        if paragraph_index and paragraph_index % 3 == 0:
+            lines += [f"## {rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}", ""]
+        lines += [paragraph, ""]
+    return "\n".join(lines)
+
+
+def generate_vault(root: str | Path, spec: VaultSpec = VaultSpec()) -> list[Path]:
+    """Write ``spec.notes`` markdown notes under ``root`` and return their paths in order."""
+    root = Path(root)
+    rng = random.Random(spec.seed)
+    paths = []
+    for index in range(spec.notes):
+        folder = root / f"Area {rng.randrange(spec.folders):02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"{note_title(index)}.md"
+        path.write_text(_note_text(rng, spec, index), encoding="utf-8", newline="\n")
+        paths.append(path)
+    return paths
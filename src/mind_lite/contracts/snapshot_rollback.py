@@ -15,24 +15,28 @@ class SnapshotStore:
     def add(self, record: SnapshotRecord) -> None:
         self._records_by_run.setdefault(record.run_id, []).append(record)
 
+    @property
+    def run_count(self) -> int:
+        return len(self._records_by_run)
+
     def latest_for_run(self, run_id: str) -> SnapshotRecord:
         records = self._records_by_run.get(run_id, [])
         if not records:
             raise ValueError(f"no snapshots recorded for run: {run_id}")
         return records[-1]
 
+    def export_run_records(self, run_id: str) -> list[dict]:
+        return [
+            {
+                "snapshot_id": record.snapshot_id,
+                "run_id": record.run_id,
+                "changed_note_ids": list(record.changed_note_ids),
+            }
+            for record in self._records_by_run.get(run_id, [])
+        ]
+
     def export_records(self) -> dict[str, list[dict]]:
-        exported: dict[str, list[dict]] = {}
-        for run_id, records in self._records_by_run.items():
-            exported[run_id] = [
-                {
-                    "snapshot_id": record.snapshot_id,
-                    "run_id": record.run_id,
-                    "changed_note_ids": list(record.changed_note_ids),
-                }
-                for record in records
-            ]
-        return exported
+        return {run_id: self.export_run_records(run_id) for run_id in self._records_by_run}
 
     def import_records(self, payload: dict[str, list[dict]]) -> None:
         restored: dict[str, list[SnapshotRecord]] = {}
@@ -82,10 +82,10 @@ def apply_spam_controls(
 
 
 def _call_llm(prompt: str) -> str:
-    import httpx
+    from mind_lite.llm.clients import get_http_client
 
     try:
-        response = httpx.post(
+        response = get_http_client("lmstudio").post(
             f"{LMSTUDIO_BASE_URL}/v1/chat/completions",
             json={
                 "model": "local-model",
@@ -1,12 +1,14 @@
-from mind_lite.llm.generate import generate_answer
-from mind_lite.llm.config import LlmConfig, get_llm_config, save_llm_config
+from mind_lite.llm.generate import generate_answer, stream_answer
+from mind_lite.llm.config import LlmConfig, get_llm_config, record_recently_used, save_llm_config
 from mind_lite.llm.models import MODEL_CATALOG, get_models_by_category
 
 __all__ = [
     "generate_answer",
+    "stream_answer",
     "LlmConfig",
     "get_llm_config",
     "save_llm_config",
+    "record_recently_used",
     "MODEL_CATALOG",
     "get_models_by_category",
 ]
@@ -0,0 +1,124 @@
+import importlib.util
+import os
+import threading
+from dataclasses import dataclass, replace
+
+import httpx
+
+
+@dataclass(frozen=True)
+class ProviderClientSettings:
+    timeout: float
+    connect_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def default_client_settings() -> dict[str, ProviderClientSettings]:
+    max_connections = int(os.getenv("MIND_LITE_LLM_MAX_CONNECTIONS", "20"))
+    max_keepalive = int(os.getenv("MIND_LITE_LLM_MAX_KEEPALIVE", "10"))
+    base = ProviderClientSettings(
+        timeout=30.0,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+    )
+    return {
+        "lmstudio": replace(
+            base, timeout=float(os.getenv("MIND_LITE_LMSTUDIO_TIMEOUT", "30"))
+        ),
+        "openrouter": replace(
+            base,
+            timeout=float(os.getenv("MIND_LITE_OPENROUTER_TIMEOUT", "60")),
+            http2=True,
+        ),
+    }
+
+
+class ProviderClientRegistry:
+    """Owns one long-lived, pooled ``httpx`` client per LLM provider.
+
+    Clients are created on first use from the provider's settings and reused
+    for every later call, so keep-alive connections (and TLS sessions) are
+    shared across requests and threads. HTTP/2 is only enabled when the
+    optional ``h2`` package is installed.
+    """
+
+    def __init__(self, settings: dict[str, ProviderClientSettings] | None = None):
+        self._settings = dict(settings if settings is not None else default_client_settings())
+        self._clients: dict[str, httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    def settings_for(self, provider: str) -> ProviderClientSettings:
+        settings = self._settings.get(provider)
+        if settings is None:
+            raise ValueError(f"unknown LLM provider: {provider}")
+        return settings
+
+    def _client_kwargs(self, provider: str) -> dict:
+        settings = self.settings_for(provider)
+        return {
+            "timeout": httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+            "limits": httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            "http2": settings.http2 and _http2_available(),
+        }
+
+    def get(self, provider: str) -> httpx.Client:
+        with self._lock:
+            client = self._clients.get(provider)
+            if client is None or client.is_closed:
+                client = httpx.Client(**self._client_kwargs(provider))
+                self._clients[provider] = client
+            return client
+
+    def install(self, provider: str, client: httpx.Client) -> httpx.Client | None:
+        """Use ``client`` for ``provider`` (e.g. one with a mock transport) and return the one it replaces."""
+        self.settings_for(provider)
+        with self._lock:
+            previous = self._clients.get(provider)
+            self._clients[provider] = client
+        return previous
+
+    def configure(self, provider: str, settings: ProviderClientSettings) -> None:
+        with self._lock:
+            self._settings[provider] = settings
+            client = self._clients.pop(provider, None)
+        if client is not None:
+            client.close()
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+_registry: ProviderClientRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> ProviderClientRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProviderClientRegistry()
+        return _registry
+
+
+def get_http_client(provider: str) -> httpx.Client:
+    return get_client_registry().get(provider)
+
+
+def request_timeout(timeout: float | None):
+    """Per-call timeout override, falling back to the provider client's default."""
+    return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
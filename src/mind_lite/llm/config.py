@@ -1,8 +1,11 @@
+import atexit
 import json
 import os
-from dataclasses import dataclass, field
+import tempfile
+import threading
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 
 @dataclass
@@ -39,34 +42,171 @@ def _get_config_path() -> Path:
     return config_dir / "llm_config.json"
 
 
-def get_llm_config() -> LlmConfig:
-    config_path = _get_config_path()
-    if config_path.exists():
-        try:
-            with open(config_path) as f:
-                data = json.load(f)
-            return LlmConfig.from_dict(data)
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    env_api_key = os.getenv("OPENROUTER_API_KEY", "")
-    env_lmstudio_url = os.getenv("MIND_LITE_LMSTUDIO_URL", "http://localhost:1234")
-    
+def _env_config() -> LlmConfig:
     return LlmConfig(
         active_provider="lmstudio",
         active_model="lmstudio:local",
-        openrouter_api_key=env_api_key,
-        lmstudio_url=env_lmstudio_url,
+        openrouter_api_key=os.getenv("OPENROUTER_API_KEY", ""),
+        lmstudio_url=os.getenv("MIND_LITE_LMSTUDIO_URL", "http://localhost:1234"),
         recently_used=[],
     )
 
 
+def _copy_config(config: LlmConfig) -> LlmConfig:
+    return replace(config, recently_used=[dict(entry) for entry in config.recently_used])
+
+
+class LlmConfigService:
+    """In-memory owner of ``llm_config.json``.
+
+    Reads are served from memory and only re-parse the file when its mtime
+    or size changes, so edits made by another process are still picked up.
+    Explicit settings changes (``save``, ``update``) are written straight away;
+    recently-used bookkeeping after each generation only marks the config
+    dirty and is written once per ``write_delay_seconds`` window. While a
+    write is pending the in-memory copy is authoritative. Every write goes
+    to a temporary file that is renamed over the target, so readers never
+    see a partially written file.
+    """
+
+    def __init__(self, path: Path, write_delay_seconds: float = 2.0):
+        self.path = Path(path)
+        self.write_delay_seconds = write_delay_seconds
+        self._lock = threading.RLock()
+        self._config: LlmConfig | None = None
+        self._signature: tuple[int, int] | None = None
+        self._dirty = False
+        self._timer: threading.Timer | None = None
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _current_locked(self) -> LlmConfig:
+        if self._dirty and self._config is not None:
+            return self._config
+
+        signature = self._file_signature()
+        if signature is None:
+            self._config, self._signature = None, None
+            return _env_config()
+        if self._config is not None and signature == self._signature:
+            return self._config
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            config = LlmConfig.from_dict(data)
+        except (json.JSONDecodeError, KeyError, OSError):
+            return _env_config()
+        self._config, self._signature = config, signature
+        return config
+
+    def get(self) -> LlmConfig:
+        with self._lock:
+            return _copy_config(self._current_locked())
+
+    def save(self, config: LlmConfig) -> None:
+        with self._lock:
+            self._cancel_timer_locked()
+            self._config = _copy_config(config)
+            self._write_locked()
+
+    def update(self, change: Callable[[LlmConfig], LlmConfig]) -> LlmConfig:
+        """Apply ``change`` to the current config and write the result, atomically.
+
+        Concurrent ``record_recently_used`` calls either land before the read
+        and are kept, or wait for the write; a pending delayed write is
+        folded into this one.
+        """
+        with self._lock:
+            config = _copy_config(change(_copy_config(self._current_locked())))
+            self._cancel_timer_locked()
+            self._config = config
+            self._write_locked()
+            return _copy_config(config)
+
+    def record_recently_used(self, provider: str, model: str) -> None:
+        with self._lock:
+            self._config = add_to_recently_used(self._current_locked(), provider, model)
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.write_delay_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._cancel_timer_locked()
+            if self._dirty:
+                self._write_locked()
+
+    def _cancel_timer_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_locked(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._config.to_dict(), f, indent=2)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+        self._dirty = False
+        self._signature = self._file_signature()
+
+
+_service: LlmConfigService | None = None
+_service_lock = threading.Lock()
+
+
+def get_llm_config_service() -> LlmConfigService:
+    global _service
+    path = _get_config_path()
+    with _service_lock:
+        if _service is None or _service.path != path:
+            if _service is not None:
+                _service.flush()
+            _service = LlmConfigService(path)
+        return _service
+
+
+def get_llm_config() -> LlmConfig:
+    return get_llm_config_service().get()
+
+
 def save_llm_config(config: LlmConfig) -> None:
-    config_path = _get_config_path()
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(config_path, "w") as f:
-        json.dump(config.to_dict(), f, indent=2)
+    get_llm_config_service().save(config)
+
+
+def update_llm_config(change: Callable[[LlmConfig], LlmConfig]) -> LlmConfig:
+    return get_llm_config_service().update(change)
+
+
+def record_recently_used(provider: str, model: str) -> None:
+    get_llm_config_service().record_recently_used(provider, model)
+
+
+def flush_llm_config() -> None:
+    with _service_lock:
+        service = _service
+    if service is not None:
+        service.flush()
+
+
+atexit.register(flush_llm_config)
 
 
 def add_to_recently_used(config: LlmConfig, provider: str, model: str) -> LlmConfig:
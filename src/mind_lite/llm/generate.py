@@ -1,10 +1,11 @@
-from typing import Any
+from typing import Any, Iterator
 
-from mind_lite.llm.config import LlmConfig, get_llm_config, save_llm_config, add_to_recently_used
+from mind_lite.llm.config import LlmConfig, get_llm_config, record_recently_used
 from mind_lite.llm.models import get_provider_for_model
-from mind_lite.llm.lmstudio import call_lmstudio
-from mind_lite.llm.openrouter import call_openrouter
+from mind_lite.llm.lmstudio import call_lmstudio, stream_lmstudio
+from mind_lite.llm.openrouter import call_openrouter, stream_openrouter
 from mind_lite.llm.prompts import build_ask_prompt
+from mind_lite.metrics import record_llm_result, time_stage
 
 
 def generate_answer(
@@ -15,31 +16,67 @@ def generate_answer(
     if config is None:
         config = get_llm_config()
     
-    prompt = build_ask_prompt(query, citations)
+    with time_stage("query", "prompt_build"):
+        prompt = build_ask_prompt(query, citations)
     provider = get_provider_for_model(config.active_model)
     
+    with time_stage("query", "llm_call"):
+        if provider == "lmstudio" or config.active_provider == "lmstudio":
+            result = call_lmstudio(
+                prompt=prompt,
+                model=config.active_model.replace("lmstudio:", ""),
+                base_url=config.lmstudio_url,
+            )
+        else:
+            result = call_openrouter(
+                prompt=prompt,
+                model=config.active_model,
+                api_key=config.openrouter_api_key,
+            )
+    record_llm_result(result)
+    
+    if result.get("success"):
+        record_recently_used(config.active_provider, config.active_model)
+    
+    return result
+
+
+def stream_answer(
+    query: str,
+    citations: list[dict],
+    config: LlmConfig | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream ``generate_answer``: ``token`` events, then one ``done`` event with the full result.
+
+    The ``llm_call`` stage is timed from the request until the ``done`` event.
+    """
+    if config is None:
+        config = get_llm_config()
+
+    with time_stage("query", "prompt_build"):
+        prompt = build_ask_prompt(query, citations)
+    provider = get_provider_for_model(config.active_model)
+
     if provider == "lmstudio" or config.active_provider == "lmstudio":
-        result = call_lmstudio(
+        events = stream_lmstudio(
             prompt=prompt,
             model=config.active_model.replace("lmstudio:", ""),
             base_url=config.lmstudio_url,
         )
     else:
-        result = call_openrouter(
+        events = stream_openrouter(
             prompt=prompt,
             model=config.active_model,
             api_key=config.openrouter_api_key,
         )
-    
-    if result.get("success"):
-        updated_config = add_to_recently_used(
-            config,
-            config.active_provider,
-            config.active_model,
-        )
-        save_llm_config(updated_config)
-    
-    return result
+
+    with time_stage("query", "llm_call"):
+        for event in events:
+            if event.get("type") == "done":
+                record_llm_result(event)
+                if event.get("success"):
+                    record_recently_used(config.active_provider, config.active_model)
+            yield event
 
 
 def generate_answer_with_fallback(
@@ -60,6 +97,7 @@ def generate_answer_with_fallback(
             prompt=build_ask_prompt(query, citations),
             base_url=config.lmstudio_url,
         )
+        record_llm_result(fallback_result)
         if fallback_result.get("success"):
             fallback_result["fallback_used"] = True
             fallback_result["fallback_reason"] = primary_result.get("error", "primary_failed")
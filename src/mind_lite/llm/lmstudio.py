@@ -1,6 +1,7 @@
-from typing import Any
+from typing import Any, Iterator
 
-import httpx
+from mind_lite.llm.clients import get_http_client, request_timeout
+from mind_lite.llm.streaming import iter_completion_deltas
 
 
 def call_lmstudio(
@@ -9,10 +10,10 @@ def call_lmstudio(
     base_url: str = "http://localhost:1234",
     temperature: float = 0.1,
     max_tokens: int = 1000,
-    timeout: float = 30.0,
+    timeout: float | None = None,
 ) -> dict[str, Any]:
     try:
-        response = httpx.post(
+        response = get_http_client("lmstudio").post(
             f"{base_url}/v1/chat/completions",
             json={
                 "model": model,
@@ -20,7 +21,7 @@ def call_lmstudio(
                 "temperature": temperature,
                 "max_tokens": max_tokens,
             },
-            timeout=timeout,
+            timeout=request_timeout(timeout),
         )
         response.raise_for_status()
         data = response.json()
@@ -31,6 +32,7 @@ def call_lmstudio(
             "content": content,
             "model": model,
             "provider": "lmstudio",
+            "usage": data.get("usage") if isinstance(data.get("usage"), dict) else None,
         }
     except Exception as e:
         return {
@@ -42,9 +44,58 @@ def call_lmstudio(
         }
 
 
+def stream_lmstudio(
+    prompt: str,
+    model: str = "local-model",
+    base_url: str = "http://localhost:1234",
+    temperature: float = 0.1,
+    max_tokens: int = 1000,
+    timeout: float | None = None,
+) -> Iterator[dict[str, Any]]:
+    parts: list[str] = []
+    usage: dict = {}
+    try:
+        with get_http_client("lmstudio").stream(
+            "POST",
+            f"{base_url}/v1/chat/completions",
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True,
+            },
+            timeout=request_timeout(timeout),
+        ) as response:
+            response.raise_for_status()
+            for token in iter_completion_deltas(response.iter_lines(), usage):
+                parts.append(token)
+                yield {"type": "token", "content": token}
+    except Exception as e:
+        yield {
+            "type": "done",
+            "success": False,
+            "error": str(e),
+            "content": "".join(parts),
+            "model": model,
+            "provider": "lmstudio",
+            "usage": usage or None,
+        }
+        return
+
+    yield {
+        "type": "done",
+        "success": True,
+        "content": "".join(parts),
+        "model": model,
+        "provider": "lmstudio",
+        "usage": usage or None,
+    }
+
+
 def check_lmstudio_available(base_url: str = "http://localhost:1234") -> bool:
     try:
-        response = httpx.get(f"{base_url}/v1/models", timeout=5.0)
+        response = get_http_client("lmstudio").get(f"{base_url}/v1/models", timeout=5.0)
         return response.status_code == 200
     except Exception:
         return False
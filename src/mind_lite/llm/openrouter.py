@@ -1,8 +1,11 @@
 import os
-from typing import Any
+from typing import Any, Iterator
 
 import httpx
 
+from mind_lite.llm.clients import get_http_client, request_timeout
+from mind_lite.llm.streaming import iter_completion_deltas
+
 
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
@@ -13,7 +16,7 @@ def call_openrouter(
     api_key: str | None = None,
     temperature: float = 0.1,
     max_tokens: int = 1000,
-    timeout: float = 60.0,
+    timeout: float | None = None,
     site_url: str = "http://localhost:8000",
     site_name: str = "Mind Lite",
 ) -> dict[str, Any]:
@@ -28,7 +31,7 @@ def call_openrouter(
         }
     
     try:
-        response = httpx.post(
+        response = get_http_client("openrouter").post(
             f"{OPENROUTER_BASE_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {key}",
@@ -41,7 +44,7 @@ def call_openrouter(
                 "temperature": temperature,
                 "max_tokens": max_tokens,
             },
-            timeout=timeout,
+            timeout=request_timeout(timeout),
         )
         response.raise_for_status()
         data = response.json()
@@ -52,6 +55,7 @@ def call_openrouter(
             "content": content,
             "model": model,
             "provider": "openrouter",
+            "usage": data.get("usage") if isinstance(data.get("usage"), dict) else None,
         }
     except httpx.HTTPStatusError as e:
         return {
@@ -71,13 +75,77 @@ def call_openrouter(
         }
 
 
+def stream_openrouter(
+    prompt: str,
+    model: str,
+    api_key: str | None = None,
+    temperature: float = 0.1,
+    max_tokens: int = 1000,
+    timeout: float | None = None,
+    site_url: str = "http://localhost:8000",
+    site_name: str = "Mind Lite",
+) -> Iterator[dict[str, Any]]:
+    key = api_key or os.getenv("OPENROUTER_API_KEY", "")
+    if not key:
+        yield {
+            "type": "done",
+            "success": False,
+            "error": "No OpenRouter API key configured",
+            "content": "",
+            "model": model,
+            "provider": "openrouter",
+        }
+        return
+
+    parts: list[str] = []
+    usage: dict = {}
+    error = None
+    try:
+        with get_http_client("openrouter").stream(
+            "POST",
+            f"{OPENROUTER_BASE_URL}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {key}",
+                "HTTP-Referer": site_url,
+                "X-Title": site_name,
+            },
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "stream": True,
+            },
+            timeout=request_timeout(timeout),
+        ) as response:
+            if response.is_error:
+                response.read()
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+            else:
+                for token in iter_completion_deltas(response.iter_lines(), usage):
+                    parts.append(token)
+                    yield {"type": "token", "content": token}
+    except Exception as e:
+        error = str(e)
+
+    yield {
+        "type": "done",
+        "success": error is None,
+        "error": error,
+        "content": "".join(parts),
+        "model": model,
+        "provider": "openrouter",
+        "usage": usage or None,
+    }
+
+
 def check_openrouter_available(api_key: str | None = None) -> bool:
     key = api_key or os.getenv("OPENROUTER_API_KEY", "")
     if not key:
         return False
     
     try:
-        response = httpx.get(
+        response = get_http_client("openrouter").get(
             f"{OPENROUTER_BASE_URL}/models",
             headers={"Authorization": f"Bearer {key}"},
             timeout=10.0,
@@ -0,0 +1,31 @@
+import json
+from typing import Iterable, Iterator
+
+
+def iter_completion_deltas(lines: Iterable[str], usage: dict | None = None) -> Iterator[str]:
+    """Yield content deltas from an OpenAI-style ``stream: true`` SSE body.
+
+    If the server reports token ``usage`` in a chunk, it is copied into
+    ``usage`` when one is given.
+    """
+    for line in lines:
+        if not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        try:
+            chunk = json.loads(data)
+        except ValueError:
+            continue
+        if not isinstance(chunk, dict):
+            continue
+        if usage is not None and isinstance(chunk.get("usage"), dict):
+            usage.update(chunk["usage"])
+        choices = chunk.get("choices")
+        if not choices:
+            continue
+        delta = choices[0].get("delta") or {}
+        content = delta.get("content")
+        if content:
+            yield content
@@ -0,0 +1,237 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {', '.join(self.labelnames) or '(none)'}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _pairs(self, key: tuple[str, ...]) -> list[tuple[str, str]]:
+        return list(zip(self.labelnames, key))
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: tuple[str, ...], value: object) -> list[str]:
+        return [f"{self.name}{_format_labels(self._pairs(key))} {_format_number(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; each series holds ``[bucket counts..., sum, count]``."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("buckets must be a non-empty increasing sequence")
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: object) -> int:
+        with self._lock:
+            series = self._values.get(self._key(labels))
+            return series[-1] if series is not None else 0
+
+    def _render_value(self, key: tuple[str, ...], value: object) -> list[str]:
+        series = list(value)
+        pairs = self._pairs(key)
+        lines = [
+            f"{self.name}_bucket{_format_labels([*pairs, ('le', _format_number(bound))])} {series[index]}"
+            for index, bound in enumerate(self.buckets)
+        ]
+        lines.append(f"{self.name}_bucket{_format_labels([*pairs, ('le', '+Inf')])} {series[-1]}")
+        lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_number(series[-2])}")
+        lines.append(f"{self.name}_count{_format_labels(pairs)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format.
+
+    Asking for an existing name returns the metric already registered, so
+    modules can declare the metrics they update at import time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric_type: type, name: str, *args, **kwargs) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if type(existing) is not metric_type:
+                    raise ValueError(f"metric {name} is already registered as a {existing.kind}")
+                return existing
+            metric = self._metrics[name] = metric_type(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return lines
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "mind_lite_http_request_duration_seconds",
+    "HTTP request latency by route and status",
+    ("route", "status"),
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "mind_lite_stage_duration_seconds",
+    "Time spent in each stage of the query and index pipelines",
+    ("pipeline", "stage"),
+)
+LLM_REQUESTS = REGISTRY.counter(
+    "mind_lite_llm_requests_total",
+    "LLM completions by provider and outcome",
+    ("provider", "outcome"),
+)
+LLM_TOKENS = REGISTRY.counter(
+    "mind_lite_llm_tokens_total",
+    "LLM tokens reported by the provider, by kind",
+    ("provider", "kind"),
+)
+
+
+def time_stage(pipeline: str, stage: str):
+    """Context manager that observes the duration of one pipeline stage."""
+    return STAGE_SECONDS.time(pipeline=pipeline, stage=stage)
+
+
+def observe_request(route: str, status: int, seconds: float) -> None:
+    """``timing_middleware`` recorder for ``HTTP_REQUEST_SECONDS``."""
+    HTTP_REQUEST_SECONDS.observe(seconds, route=route, status=status)
+
+
+def record_llm_result(result: dict) -> None:
+    """Count one completion result and the token usage it reports, if any."""
+    provider = result.get("provider") or "unknown"
+    LLM_REQUESTS.inc(provider=provider, outcome="success" if result.get("success") else "error")
+    usage = result.get("usage")
+    if not isinstance(usage, dict):
+        return
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        if isinstance(tokens, int) and not isinstance(tokens, bool) and tokens > 0:
+            LLM_TOKENS.inc(tokens, provider=provider, kind=kind)
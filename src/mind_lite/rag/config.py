@@ -8,6 +8,20 @@ class RagConfig:
     collection_name: str
     sqlite_path: str
     embed_model: str
+    embed_batch_size: int = 256
+    index_read_workers: int = 4
+    index_queue_size: int = 64
+    embed_cache_path: str = ".mind_lite/embedding_cache.db"
+    embed_cache_max_entries: int = 500_000
+    vector_backend: str = "qdrant"
+    local_index_path: str = ".mind_lite/vectors"
+    local_index_type: str = "ivf"
+    ivf_nlist: int = 0
+    ivf_nprobe: int = 16
+    hydrate_chunks: bool = True
+    retrieval_mode: str = "vector"
+    query_cache_size: int = 1024
+    result_cache_ttl_seconds: float = 300.0
 
 
 def get_rag_config() -> RagConfig:
@@ -18,4 +32,19 @@ def get_rag_config() -> RagConfig:
         embed_model=os.getenv(
             "MIND_LITE_EMBED_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
         ),
+        embed_batch_size=int(os.getenv("MIND_LITE_EMBED_BATCH_SIZE", "256")),
+        index_read_workers=int(os.getenv("MIND_LITE_INDEX_READ_WORKERS", "4")),
+        index_queue_size=int(os.getenv("MIND_LITE_INDEX_QUEUE_SIZE", "64")),
+        embed_cache_path=os.getenv("MIND_LITE_EMBED_CACHE_PATH", ".mind_lite/embedding_cache.db"),
+        embed_cache_max_entries=int(os.getenv("MIND_LITE_EMBED_CACHE_MAX_ENTRIES", "500000")),
+        vector_backend=os.getenv("MIND_LITE_VECTOR_BACKEND", "qdrant"),
+        local_index_path=os.getenv("MIND_LITE_LOCAL_INDEX_PATH", ".mind_lite/vectors"),
+        local_index_type=os.getenv("MIND_LITE_LOCAL_INDEX_TYPE", "ivf"),
+        ivf_nlist=int(os.getenv("MIND_LITE_IVF_NLIST", "0")),
+        ivf_nprobe=int(os.getenv("MIND_LITE_IVF_NPROBE", "16")),
+        hydrate_chunks=os.getenv("MIND_LITE_RAG_HYDRATE", "true").strip().lower()
+        not in ("0", "false", "no"),
+        retrieval_mode=os.getenv("MIND_LITE_RAG_RETRIEVAL_MODE", "vector"),
+        query_cache_size=int(os.getenv("MIND_LITE_QUERY_CACHE_SIZE", "1024")),
+        result_cache_ttl_seconds=float(os.getenv("MIND_LITE_RESULT_CACHE_TTL_SECONDS", "300")),
     )
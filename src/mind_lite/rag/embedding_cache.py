@@ -0,0 +1,180 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+_LOOKUP_BATCH_SIZE = 500
+
+
+class EmbeddingCache:
+    """On-disk store of chunk embeddings keyed by (model name, content hash).
+
+    Vectors are stored as packed float32 blobs. Each lookup refreshes the
+    entry's ``last_used`` tick, and inserts past ``max_entries`` evict the
+    least recently used rows.
+
+    The cache holds one WAL-mode connection, used under its lock. The entry
+    count and the latest tick are read once when the cache opens and then
+    kept in memory, so puts and ``stats`` never scan the table. They assume
+    this instance is the only writer of ``db_path``.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 500_000, busy_timeout_ms: int = 5_000):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = self._open_conn()
+        self._init_schema()
+        self._entries, self._tick = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(last_used), 0) FROM embedding_cache"
+        ).fetchone()
+
+    def _open_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            timeout=self.busy_timeout_ms / 1000,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
+
+    def _init_schema(self) -> None:
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model_name TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (model_name, content_hash)
+            )
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used
+            ON embedding_cache (last_used)
+        """)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        else:
+            cursor.execute("COMMIT")
+
+    def _next_tick(self) -> int:
+        self._tick += 1
+        return self._tick
+
+    def _lookup(self, cursor: sqlite3.Cursor, model_name: str, content_hashes: list[str]) -> list[tuple]:
+        rows = []
+        for start in range(0, len(content_hashes), _LOOKUP_BATCH_SIZE):
+            batch = content_hashes[start : start + _LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" for _ in batch)
+            cursor.execute(
+                f"""
+                SELECT content_hash, vector FROM embedding_cache
+                WHERE model_name = ? AND content_hash IN ({placeholders})
+                """,
+                (model_name, *batch),
+            )
+            rows.extend(cursor.fetchall())
+        return rows
+
+    def get_many(self, model_name: str, content_hashes: list[str]) -> dict[str, np.ndarray]:
+        if not content_hashes:
+            return {}
+
+        unique_hashes = list(dict.fromkeys(content_hashes))
+        with self._lock:
+            found = {
+                content_hash: np.frombuffer(blob, dtype=np.float32)
+                for content_hash, blob in self._lookup(self._conn.cursor(), model_name, unique_hashes)
+            }
+            if found:
+                tick = self._next_tick()
+                with self._transaction() as cursor:
+                    cursor.executemany(
+                        """
+                        UPDATE embedding_cache SET last_used = ?
+                        WHERE model_name = ? AND content_hash = ?
+                        """,
+                        [(tick, model_name, content_hash) for content_hash in found],
+                    )
+            self._hits += len(found)
+            self._misses += len(unique_hashes) - len(found)
+        return found
+
+    def put_many(self, model_name: str, vectors: dict[str, Any]) -> None:
+        if not vectors:
+            return
+
+        with self._lock:
+            tick = self._next_tick()
+            rows = []
+            for content_hash, vector in vectors.items():
+                packed = np.asarray(vector, dtype=np.float32).ravel()
+                rows.append((model_name, content_hash, packed.size, packed.tobytes(), tick))
+            with self._transaction() as cursor:
+                existing = len(self._lookup(cursor, model_name, list(vectors)))
+                cursor.executemany(
+                    """
+                    INSERT OR REPLACE INTO embedding_cache
+                        (model_name, content_hash, dimensions, vector, last_used)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                entries = self._entries + len(rows) - existing
+                evicted = self._evict_overflow(cursor, entries)
+            self._entries = entries - evicted
+            self._evictions += evicted
+
+    def _evict_overflow(self, cursor: sqlite3.Cursor, entries: int) -> int:
+        overflow = entries - self.max_entries
+        if overflow <= 0:
+            return 0
+        cursor.execute(
+            """
+            DELETE FROM embedding_cache WHERE rowid IN (
+                SELECT rowid FROM embedding_cache ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (overflow,),
+        )
+        return overflow
+
+    def count(self) -> int:
+        with self._lock:
+            return self._entries
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": self._entries,
+                "max_entries": self.max_entries,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,9 +1,22 @@
+import hashlib
 from typing import Any, Optional
 
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
 
 class EmbeddingAdapter:
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        cache: Optional[Any] = None,
+    ):
         self.model_name = model_name
+        self.cache = cache
         self._model: Optional[Any] = None
 
     def _load_model(self) -> Any:
@@ -13,10 +26,47 @@ class EmbeddingAdapter:
             self._model = SentenceTransformer(self.model_name)
         return self._model
 
+    def _encode_array(self, texts: list[str]) -> np.ndarray:
+        model = self._load_model()
+        return np.asarray(model.encode(texts), dtype=np.float32)
+
+    def _embed_cached(self, texts: list[str]) -> np.ndarray:
+        hashes = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors = self.cache.get_many(self.model_name, hashes)
+
+        missing: dict[str, str] = {}
+        for content_hash, text in zip(hashes, texts):
+            if content_hash not in vectors and content_hash not in missing:
+                missing[content_hash] = text
+
+        if missing:
+            encoded = self._encode_array(list(missing.values()))
+            fresh = dict(zip(missing, encoded))
+            self.cache.put_many(self.model_name, fresh)
+            vectors.update(fresh)
+
+        return np.stack([vectors[content_hash] for content_hash in hashes]).astype(np.float32, copy=False)
+
+    def embed_texts_array(self, texts: list[str], normalize: bool = False) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        if self.cache is None:
+            vectors = self._encode_array(texts)
+        else:
+            vectors = self._embed_cached(texts)
+
+        if normalize:
+            vectors = normalize_rows(vectors)
+        return vectors
+
     def embed_texts(self, texts: list[str]) -> list[list[float]]:
         if not texts:
             return []
 
+        if self.cache is not None:
+            return self._embed_cached(texts).tolist()
+
         model = self._load_model()
         embeddings = model.encode(texts)
         return [emb.tolist() for emb in embeddings]
@@ -1,6 +1,40 @@
 import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
+
+from mind_lite.metrics import time_stage
+
+DELETE_BATCH_SIZE = 512
+
+
+@dataclass
+class PendingDocument:
+    note_path: str
+    content_hash: str
+    token_count: int
+    mtime_ns: int | None
+    size_bytes: int | None
+    chunks: list[dict[str, Any]]
+    remaining: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.remaining = len(self.chunks)
+
+
+@dataclass
+class LoadedNote:
+    note_path: str
+    stat: os.stat_result
+    known: dict[str, Any] | None
+    unchanged: bool = False
+    content_hash: str | None = None
+    document: PendingDocument | None = None
 
 
 class IndexingService:
@@ -11,12 +45,29 @@ class IndexingService:
         embedder: Any,
         max_tokens: int = 200,
         overlap_tokens: int = 20,
+        embed_batch_size: int = 256,
+        read_workers: int = 4,
+        read_queue_size: int = 64,
+        normalize_embeddings: bool = False,
     ):
+        if embed_batch_size <= 0:
+            raise ValueError("embed_batch_size must be > 0")
+        if read_workers <= 0:
+            raise ValueError("read_workers must be > 0")
+        if read_queue_size <= 0:
+            raise ValueError("read_queue_size must be > 0")
         self.sqlite_store = sqlite_store
         self.qdrant_index = qdrant_index
         self.embedder = embedder
         self.max_tokens = max_tokens
         self.overlap_tokens = overlap_tokens
+        self.embed_batch_size = embed_batch_size
+        self.read_workers = read_workers
+        self.read_queue_size = read_queue_size
+        self.normalize_embeddings = normalize_embeddings
+        self._run_lock = threading.Lock()
+        self._upserted_chunk_ids: list[str] = []
+        self._undo_moves: list[dict[str, Any]] = []
 
     def _compute_content_hash(self, content: str) -> str:
         return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -25,24 +76,26 @@ class IndexingService:
         folder = Path(folder_path)
         return sorted(folder.rglob("*.md"))
 
-    def _index_document(self, note_path: str, content: str) -> list[dict[str, Any]]:
+    def _prepare_document(
+        self,
+        note_path: str,
+        content: str,
+        content_hash: str | None = None,
+        mtime_ns: int | None = None,
+        size_bytes: int | None = None,
+    ) -> PendingDocument:
         from mind_lite.rag.chunking import chunk_document
 
-        content_hash = self._compute_content_hash(content)
-        token_count = len(content.split())
-
-        self.sqlite_store.upsert_document(
-            note_path=note_path,
-            content_hash=content_hash,
-            token_count=token_count,
-        )
+        if content_hash is None:
+            content_hash = self._compute_content_hash(content)
 
-        chunks = chunk_document(
-            note_path=note_path,
-            text=content,
-            max_tokens=self.max_tokens,
-            overlap_tokens=self.overlap_tokens,
-        )
+        with time_stage("index", "chunk"):
+            chunks = chunk_document(
+                note_path=note_path,
+                text=content,
+                max_tokens=self.max_tokens,
+                overlap_tokens=self.overlap_tokens,
+            )
 
         chunk_dicts = [
             {
@@ -57,41 +110,314 @@ class IndexingService:
             for c in chunks
         ]
 
-        self.sqlite_store.replace_chunks_for_document(note_path, chunk_dicts)
+        return PendingDocument(
+            note_path=note_path,
+            content_hash=content_hash,
+            token_count=len(content.split()),
+            mtime_ns=mtime_ns,
+            size_bytes=size_bytes,
+            chunks=chunk_dicts,
+        )
 
-        return chunk_dicts
+    def _commit_document(self, document: PendingDocument) -> None:
+        with time_stage("index", "store"):
+            self.sqlite_store.upsert_document(
+                note_path=document.note_path,
+                content_hash=document.content_hash,
+                token_count=document.token_count,
+                mtime_ns=document.mtime_ns,
+                size_bytes=document.size_bytes,
+            )
+            self.sqlite_store.replace_chunks_for_document(document.note_path, document.chunks)
 
-    def index_folder(self, folder_path: str) -> dict[str, Any]:
-        files = self._collect_markdown_files(folder_path)
-        files_indexed = 0
-        chunks_created = 0
+    def _supports_array_embeddings(self) -> bool:
+        # Checked on the class so that mocks without a real array API
+        # keep using the list-based embed_texts path.
+        return callable(getattr(type(self.embedder), "embed_texts_array", None))
+
+    def _embed_and_upsert(self, chunk_dicts: list[dict[str, Any]]) -> None:
+        if not chunk_dicts:
+            return
+
+        self._upserted_chunk_ids.extend(c["chunk_id"] for c in chunk_dicts)
+        chunk_contents = [c["content"] for c in chunk_dicts]
+
+        if self._supports_array_embeddings():
+            with time_stage("index", "embed"):
+                vectors = self.embedder.embed_texts_array(
+                    chunk_contents, normalize=self.normalize_embeddings
+                )
+            with time_stage("index", "upsert"):
+                self.qdrant_index.upsert_chunks(
+                    [{"chunk_id": c["chunk_id"], "payload": self._build_payload(c)} for c in chunk_dicts],
+                    vectors=vectors,
+                )
+            return
+
+        with time_stage("index", "embed"):
+            embeddings = self.embedder.embed_texts(chunk_contents)
+
+        qdrant_chunks = [
+            {
+                "chunk_id": c["chunk_id"],
+                "embedding": emb,
+                "payload": self._build_payload(c),
+            }
+            for c, emb in zip(chunk_dicts, embeddings)
+        ]
+        with time_stage("index", "upsert"):
+            self.qdrant_index.upsert_chunks(qdrant_chunks)
+
+    def _build_payload(self, chunk: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "note_path": chunk["note_path"],
+            "chunk_index": chunk["chunk_index"],
+            "content": chunk["content"],
+        }
+
+    def _is_unchanged_on_disk(self, known: dict[str, Any] | None, stat: Any) -> bool:
+        if known is None:
+            return False
+        return known.get("mtime_ns") == stat.st_mtime_ns and known.get("size_bytes") == stat.st_size
+
+    def _find_missing_documents(
+        self, folder_path: str, fingerprints: dict[str, dict[str, Any]], on_disk: set[str]
+    ) -> dict[str, dict[str, Any]]:
+        folder = Path(folder_path)
+        return {
+            note_path: known
+            for note_path, known in fingerprints.items()
+            if note_path not in on_disk and Path(note_path).is_relative_to(folder)
+        }
+
+    def _rename_document(self, old_path: str, new_path: str, stat: Any) -> None:
+        from mind_lite.rag.chunking import _build_chunk_id
+
+        chunks = self.sqlite_store.get_chunks_for_document(old_path)
+        chunk_id_map: dict[str, str] = {}
+        moves: list[dict[str, Any]] = []
+        moved_chunks: dict[str, dict[str, Any]] = {}
+        for chunk in chunks:
+            new_chunk_id = _build_chunk_id(new_path, chunk["chunk_index"], chunk["content"])
+            chunk_id_map[chunk["chunk_id"]] = new_chunk_id
+            moved = {**chunk, "chunk_id": new_chunk_id, "note_path": new_path}
+            moved_chunks[new_chunk_id] = moved
+            moves.append(
+                {
+                    "old_chunk_id": chunk["chunk_id"],
+                    "chunk_id": new_chunk_id,
+                    "payload": self._build_payload(moved),
+                }
+            )
+            self._undo_moves.append(
+                {
+                    "old_chunk_id": new_chunk_id,
+                    "chunk_id": chunk["chunk_id"],
+                    "payload": self._build_payload(chunk),
+                }
+            )
+
+        self.sqlite_store.rename_document(
+            old_path,
+            new_path,
+            chunk_id_map,
+            mtime_ns=stat.st_mtime_ns,
+            size_bytes=stat.st_size,
+        )
+        missing = self.qdrant_index.move_chunks(moves)
+        if missing:
+            self._embed_and_upsert([moved_chunks[chunk_id] for chunk_id in missing])
+
+    def _load_note(
+        self, file_path: Path, known: dict[str, Any] | None, incremental: bool
+    ) -> LoadedNote:
+        note_path = str(file_path)
+        stat = file_path.stat()
+        loaded = LoadedNote(note_path=note_path, stat=stat, known=known)
+
+        if incremental and self._is_unchanged_on_disk(known, stat):
+            loaded.unchanged = True
+            return loaded
 
-        for file_path in files:
+        with time_stage("index", "read"):
             content = file_path.read_text(encoding="utf-8")
-            note_path = str(file_path)
+            loaded.content_hash = self._compute_content_hash(content)
+
+        if incremental and known is not None and known.get("content_hash") == loaded.content_hash:
+            return loaded
+
+        loaded.document = self._prepare_document(
+            note_path,
+            content,
+            content_hash=loaded.content_hash,
+            mtime_ns=stat.st_mtime_ns,
+            size_bytes=stat.st_size,
+        )
+        return loaded
+
+    def _iter_loaded_notes(
+        self, files: list[Path], fingerprints: dict[str, dict[str, Any]], incremental: bool
+    ) -> Iterator[LoadedNote]:
+        """Read, hash and chunk notes on a worker pool, yielding them in file order.
+
+        At most ``read_queue_size`` notes are in flight, so readers stall
+        instead of buffering the vault in memory when embedding falls behind.
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=self.read_workers, thread_name_prefix="mind-lite-index-read"
+        )
+        in_flight: deque[Future] = deque()
+        try:
+            for file_path in files:
+                in_flight.append(
+                    executor.submit(
+                        self._load_note, file_path, fingerprints.get(str(file_path)), incremental
+                    )
+                )
+                if len(in_flight) >= self.read_queue_size:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _delete_vectors(self, chunk_ids: list[str]) -> None:
+        for start in range(0, len(chunk_ids), DELETE_BATCH_SIZE):
+            self.qdrant_index.delete_chunks(chunk_ids[start : start + DELETE_BATCH_SIZE])
 
-            chunk_dicts = self._index_document(note_path, content)
+    def index_folder(
+        self,
+        folder_path: str,
+        incremental: bool = True,
+        progress: Callable[[dict[str, int]], None] | None = None,
+    ) -> dict[str, Any]:
+        """Index every note under ``folder_path`` in one transaction.
+
+        ``progress`` is called after each note with ``files_done``,
+        ``files_total`` and ``chunks_embedded``; an exception raised from it
+        aborts the run and rolls back its SQLite writes; vectors the run
+        upserted or moved are then reverted to match. Runs are serialised:
+        the transaction holds the SQLite write lock throughout, so a second
+        run is refused with a ``ValueError`` instead of timing out on it.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            raise ValueError("index already running")
+        self._upserted_chunk_ids = []
+        self._undo_moves = []
+        try:
+            with self.sqlite_store.transaction():
+                return self._index_folder(folder_path, incremental, progress)
+        except BaseException:
+            self._revert_vector_writes()
+            raise
+        finally:
+            self._run_lock.release()
+
+    def _revert_vector_writes(self) -> None:
+        """Bring the vector index back in line with the rolled-back SQLite state.
+
+        Renames are moved back, then every vector the run upserted is deleted
+        unless SQLite still has its chunk (an unchanged chunk re-embedded
+        under the same id). Vectors the run already deleted are not restored;
+        their documents are still in SQLite, so the next run deletes them again.
+        """
+        if self._undo_moves:
+            self.qdrant_index.move_chunks(list(reversed(self._undo_moves)))
+        upserted = list(dict.fromkeys(self._upserted_chunk_ids))
+        known = self.sqlite_store.get_chunks_by_ids(upserted)
+        self._delete_vectors([chunk_id for chunk_id in upserted if chunk_id not in known])
+
+    def _index_folder(
+        self,
+        folder_path: str,
+        incremental: bool,
+        progress: Callable[[dict[str, int]], None] | None = None,
+    ) -> dict[str, Any]:
+        started = time.perf_counter()
+        files = self._collect_markdown_files(folder_path)
+        fingerprints = self.sqlite_store.get_document_fingerprints()
+        missing = self._find_missing_documents(
+            folder_path, fingerprints, {str(file_path) for file_path in files}
+        )
+        missing_by_hash: dict[str, list[str]] = {}
+        for note_path in sorted(missing):
+            missing_by_hash.setdefault(missing[note_path].get("content_hash"), []).append(note_path)
 
-            if chunk_dicts:
-                chunk_contents = [c["content"] for c in chunk_dicts]
-                embeddings = self.embedder.embed_texts(chunk_contents)
+        files_indexed = 0
+        files_new = 0
+        files_updated = 0
+        files_skipped = 0
+        files_renamed = 0
+        chunks_created = 0
+        orphaned_chunk_ids: list[str] = []
+        batcher = EmbeddingBatcher(self, self.embed_batch_size)
 
-                qdrant_chunks = [
+        for files_done, loaded in enumerate(self._iter_loaded_notes(files, fingerprints, incremental)):
+            if progress is not None:
+                progress(
                     {
-                        "chunk_id": c["chunk_id"],
-                        "embedding": emb,
-                        "payload": {
-                            "note_path": c["note_path"],
-                            "chunk_index": c["chunk_index"],
-                            "content": c["content"],
-                        },
+                        "files_done": files_done,
+                        "files_total": len(files),
+                        "chunks_embedded": batcher.chunks_embedded,
                     }
-                    for c, emb in zip(chunk_dicts, embeddings)
-                ]
-                self.qdrant_index.upsert_chunks(qdrant_chunks)
+                )
+            note_path = loaded.note_path
+            stat = loaded.stat
+            known = loaded.known
+
+            if loaded.unchanged:
+                files_skipped += 1
+                continue
+
+            if loaded.document is None:
+                self.sqlite_store.touch_document(note_path, stat.st_mtime_ns, stat.st_size)
+                files_skipped += 1
+                continue
+
+            content_hash = loaded.content_hash
+            rename_candidates = missing_by_hash.get(content_hash)
+            if known is None and rename_candidates:
+                old_path = rename_candidates.pop(0)
+                missing.pop(old_path, None)
+                self._rename_document(old_path, note_path, stat)
+                files_renamed += 1
+                continue
+
+            previous_chunk_ids = []
+            if known is not None:
+                previous_chunk_ids = self.sqlite_store.get_chunk_ids_for_document(note_path)
+
+            document = loaded.document
+            batcher.add(document)
+
+            current_chunk_ids = {c["chunk_id"] for c in document.chunks}
+            orphaned_chunk_ids.extend(
+                chunk_id for chunk_id in previous_chunk_ids if chunk_id not in current_chunk_ids
+            )
 
             files_indexed += 1
-            chunks_created += len(chunk_dicts)
+            if known is None:
+                files_new += 1
+            else:
+                files_updated += 1
+            chunks_created += len(document.chunks)
+
+        batcher.flush()
+        if progress is not None:
+            progress(
+                {
+                    "files_done": len(files),
+                    "files_total": len(files),
+                    "chunks_embedded": batcher.chunks_embedded,
+                }
+            )
+
+        deleted_paths = sorted(missing)
+        orphaned_chunk_ids.extend(self.sqlite_store.delete_documents(deleted_paths))
+        self._delete_vectors(orphaned_chunk_ids)
+
+        if files_indexed or files_renamed or deleted_paths:
+            self.sqlite_store.bump_index_version()
 
         self.sqlite_store.record_ingestion_run(
             run_type="folder",
@@ -100,10 +426,66 @@ class IndexingService:
             status="completed",
         )
 
+        elapsed = time.perf_counter() - started
         return {
             "files_indexed": files_indexed,
             "chunks_created": chunks_created,
+            "files_new": files_new,
+            "files_updated": files_updated,
+            "files_skipped": files_skipped,
+            "files_renamed": files_renamed,
+            "files_deleted": len(deleted_paths),
+            "chunks_deleted": len(orphaned_chunk_ids),
+            "embedding_batches": batcher.batches,
+            "chunks_per_second": round(chunks_created / elapsed, 2) if elapsed > 0 else 0.0,
+            "incremental": incremental,
         }
 
-    def index_vault(self, vault_path: str) -> dict[str, Any]:
-        return self.index_folder(vault_path)
+    def index_vault(
+        self,
+        vault_path: str,
+        incremental: bool = True,
+        progress: Callable[[dict[str, int]], None] | None = None,
+    ) -> dict[str, Any]:
+        return self.index_folder(vault_path, incremental=incremental, progress=progress)
+
+
+class EmbeddingBatcher:
+    """Packs chunks from many notes into fixed-size embedding calls.
+
+    A note is written to SQLite only once every one of its chunks has been
+    embedded and upserted, so an interrupted run never leaves a document
+    row that claims vectors it does not have.
+    """
+
+    def __init__(self, service: IndexingService, batch_size: int):
+        self.service = service
+        self.batch_size = batch_size
+        self.batches = 0
+        self.chunks_embedded = 0
+        self._pending: list[tuple[PendingDocument, dict[str, Any]]] = []
+
+    def add(self, document: PendingDocument) -> None:
+        if not document.chunks:
+            self.service._commit_document(document)
+            return
+
+        self._pending.extend((document, chunk) for chunk in document.chunks)
+        while len(self._pending) >= self.batch_size:
+            self._embed_batch(self._pending[: self.batch_size])
+            self._pending = self._pending[self.batch_size :]
+
+    def flush(self) -> None:
+        if self._pending:
+            self._embed_batch(self._pending)
+            self._pending = []
+
+    def _embed_batch(self, batch: list[tuple[PendingDocument, dict[str, Any]]]) -> None:
+        self.service._embed_and_upsert([chunk for _, chunk in batch])
+        self.batches += 1
+        self.chunks_embedded += len(batch)
+
+        for document, _ in batch:
+            document.remaining -= 1
+            if document.remaining == 0:
+                self.service._commit_document(document)
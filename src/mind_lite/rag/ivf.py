@@ -0,0 +1,132 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from mind_lite.rag.embeddings import normalize_rows
+
+_ASSIGN_BLOCK_ROWS = 65_536
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, n_clusters: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Cluster L2-normalised rows by cosine similarity and return unit centroids."""
+    if vectors.shape[0] == 0:
+        raise ValueError("cannot train centroids on an empty sample")
+    n_clusters = min(n_clusters, vectors.shape[0])
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(vectors.shape[0], n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = assign_nearest(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=n_clusters)
+        sums = np.zeros_like(centroids)
+        occupied = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[occupied]
+        sums[occupied] = np.add.reduceat(vectors[order], starts, axis=0)
+        empty = np.flatnonzero(~occupied)
+        if empty.size:
+            sums[empty] = vectors[rng.choice(vectors.shape[0], empty.size, replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids.astype(np.float32, copy=False)
+
+
+def assign_nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], _ASSIGN_BLOCK_ROWS):
+        block = np.asarray(vectors[start : start + _ASSIGN_BLOCK_ROWS])
+        labels[start : start + block.shape[0]] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+class InvertedLists:
+    """IVF coarse quantiser over the rows of a ``LocalVectorIndex`` matrix.
+
+    Every row is assigned to its nearest centroid and appended to that
+    centroid's list, once: re-adding a row to the list it is already in is a
+    no-op. Deletes and reassignments only leave tombstones behind;
+    a list entry is live when the row is alive and still assigned to that
+    list, and ``rebuild`` drops the rest.
+    """
+
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.assignments = np.full(0, -1, dtype=np.int32)
+        self._lists: list[np.ndarray] = [np.zeros(0, dtype=np.int64) for _ in range(self.nlist)]
+        self._appended: dict[int, list[int]] = {}
+        self.entries = 0
+        self.tombstones = 0
+
+    @property
+    def nlist(self) -> int:
+        return self.centroids.shape[0]
+
+    def resize(self, capacity: int) -> None:
+        if capacity <= self.assignments.shape[0]:
+            return
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        assignments[: self.assignments.shape[0]] = self.assignments
+        self.assignments = assignments
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        return assign_nearest(vectors, self.centroids)
+
+    def add(self, rows: np.ndarray, labels: np.ndarray) -> None:
+        previous = self.assignments[rows]
+        moved = previous != labels
+        self.tombstones += int(np.count_nonzero(moved & (previous >= 0)))
+        self.assignments[rows] = labels
+        for row, label in zip(rows[moved].tolist(), labels[moved].tolist()):
+            self._appended.setdefault(label, []).append(row)
+        self.entries += int(np.count_nonzero(moved))
+
+    def remove(self, rows: np.ndarray) -> None:
+        rows = rows[self.assignments[rows] >= 0]
+        self.assignments[rows] = -1
+        self.tombstones += len(rows)
+
+    def rebuild(self, row_count: int) -> None:
+        labels = self.assignments[:row_count]
+        live = np.flatnonzero(labels >= 0)
+        order = live[np.argsort(labels[live], kind="stable")]
+        counts = np.bincount(labels[live], minlength=self.nlist)
+        self._lists = np.split(order.astype(np.int64), np.cumsum(counts)[:-1])
+        self._appended = {}
+        self.entries = int(live.size)
+        self.tombstones = 0
+
+    def probe(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        nprobe = max(1, min(nprobe, self.nlist))
+        scores = self.centroids @ query
+        probed = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        candidates = []
+        for label in probed.tolist():
+            pending = self._appended.pop(label, None)
+            if pending:
+                # A row deleted and then re-added to the same list still has
+                # its old entry there, so merge instead of appending.
+                self._lists[label] = np.union1d(
+                    self._lists[label], np.asarray(pending, dtype=np.int64)
+                )
+            rows = self._lists[label]
+            candidates.append(rows[self.assignments[rows] == label])
+        if not candidates:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(candidates)
+
+    def save(self, path: Path) -> None:
+        tmp_path = path.with_suffix(".tmp.npy")
+        np.save(tmp_path, self.centroids)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, dimensions: int) -> Optional["InvertedLists"]:
+        if not path.exists():
+            return None
+        centroids = np.load(path)
+        if centroids.ndim != 2 or centroids.shape[1] != dimensions:
+            return None
+        return cls(centroids)
@@ -0,0 +1,414 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from mind_lite.rag.embeddings import normalize_rows
+from mind_lite.rag.ivf import InvertedLists, spherical_kmeans
+
+_INITIAL_CAPACITY = 1024
+_INDEX_TYPES = ("flat", "ivf")
+_TRAIN_SAMPLES_PER_LIST = 64
+_ASSIGN_BLOCK_ROWS = 65_536
+
+
+class LocalVectorIndex:
+    """In-process vector index with the same surface as ``QdrantIndex``.
+
+    Vectors live L2-normalised in a contiguous float32 matrix that is
+    memory-mapped from ``<index_dir>/vectors.f32``; cosine similarity is a
+    single matmul followed by ``argpartition``. Chunk ids, payloads and the
+    matrix row each id occupies are kept in ``<index_dir>/points.db``.
+    Deleted rows are masked out and reused by later inserts.
+
+    With ``index_type="ivf"`` the index trains k-means centroids once it
+    holds ``ivf_min_points`` vectors and from then on only scores the rows
+    in the ``nprobe`` closest inverted lists. New rows are assigned to a
+    list as they are inserted; deletes leave tombstones that ``compact``
+    drops, and ``compact`` retrains when the index has grown
+    ``ivf_retrain_growth`` times past the size it was trained at.
+    """
+
+    def __init__(
+        self,
+        index_dir: str,
+        collection_name: str = "mind_lite_chunks",
+        index_type: str = "flat",
+        nlist: int = 0,
+        nprobe: int = 16,
+        ivf_min_points: int = 20_000,
+        ivf_retrain_growth: float = 4.0,
+        compact_ratio: float = 0.2,
+    ):
+        if index_type not in _INDEX_TYPES:
+            raise ValueError(f"index_type must be one of {', '.join(_INDEX_TYPES)}")
+        if nlist < 0:
+            raise ValueError("nlist must be >= 0")
+        if nprobe <= 0:
+            raise ValueError("nprobe must be > 0")
+        if ivf_min_points <= 0:
+            raise ValueError("ivf_min_points must be > 0")
+        self.index_dir = Path(index_dir)
+        self.collection_name = collection_name
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.ivf_min_points = ivf_min_points
+        self.ivf_retrain_growth = ivf_retrain_growth
+        self.compact_ratio = compact_ratio
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.index_dir / "vectors.f32"
+        self._db_path = self.index_dir / "points.db"
+        self._centroids_path = self.index_dir / "centroids.npy"
+        self._lock = threading.RLock()
+        self._dimensions: int | None = None
+        self._matrix: np.ndarray | None = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_by_id: dict[str, int] = {}
+        self._id_by_row: dict[int, str] = {}
+        self._payload_by_row: dict[int, dict[str, Any]] = {}
+        self._free_rows: list[int] = []
+        self._row_count = 0
+        self._ivf: InvertedLists | None = None
+        self._ivf_trained_count = 0
+        self._conn: sqlite3.Connection | None = None
+        self._init_db()
+        self._load()
+
+    def _connection(self) -> sqlite3.Connection:
+        """The index's one ``points.db`` connection; callers hold ``self._lock``."""
+        if self._conn is None:
+            conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _init_db(self) -> None:
+        conn = self._connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS points (
+                row INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL UNIQUE,
+                payload TEXT NOT NULL,
+                list_id INTEGER
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        cursor.execute("PRAGMA table_info(points)")
+        if "list_id" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE points ADD COLUMN list_id INTEGER")
+        conn.commit()
+
+    def _load(self) -> None:
+        conn = self._connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT key, value FROM meta")
+        meta = dict(cursor.fetchall())
+        cursor.execute("SELECT row, chunk_id, payload, list_id FROM points")
+        points = cursor.fetchall()
+
+        if "dimensions" not in meta:
+            return
+
+        self._dimensions = int(meta["dimensions"])
+        self._open_matrix(self._capacity_on_disk())
+        list_ids: dict[int, int] = {}
+        for matrix_row, chunk_id, payload, list_id in points:
+            self._row_by_id[chunk_id] = matrix_row
+            self._id_by_row[matrix_row] = chunk_id
+            self._payload_by_row[matrix_row] = json.loads(payload)
+            if list_id is not None:
+                list_ids[matrix_row] = list_id
+        self._row_count = max(self._id_by_row, default=-1) + 1
+        self._alive = np.zeros(self._capacity(), dtype=bool)
+        if self._id_by_row:
+            self._alive[list(self._id_by_row)] = True
+        self._free_rows = sorted(set(range(self._row_count)) - set(self._id_by_row), reverse=True)
+
+        if self.index_type == "ivf":
+            self._ivf = InvertedLists.load(self._centroids_path, self._dimensions)
+            self._ivf_trained_count = int(meta.get("ivf_trained_count", 0))
+        if self._ivf is not None:
+            self._ivf.resize(self._capacity())
+            unassigned = [row for row in self._id_by_row if row not in list_ids]
+            if list_ids:
+                rows = np.fromiter(list_ids, dtype=np.int64, count=len(list_ids))
+                labels = np.fromiter(list_ids.values(), dtype=np.int32, count=len(list_ids))
+                valid = labels < self._ivf.nlist
+                self._ivf.assignments[rows[valid]] = labels[valid]
+                unassigned.extend(rows[~valid].tolist())
+            if unassigned:
+                self._assign_rows(np.asarray(unassigned, dtype=np.int64))
+            self._ivf.rebuild(self._row_count)
+        else:
+            self._maybe_train()
+
+    def _capacity_on_disk(self) -> int:
+        if not self._vectors_path.exists() or self._dimensions is None:
+            return 0
+        return self._vectors_path.stat().st_size // (4 * self._dimensions)
+
+    def _capacity(self) -> int:
+        return 0 if self._matrix is None else self._matrix.shape[0]
+
+    def _open_matrix(self, capacity: int) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+        if capacity == 0:
+            self._matrix = None
+            return
+        with open(self._vectors_path, "ab") as handle:
+            handle.truncate(capacity * self._dimensions * 4)
+        self._matrix = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self._dimensions)
+        )
+
+    def _grow(self, required: int) -> None:
+        capacity = self._capacity()
+        if required <= capacity:
+            return
+        new_capacity = max(_INITIAL_CAPACITY, capacity)
+        while new_capacity < required:
+            new_capacity *= 2
+        self._open_matrix(new_capacity)
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[: self._alive.shape[0]] = self._alive
+        self._alive = alive
+        if self._ivf is not None:
+            self._ivf.resize(new_capacity)
+
+    def ensure_collection(self, vector_size: int) -> None:
+        with self._lock:
+            if self._dimensions is not None:
+                if self._dimensions != vector_size:
+                    raise ValueError(
+                        f"local index dimension mismatch: {self._dimensions} != {vector_size}"
+                    )
+                return
+            self._dimensions = vector_size
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('dimensions', ?)",
+                    (str(vector_size),),
+                )
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        row = self._row_count
+        self._row_count += 1
+        return row
+
+    def upsert_chunks(self, chunks: list[dict[str, Any]], vectors: Optional[Any] = None) -> None:
+        if not chunks:
+            return
+        if vectors is None:
+            vectors = [chunk["embedding"] for chunk in chunks]
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(chunks):
+            raise ValueError("vectors must be a 2-D array with one row per chunk")
+
+        with self._lock:
+            if self._dimensions is None:
+                self.ensure_collection(matrix.shape[1])
+            if matrix.shape[1] != self._dimensions:
+                raise ValueError(
+                    f"local index dimension mismatch: {self._dimensions} != {matrix.shape[1]}"
+                )
+
+            rows = []
+            for chunk in chunks:
+                row = self._row_by_id.get(chunk["chunk_id"])
+                if row is None:
+                    row = self._allocate_row()
+                    self._row_by_id[chunk["chunk_id"]] = row
+                rows.append(row)
+            self._grow(self._row_count)
+
+            row_index = np.asarray(rows, dtype=np.int64)
+            normalized = normalize_rows(matrix)
+            self._matrix[row_index] = normalized
+            self._alive[row_index] = True
+            for chunk, row in zip(chunks, rows):
+                self._id_by_row[row] = chunk["chunk_id"]
+                self._payload_by_row[row] = chunk.get("payload", {})
+            self._matrix.flush()
+
+            labels: list[Any] = [None] * len(rows)
+            if self._ivf is not None:
+                assigned = self._ivf.assign(normalized)
+                self._ivf.add(row_index, assigned)
+                labels = assigned.tolist()
+
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO points (row, chunk_id, payload, list_id)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    [
+                        (row, chunk["chunk_id"], json.dumps(chunk.get("payload", {})), label)
+                        for chunk, row, label in zip(chunks, rows, labels)
+                    ],
+                )
+
+            if self._ivf is None:
+                self._maybe_train()
+            elif len(self._row_by_id) >= self.ivf_retrain_growth * self._ivf_trained_count:
+                self._train()
+
+    def search(
+        self, query_vector: Any, top_k: int = 5, nprobe: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        with self._lock:
+            if self._matrix is None or not self._row_by_id or top_k <= 0:
+                return []
+
+            query = np.asarray(query_vector, dtype=np.float32).reshape(1, -1)
+            query = normalize_rows(query)[0]
+            if self._ivf is None:
+                candidates = np.arange(self._row_count)
+                scores = np.asarray(self._matrix[: self._row_count] @ query)
+                scores[~self._alive[: self._row_count]] = -np.inf
+                k = min(top_k, len(self._row_by_id))
+            else:
+                candidates = self._ivf.probe(query, nprobe or self.nprobe)
+                if candidates.size == 0:
+                    return []
+                scores = np.asarray(self._matrix[candidates] @ query)
+                k = min(top_k, candidates.size)
+
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [
+                {
+                    "chunk_id": self._id_by_row[int(candidates[position])],
+                    "score": float(scores[position]),
+                    "payload": dict(self._payload_by_row.get(int(candidates[position]), {})),
+                }
+                for position in top
+            ]
+
+    def delete_chunks(self, chunk_ids: list[str]) -> None:
+        with self._lock:
+            removed = []
+            removed_rows = []
+            for chunk_id in chunk_ids:
+                row = self._row_by_id.pop(chunk_id, None)
+                if row is None:
+                    continue
+                self._id_by_row.pop(row, None)
+                self._payload_by_row.pop(row, None)
+                self._alive[row] = False
+                self._free_rows.append(row)
+                removed.append((chunk_id,))
+                removed_rows.append(row)
+
+            if not removed:
+                return
+            if self._ivf is not None:
+                self._ivf.remove(np.asarray(removed_rows, dtype=np.int64))
+            conn = self._connection()
+            with conn:
+                conn.executemany("DELETE FROM points WHERE chunk_id = ?", removed)
+
+            if self._ivf is not None and self._ivf.tombstones > self.compact_ratio * max(
+                self._ivf.entries, 1
+            ):
+                self._ivf.rebuild(self._row_count)
+
+    def move_chunks(self, moves: list[dict[str, Any]]) -> list[str]:
+        if not moves:
+            return []
+
+        with self._lock:
+            chunks = []
+            rows = []
+            missing: list[str] = []
+            for move in moves:
+                row = self._row_by_id.get(move["old_chunk_id"])
+                if row is None:
+                    missing.append(move["chunk_id"])
+                    continue
+                rows.append(row)
+                chunks.append({"chunk_id": move["chunk_id"], "payload": move.get("payload", {})})
+
+            if chunks:
+                vectors = np.array(self._matrix[np.asarray(rows, dtype=np.int64)])
+                self.upsert_chunks(chunks, vectors=vectors)
+            self.delete_chunks(
+                [
+                    move["old_chunk_id"]
+                    for move in moves
+                    if move["old_chunk_id"] != move["chunk_id"]
+                ]
+            )
+            return missing
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._row_by_id)
+
+    def compact(self) -> None:
+        """Drop IVF tombstones, retraining the centroids if the index has grown."""
+        with self._lock:
+            if self._ivf is None:
+                self._maybe_train()
+            elif len(self._row_by_id) >= self.ivf_retrain_growth * self._ivf_trained_count:
+                self._train()
+            else:
+                self._ivf.rebuild(self._row_count)
+
+    def _maybe_train(self) -> None:
+        if self.index_type == "ivf" and len(self._row_by_id) >= self.ivf_min_points:
+            self._train()
+
+    def _train(self) -> None:
+        live_rows = np.flatnonzero(self._alive[: self._row_count])
+        nlist = self.nlist or max(1, int(4 * np.sqrt(live_rows.size)))
+        rng = np.random.default_rng(0)
+        sample_size = min(live_rows.size, nlist * _TRAIN_SAMPLES_PER_LIST)
+        sample = np.sort(rng.choice(live_rows, sample_size, replace=False))
+        centroids = spherical_kmeans(np.asarray(self._matrix[sample]), nlist)
+
+        self._ivf = InvertedLists(centroids)
+        self._ivf.resize(self._capacity())
+        self._assign_rows(live_rows)
+        self._ivf.rebuild(self._row_count)
+        self._ivf_trained_count = int(live_rows.size)
+        self._ivf.save(self._centroids_path)
+
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "UPDATE points SET list_id = ? WHERE row = ?",
+                zip(self._ivf.assignments[live_rows].tolist(), live_rows.tolist()),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('ivf_trained_count', ?)",
+                (str(self._ivf_trained_count),),
+            )
+
+    def _assign_rows(self, rows: np.ndarray) -> None:
+        for start in range(0, rows.size, _ASSIGN_BLOCK_ROWS):
+            block = rows[start : start + _ASSIGN_BLOCK_ROWS]
+            self._ivf.assignments[block] = self._ivf.assign(np.asarray(self._matrix[block]))
@@ -1,34 +1,140 @@
-import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Any
 
+from mind_lite.metrics import time_stage
+from mind_lite.rag.query_cache import LRUCache
+
+RETRIEVAL_MODES = ("vector", "lexical", "hybrid")
+
 
 class RetrievalService:
-    def __init__(self, sqlite_store: Any, qdrant_index: Any, embedder: Any):
+    """Answer queries with citations from dense, lexical or hybrid search.
+
+    ``hybrid`` runs the FTS5 BM25 query on a background thread while the
+    query is embedded and searched in the vector index, then merges the two
+    rankings with reciprocal-rank fusion. ``lexical`` never touches the
+    embedder, so it answers without loading the embedding model.
+
+    Query vectors are kept in an LRU cache, and citations are cached per
+    ``(mode, query, top_k)`` for ``result_cache_ttl_seconds``. The result
+    cache is cleared whenever the store's index version moves, which
+    ``IndexingService`` bumps after every run that changed the index.
+    """
+
+    def __init__(
+        self,
+        sqlite_store: Any,
+        qdrant_index: Any,
+        embedder: Any,
+        hydrate: bool = True,
+        mode: str = "vector",
+        rrf_k: int = 60,
+        candidate_multiplier: int = 4,
+        query_cache_size: int = 1024,
+        result_cache_ttl_seconds: float | None = 300.0,
+    ):
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"mode must be one of {', '.join(RETRIEVAL_MODES)}")
         self.sqlite_store = sqlite_store
         self.qdrant_index = qdrant_index
         self.embedder = embedder
+        self.hydrate = hydrate
+        self.mode = mode
+        self.rrf_k = rrf_k
+        self.candidate_multiplier = candidate_multiplier
+        self._lexical_executor: ThreadPoolExecutor | None = None
+        self._vector_cache: LRUCache | None = None
+        self._result_cache: LRUCache | None = None
+        if query_cache_size > 0:
+            self._vector_cache = LRUCache(query_cache_size)
+            self._result_cache = LRUCache(query_cache_size, ttl_seconds=result_cache_ttl_seconds)
+        self._cached_index_version: Any = None
+        self._version_lock = threading.Lock()
 
-    def _get_chunk_by_id(self, chunk_id: str) -> dict[str, Any] | None:
-        conn = sqlite3.connect(self.sqlite_store.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM chunks WHERE chunk_id = ?", (chunk_id,))
-        row = cursor.fetchone()
-        conn.close()
-
-        if row is None:
+    def _payload_chunk(self, result: dict[str, Any]) -> dict[str, Any] | None:
+        payload = result.get("payload") or {}
+        if not isinstance(payload.get("note_path"), str) or not isinstance(payload.get("content"), str):
             return None
+        return {"note_path": payload["note_path"], "content": payload["content"]}
 
-        return dict(row)
+    def _resolve_chunks(
+        self,
+        search_results: list[dict[str, Any]],
+        known: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        chunks: dict[str, dict[str, Any]] = dict(known or {})
+        if not self.hydrate:
+            for result in search_results:
+                chunk = self._payload_chunk(result)
+                if chunk is not None:
+                    chunks.setdefault(result["chunk_id"], chunk)
 
-    def retrieve(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
-        query_vector = self.embedder.embed_query(query)
-        search_results = self.qdrant_index.search(query_vector=query_vector, top_k=top_k)
+        missing = [result["chunk_id"] for result in search_results if result["chunk_id"] not in chunks]
+        if missing:
+            with time_stage("query", "hydrate"):
+                chunks.update(self.sqlite_store.get_chunks_by_ids(missing))
+        return chunks
 
+    def _embed_query(self, query: str) -> Any:
+        if self._vector_cache is None:
+            with time_stage("query", "embed_query"):
+                return self.embedder.embed_query(query)
+        query_vector = self._vector_cache.get(query)
+        if query_vector is None:
+            with time_stage("query", "embed_query"):
+                query_vector = self.embedder.embed_query(query)
+            self._vector_cache.put(query, query_vector)
+        return query_vector
+
+    def _sync_index_version(self) -> Any:
+        version = self.sqlite_store.get_index_version()
+        with self._version_lock:
+            if version != self._cached_index_version:
+                self._result_cache.clear()
+                self._cached_index_version = version
+        return version
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        if self._vector_cache is None or self._result_cache is None:
+            return {}
+        return {
+            "query_vector": self._vector_cache.stats(),
+            "retrieval_result": self._result_cache.stats(),
+        }
+
+    def _search_vector(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        query_vector = self._embed_query(query)
+        with time_stage("query", "vector_search"):
+            return self.qdrant_index.search(query_vector=query_vector, top_k=top_k)
+
+    def _search_lexical(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        with time_stage("query", "lexical_search"):
+            return self.sqlite_store.search_lexical(query, top_k=top_k)
+
+    def _get_lexical_executor(self) -> ThreadPoolExecutor:
+        if self._lexical_executor is None:
+            self._lexical_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="mind-lite-lexical"
+            )
+        return self._lexical_executor
+
+    def _fuse(self, rankings: list[list[dict[str, Any]]], top_k: int) -> list[dict[str, Any]]:
+        scores: dict[str, float] = {}
+        for ranking in rankings:
+            for rank, result in enumerate(ranking):
+                chunk_id = result["chunk_id"]
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+        ordered = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [{"chunk_id": chunk_id, "score": score} for chunk_id, score in ordered]
+
+    def _to_citations(
+        self, results: list[dict[str, Any]], chunks: dict[str, dict[str, Any]]
+    ) -> list[dict[str, Any]]:
         citations = []
-        for result in search_results:
+        for result in results:
             chunk_id = result["chunk_id"]
-            chunk = self._get_chunk_by_id(chunk_id)
+            chunk = chunks.get(chunk_id)
 
             if chunk is None:
                 continue
@@ -42,5 +148,53 @@ class RetrievalService:
                     "score": result["score"],
                 }
             )
-
         return citations
+
+    def retrieve(self, query: str, top_k: int = 5, mode: str | None = None) -> list[dict[str, Any]]:
+        mode = mode or self.mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"mode must be one of {', '.join(RETRIEVAL_MODES)}")
+
+        if self._result_cache is None:
+            return self._retrieve(query, top_k, mode)
+
+        version = self._sync_index_version()
+        key = (mode, query, top_k)
+        cached = self._result_cache.get(key)
+        if cached is None:
+            cached = self._retrieve(query, top_k, mode)
+            with self._version_lock:
+                # An index run that finished during the search has already
+                # cleared the cache; a result from the old index must not refill it.
+                if self._cached_index_version == version:
+                    self._result_cache.put(key, cached)
+        return [dict(citation) for citation in cached]
+
+    def _retrieve(self, query: str, top_k: int, mode: str) -> list[dict[str, Any]]:
+        if mode == "lexical":
+            lexical_results = self._search_lexical(query, top_k)
+            return self._to_citations(
+                lexical_results, {result["chunk_id"]: result for result in lexical_results}
+            )
+
+        if mode == "vector":
+            search_results = self._search_vector(query, top_k)
+            return self._to_citations(search_results, self._resolve_chunks(search_results))
+
+        depth = max(top_k * self.candidate_multiplier, top_k)
+        lexical_future = self._get_lexical_executor().submit(self._search_lexical, query, depth)
+        try:
+            vector_results = self._search_vector(query, depth)
+        except BaseException:
+            # Let the lexical search finish, but keep the vector error.
+            wait([lexical_future])
+            raise
+        lexical_results = lexical_future.result()
+
+        fused = self._fuse([vector_results, lexical_results], top_k)
+        fused_ids = {result["chunk_id"] for result in fused}
+        chunks = self._resolve_chunks(
+            [result for result in vector_results if result["chunk_id"] in fused_ids],
+            known={result["chunk_id"]: result for result in lexical_results},
+        )
+        return self._to_citations(fused, chunks)
@@ -1,27 +1,171 @@
+import re
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
+
+_LOOKUP_BATCH_SIZE = 500
+
+SCHEMA_VERSION = 6
+
+_CHUNK_COLUMNS = "chunk_id, note_path, chunk_index, content, start_offset, end_offset, token_count"
 
 
 class SqliteStore:
-    def __init__(self, db_path: str):
+    """Provenance store for indexed notes and their chunks.
+
+    Connections are opened in WAL mode with ``synchronous=NORMAL`` so
+    retrieval reads are not blocked by an indexing run's writes. Each call
+    checks a connection out of a pool and returns it afterwards; at most
+    ``pool_size`` idle connections are kept, so short-lived threads (one per
+    HTTP request) do not leave connections behind. Write methods run in their
+    own transaction unless they are called inside ``transaction()``, in which
+    case they join the outer one on the same connection.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        cache_size_kib: int = 65_536,
+        mmap_size: int = 268_435_456,
+        busy_timeout_ms: int = 5_000,
+        pool_size: int = 4,
+    ):
         self.db_path = db_path
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._idle: list[sqlite3.Connection] = []
+        self._open = 0
+        self._pool_lock = threading.Lock()
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-    def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+    def _open_conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            timeout=self.busy_timeout_ms / 1000,
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
         return conn
 
+    @property
+    def open_connections(self) -> int:
+        with self._pool_lock:
+            return self._open
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._pool_lock:
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+        try:
+            return self._open_conn()
+        except BaseException:
+            with self._pool_lock:
+                self._open -= 1
+            raise
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        with self._pool_lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+            self._open -= 1
+        conn.close()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """This thread's transaction connection if one is open, else one checked out of the pool."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed writes as one transaction on a connection pinned to this thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+        finally:
+            self._local.conn = None
+            self._release(conn)
+
+    def close(self) -> None:
+        """Close the idle connections; the store reopens connections on its next call."""
+        with self._pool_lock:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn in idle:
+            conn.close()
+
     def init_schema(self) -> None:
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        """Bring the database up to ``SCHEMA_VERSION``, upgrading older files in place.
+
+        The applied version is tracked in ``PRAGMA user_version``. Databases
+        created before versioning report 0 and run every migration, so each
+        migration must tolerate tables and columns that already exist.
+        """
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            for target, migration in self._migrations():
+                if version < target:
+                    migration(cursor)
+                    version = target
+            cursor.execute(f"PRAGMA user_version = {int(version)}")
+
+    def schema_version(self) -> int:
+        with self._connection() as conn:
+            return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+    def _migrations(self) -> list[tuple[int, Callable[[sqlite3.Cursor], None]]]:
+        return [
+            (1, self._create_tables),
+            (2, self._ensure_document_stat_columns),
+            (3, self._create_indexes),
+            (4, self._create_fulltext_index),
+            (5, self._create_store_meta),
+            (6, self._add_chunk_rowid_alias),
+        ]
+
+    def _create_tables(self, cursor: sqlite3.Cursor) -> None:
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS documents (
                 note_path TEXT PRIMARY KEY,
                 content_hash TEXT NOT NULL,
                 token_count INTEGER NOT NULL,
-                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                mtime_ns INTEGER,
+                size_bytes INTEGER
             )
         """)
         cursor.execute("""
@@ -47,92 +191,331 @@ class SqliteStore:
                 completed_at TIMESTAMP
             )
         """)
-        conn.commit()
-        conn.close()
+
+    def _ensure_document_stat_columns(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("PRAGMA table_info(documents)")
+        existing = {row[1] for row in cursor.fetchall()}
+        for column in ("mtime_ns", "size_bytes"):
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE documents ADD COLUMN {column} INTEGER")
+
+    def _create_indexes(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chunks_note_path
+            ON chunks (note_path, chunk_index)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ingestion_runs_started_at
+            ON ingestion_runs (started_at)
+        """)
+
+    def _create_fulltext_index(self, cursor: sqlite3.Cursor, rowid_column: str = "rowid") -> None:
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                content,
+                content = 'chunks',
+                content_rowid = '{rowid_column}'
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_insert AFTER INSERT ON chunks BEGIN
+                INSERT INTO chunks_fts (rowid, content) VALUES (new.{rowid_column}, new.content);
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_delete AFTER DELETE ON chunks BEGIN
+                INSERT INTO chunks_fts (chunks_fts, rowid, content)
+                VALUES ('delete', old.{rowid_column}, old.content);
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS chunks_fts_update AFTER UPDATE OF content ON chunks BEGIN
+                INSERT INTO chunks_fts (chunks_fts, rowid, content)
+                VALUES ('delete', old.{rowid_column}, old.content);
+                INSERT INTO chunks_fts (rowid, content) VALUES (new.{rowid_column}, new.content);
+            END
+        """)
+        cursor.execute("INSERT INTO chunks_fts (chunks_fts) VALUES ('rebuild')")
+
+    def _create_store_meta(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+
+    def _add_chunk_rowid_alias(self, cursor: sqlite3.Cursor) -> None:
+        """Rebuild ``chunks`` with an ``id INTEGER PRIMARY KEY`` for the FTS mirror to key on.
+
+        With ``chunk_id TEXT PRIMARY KEY`` the rowid is implicit and ``VACUUM``
+        may renumber it, leaving ``chunks_fts`` pointing at the wrong rows.
+        An explicit alias is stable. Existing rowids are kept as ids.
+        """
+        cursor.execute("PRAGMA table_info(chunks)")
+        if "id" in {row[1] for row in cursor.fetchall()}:
+            return
+        for trigger in ("chunks_fts_insert", "chunks_fts_delete", "chunks_fts_update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute("DROP TABLE IF EXISTS chunks_fts")
+        cursor.execute("""
+            CREATE TABLE chunks_v6 (
+                id INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL UNIQUE,
+                note_path TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                content TEXT NOT NULL,
+                start_offset INTEGER NOT NULL,
+                end_offset INTEGER NOT NULL,
+                token_count INTEGER NOT NULL,
+                FOREIGN KEY (note_path) REFERENCES documents(note_path)
+            )
+        """)
+        cursor.execute(f"INSERT INTO chunks_v6 (id, {_CHUNK_COLUMNS}) SELECT rowid, {_CHUNK_COLUMNS} FROM chunks")
+        cursor.execute("DROP TABLE chunks")
+        cursor.execute("ALTER TABLE chunks_v6 RENAME TO chunks")
+        self._create_indexes(cursor)
+        self._create_fulltext_index(cursor, rowid_column="id")
+
+    def get_index_version(self) -> int:
+        with self._connection() as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = 'index_version'").fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def bump_index_version(self) -> int:
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO store_meta (key, value) VALUES ('index_version', 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1
+                """
+            )
+            return self.get_index_version()
 
     def upsert_document(
-        self, note_path: str, content_hash: str, token_count: int
+        self,
+        note_path: str,
+        content_hash: str,
+        token_count: int,
+        mtime_ns: int | None = None,
+        size_bytes: int | None = None,
     ) -> None:
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO documents (note_path, content_hash, token_count)
-            VALUES (?, ?, ?)
-            ON CONFLICT(note_path) DO UPDATE SET
-                content_hash = excluded.content_hash,
-                token_count = excluded.token_count,
-                indexed_at = CURRENT_TIMESTAMP
-            """,
-            (note_path, content_hash, token_count),
-        )
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO documents (note_path, content_hash, token_count, mtime_ns, size_bytes)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(note_path) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    token_count = excluded.token_count,
+                    mtime_ns = excluded.mtime_ns,
+                    size_bytes = excluded.size_bytes,
+                    indexed_at = CURRENT_TIMESTAMP
+                """,
+                (note_path, content_hash, token_count, mtime_ns, size_bytes),
+            )
+
+    def touch_document(self, note_path: str, mtime_ns: int, size_bytes: int) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE documents SET mtime_ns = ?, size_bytes = ? WHERE note_path = ?",
+                (mtime_ns, size_bytes, note_path),
+            )
+
+    def get_document_fingerprints(self) -> dict[str, dict[str, Any]]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT note_path, content_hash, mtime_ns, size_bytes FROM documents"
+            ).fetchall()
+
+        return {
+            row[0]: {
+                "content_hash": row[1],
+                "mtime_ns": row[2],
+                "size_bytes": row[3],
+            }
+            for row in rows
+        }
 
     def replace_chunks_for_document(
         self, note_path: str, chunks: list[dict[str, Any]]
     ) -> None:
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
-            "DELETE FROM chunks WHERE note_path = ?",
-            (note_path,),
-        )
-        for chunk in chunks:
+        with self.transaction() as conn:
+            cursor = conn.cursor()
             cursor.execute(
+                "DELETE FROM chunks WHERE note_path = ?",
+                (note_path,),
+            )
+            cursor.executemany(
                 """
                 INSERT INTO chunks
                     (chunk_id, note_path, chunk_index, content, start_offset, end_offset, token_count)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    chunk["chunk_id"],
-                    chunk["note_path"],
-                    chunk["chunk_index"],
-                    chunk["content"],
-                    chunk["start_offset"],
-                    chunk["end_offset"],
-                    chunk["token_count"],
-                ),
+                [
+                    (
+                        chunk["chunk_id"],
+                        chunk["note_path"],
+                        chunk["chunk_index"],
+                        chunk["content"],
+                        chunk["start_offset"],
+                        chunk["end_offset"],
+                        chunk["token_count"],
+                    )
+                    for chunk in chunks
+                ],
             )
-        conn.commit()
-        conn.close()
+
+    def get_chunk_ids_for_document(self, note_path: str) -> list[str]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT chunk_id FROM chunks WHERE note_path = ? ORDER BY chunk_index",
+                (note_path,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_chunks_for_document(self, note_path: str) -> list[dict[str, Any]]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {_CHUNK_COLUMNS} FROM chunks WHERE note_path = ? ORDER BY chunk_index",
+                (note_path,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_chunks_by_ids(self, chunk_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch chunk rows keyed by chunk_id with batched ``IN (...)`` lookups."""
+        unique_ids = list(dict.fromkeys(chunk_ids))
+        chunks: dict[str, dict[str, Any]] = {}
+        if not unique_ids:
+            return chunks
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(unique_ids), _LOOKUP_BATCH_SIZE):
+                batch = unique_ids[start : start + _LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                cursor.execute(f"SELECT {_CHUNK_COLUMNS} FROM chunks WHERE chunk_id IN ({placeholders})", batch)
+                for row in cursor.fetchall():
+                    chunks[row["chunk_id"]] = dict(row)
+        return chunks
+
+    def search_lexical(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
+        """BM25-ranked chunks matching any whitespace-separated term of ``query``.
+
+        Each term is matched as a quoted FTS5 phrase, so identifiers such as
+        ``ATLAS-42`` or ``#project`` are searched literally instead of being
+        parsed as query syntax. Scores are negated BM25, higher is better.
+        """
+        terms = [term.replace('"', '""') for term in query.split() if re.search(r"\w", term)]
+        if not terms or top_k <= 0:
+            return []
+
+        match = " OR ".join(f'"{term}"' for term in terms)
+        with self._connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT chunks.chunk_id, chunks.note_path, chunks.content, bm25(chunks_fts) AS rank
+                FROM chunks_fts
+                JOIN chunks ON chunks.id = chunks_fts.rowid
+                WHERE chunks_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (match, top_k),
+            ).fetchall()
+        return [
+            {
+                "chunk_id": row["chunk_id"],
+                "note_path": row["note_path"],
+                "content": row["content"],
+                "score": -float(row["rank"]),
+            }
+            for row in rows
+        ]
+
+    def delete_documents(self, note_paths: list[str]) -> list[str]:
+        if not note_paths:
+            return []
+
+        deleted_chunk_ids: list[str] = []
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            for start in range(0, len(note_paths), _LOOKUP_BATCH_SIZE):
+                batch = note_paths[start : start + _LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                cursor.execute(
+                    f"""
+                    SELECT chunk_id FROM chunks WHERE note_path IN ({placeholders})
+                    ORDER BY note_path, chunk_index
+                    """,
+                    batch,
+                )
+                deleted_chunk_ids.extend(row[0] for row in cursor.fetchall())
+                cursor.execute(f"DELETE FROM chunks WHERE note_path IN ({placeholders})", batch)
+                cursor.execute(f"DELETE FROM documents WHERE note_path IN ({placeholders})", batch)
+        return deleted_chunk_ids
+
+    def rename_document(
+        self,
+        old_path: str,
+        new_path: str,
+        chunk_id_map: dict[str, str],
+        mtime_ns: int | None = None,
+        size_bytes: int | None = None,
+    ) -> None:
+        with self.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO documents
+                    (note_path, content_hash, token_count, indexed_at, mtime_ns, size_bytes)
+                SELECT ?, content_hash, token_count, CURRENT_TIMESTAMP, ?, ?
+                FROM documents WHERE note_path = ?
+                """,
+                (new_path, mtime_ns, size_bytes, old_path),
+            )
+            cursor.execute("DELETE FROM chunks WHERE note_path = ?", (new_path,))
+            cursor.executemany(
+                "UPDATE chunks SET chunk_id = ?, note_path = ? WHERE chunk_id = ?",
+                [
+                    (new_chunk_id, new_path, old_chunk_id)
+                    for old_chunk_id, new_chunk_id in chunk_id_map.items()
+                ],
+            )
+            cursor.execute("DELETE FROM chunks WHERE note_path = ?", (old_path,))
+            cursor.execute("DELETE FROM documents WHERE note_path = ?", (old_path,))
 
     def record_ingestion_run(
         self, run_type: str, files_indexed: int, chunks_created: int, status: str
     ) -> None:
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO ingestion_runs (run_type, files_indexed, chunks_created, status)
-            VALUES (?, ?, ?, ?)
-            """,
-            (run_type, files_indexed, chunks_created, status),
-        )
-        conn.commit()
-        conn.close()
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO ingestion_runs (run_type, files_indexed, chunks_created, status)
+                VALUES (?, ?, ?, ?)
+                """,
+                (run_type, files_indexed, chunks_created, status),
+            )
 
     def get_status_summary(self) -> dict[str, Any]:
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) FROM documents")
-        documents_count = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM chunks")
-        chunks_count = cursor.fetchone()[0]
-
-        cursor.execute(
-            """
-            SELECT run_type, files_indexed, chunks_created, status, started_at
-            FROM ingestion_runs
-            ORDER BY started_at DESC
-            LIMIT 1
-            """
-        )
-        last_run_row = cursor.fetchone()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT COUNT(*) FROM documents")
+            documents_count = cursor.fetchone()[0]
+
+            cursor.execute("SELECT COUNT(*) FROM chunks")
+            chunks_count = cursor.fetchone()[0]
+
+            cursor.execute(
+                """
+                SELECT run_type, files_indexed, chunks_created, status, started_at
+                FROM ingestion_runs
+                ORDER BY started_at DESC
+                LIMIT 1
+                """
+            )
+            last_run_row = cursor.fetchone()
 
         last_run = None
         if last_run_row:
@@ -15,7 +15,18 @@ class QdrantIndex:
                 vectors_config=VectorParams(size=vector_size, distance="Cosine"),
             )
 
-    def upsert_chunks(self, chunks: list[dict[str, Any]]) -> None:
+    def upsert_chunks(self, chunks: list[dict[str, Any]], vectors: Optional[Any] = None) -> None:
+        if vectors is not None:
+            self.client.upload_collection(
+                collection_name=self.collection_name,
+                vectors=vectors,
+                payload=[chunk.get("payload", {}) for chunk in chunks],
+                ids=[chunk["chunk_id"] for chunk in chunks],
+                batch_size=max(len(chunks), 1),
+                wait=True,
+            )
+            return
+
         from qdrant_client.models import PointStruct
 
         points = []
@@ -54,3 +65,57 @@ class QdrantIndex:
             collection_name=self.collection_name,
             points_selector=PointIdsList(points=chunk_ids),
         )
+
+    def move_chunks(self, moves: list[dict[str, Any]]) -> list[str]:
+        if not moves:
+            return []
+
+        from qdrant_client.models import PointStruct
+
+        old_ids = [move["old_chunk_id"] for move in moves]
+        records = self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=old_ids,
+            with_vectors=True,
+            with_payload=False,
+        )
+        vectors_by_id = {record.id: record.vector for record in records}
+
+        points = []
+        missing: list[str] = []
+        for move in moves:
+            vector = vectors_by_id.get(move["old_chunk_id"])
+            if vector is None:
+                missing.append(move["chunk_id"])
+                continue
+            points.append(
+                PointStruct(
+                    id=move["chunk_id"],
+                    vector=vector,
+                    payload=move.get("payload", {}),
+                )
+            )
+
+        if points:
+            self.client.upsert(collection_name=self.collection_name, points=points)
+        self.delete_chunks(old_ids)
+        return missing
+
+
+def create_vector_index(cfg: Any) -> Any:
+    if cfg.vector_backend == "local":
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        return LocalVectorIndex(
+            cfg.local_index_path,
+            collection_name=cfg.collection_name,
+            index_type=cfg.local_index_type,
+            nlist=cfg.ivf_nlist,
+            nprobe=cfg.ivf_nprobe,
+        )
+    if cfg.vector_backend == "qdrant":
+        from qdrant_client import QdrantClient
+
+        client = QdrantClient(url=cfg.qdrant_url)
+        return QdrantIndex(client=client, collection_name=cfg.collection_name)
+    raise ValueError(f"unsupported vector backend: {cfg.vector_backend}")
@@ -5,6 +5,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 from mind_lite.api.service import ApiService
+from mind_lite.api.state_store import StateStore
 
 
 class ApiServiceTests(unittest.TestCase):
@@ -22,6 +23,41 @@ class ApiServiceTests(unittest.TestCase):
         self.assertIn("mind_lite_runs_total", metrics)
         self.assertIn("mind_lite_proposals_total", metrics)
 
+    def test_metrics_proposal_gauge_is_maintained_as_proposals_change(self):
+        service = ApiService()
+        service._store_proposals("run_0001", [{"proposal_id": "p1"}, {"proposal_id": "p2"}])
+        service._store_proposals("run_0002", [{"proposal_id": "p3"}])
+        service._store_proposals("run_0001", [{"proposal_id": "p1"}])
+
+        self.assertEqual(service._proposal_count, 2)
+        self.assertIn("mind_lite_proposals_total 2", service.metrics())
+
+    def test_metrics_include_shared_registry(self):
+        service = ApiService()
+
+        metrics = service.metrics()
+
+        self.assertIn("# TYPE mind_lite_http_request_duration_seconds histogram", metrics)
+        self.assertIn("# TYPE mind_lite_stage_duration_seconds histogram", metrics)
+        self.assertIn("# TYPE mind_lite_llm_requests_total counter", metrics)
+
+    def test_metrics_include_rag_cache_stats_when_retrieval_is_ready(self):
+        from unittest.mock import MagicMock
+
+        from mind_lite.rag.retrieval import RetrievalService
+
+        service = ApiService()
+        self.assertNotIn("mind_lite_rag_cache_hits_total", service.metrics())
+
+        service._rag_retrieval = RetrievalService(
+            sqlite_store=MagicMock(), qdrant_index=MagicMock(), embedder=MagicMock()
+        )
+        service._rag_retrieval._result_cache.get(("vector", "q", 5))
+
+        metrics = service.metrics()
+        self.assertIn('mind_lite_rag_cache_misses_total{cache="retrieval_result"} 1', metrics)
+        self.assertIn('mind_lite_rag_cache_entries{cache="query_vector"} 0', metrics)
+
     def test_metrics_include_publish_queue_and_published_counts(self):
         service = ApiService()
         service.mark_for_gom(
@@ -187,7 +223,7 @@ class ApiServiceTests(unittest.TestCase):
             ],
         )
 
-    def test_get_run_returns_defensive_copy_for_nested_state(self):
+    def test_get_run_returns_read_only_nested_state(self):
         service = ApiService()
         with tempfile.TemporaryDirectory() as temp_dir:
             root = Path(temp_dir)
@@ -198,7 +234,8 @@ class ApiServiceTests(unittest.TestCase):
             fetched = service.get_run(run["run_id"])
             original_count = fetched["profile"]["note_count"]
 
-            fetched["profile"]["note_count"] = 999
+            with self.assertRaisesRegex(TypeError, "read-only"):
+                fetched["profile"]["note_count"] = 999
             reread = service.get_run(run["run_id"])
 
             self.assertEqual(reread["profile"]["note_count"], original_count)
@@ -436,12 +473,14 @@ class ApiServiceTests(unittest.TestCase):
                 ["run_0002", "run_0003"],
             )
 
-            payload = json.loads(state_file.read_text(encoding="utf-8"))
-            self.assertEqual(payload["run_counter"], 3)
+            store = StateStore(root / "state.db")
+            self.assertFalse(state_file.exists())
+            self.assertEqual(store.get_meta("run_counter"), 3)
             self.assertEqual(
-                sorted(payload["runs"].keys()),
+                sorted(run_id for run_id, _ in store.load("runs")),
                 ["run_0001", "run_0002", "run_0003"],
             )
+            store.close()
 
             reloaded = ApiService(state_file=str(state_file))
             runs = reloaded.list_runs()["runs"]
@@ -511,7 +550,7 @@ class ApiServiceTests(unittest.TestCase):
             (root / "atlas.md").write_text("# Atlas", encoding="utf-8")
             run = service.analyze_folder({"folder_path": str(root), "mode": "analyze"})
 
-        service._runs[run["run_id"]]["state"] = "analyzing"
+        service._runs[run["run_id"]] = {**service._runs[run["run_id"]], "state": "analyzing"}
         with self.assertRaisesRegex(ValueError, "run state"):
             service.approve_run(run["run_id"], {"change_types": ["tag_enrichment"]})
 
@@ -607,7 +646,36 @@ class ApiServiceTests(unittest.TestCase):
             self.assertEqual(len(approved_only["proposals"]), 1)
             self.assertEqual(approved_only["proposals"][0]["status"], "approved")
 
-    def test_get_run_proposals_returns_defensive_copy_for_nested_state(self):
+    def test_get_run_proposals_pages_and_filters_by_change_type(self):
+        service = ApiService()
+        service._generate_note_candidate_response = lambda note, prompt: (
+            '{"proposals":['
+            f'{{"note_id":"{note["note_id"]}","change_type":"tag_enrichment",'
+            '"risk_tier":"low","confidence":0.91,"details":{}},'
+            f'{{"note_id":"{note["note_id"]}","change_type":"link_add",'
+            '"risk_tier":"medium","confidence":0.72,"details":{}}]}'
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            for name in ("a", "b", "c"):
+                (root / f"{name}.md").write_text(f"# {name}", encoding="utf-8")
+            run_id = service.analyze_folder({"folder_path": str(root), "mode": "analyze"})["run_id"]
+
+        links = service.get_run_proposals(run_id, {"change_type": "link_add"})
+        self.assertEqual(len(links["proposals"]), 3)
+        self.assertIsNone(links["next_cursor"])
+
+        first = service.get_run_proposals(run_id, {"change_type": "link_add", "limit": "2"})
+        rest = service.get_run_proposals(
+            run_id, {"change_type": "link_add", "limit": "2", "cursor": first["next_cursor"]}
+        )
+        self.assertEqual(first["proposals"] + rest["proposals"], links["proposals"])
+        self.assertIsNone(rest["next_cursor"])
+
+        with self.assertRaisesRegex(ValueError, "unknown proposal cursor: missing"):
+            service.get_run_proposals(run_id, {"cursor": "missing"})
+
+    def test_get_run_proposals_returns_read_only_nested_state(self):
         service = ApiService()
 
         def stub_note_llm_response(note: dict, prompt: str) -> str:
@@ -627,7 +695,8 @@ class ApiServiceTests(unittest.TestCase):
             proposals = service.get_run_proposals(run["run_id"])
             self.assertEqual(len(proposals["proposals"]), 1)
 
-            proposals["proposals"][0]["details"]["reason"] = "mutated"
+            with self.assertRaisesRegex(TypeError, "read-only"):
+                proposals["proposals"][0]["details"]["reason"] = "mutated"
             reread = service.get_run_proposals(run["run_id"])
 
             self.assertEqual(reread["proposals"][0]["details"]["reason"], "add_missing_tags")
@@ -822,7 +891,111 @@ class ApiServiceTests(unittest.TestCase):
             self.assertEqual(len(filtered["runs"]), 1)
             self.assertEqual(filtered["runs"][0]["run_id"], second["run_id"])
 
-    def test_list_runs_returns_defensive_copy_for_nested_state(self):
+    def test_list_runs_pages_with_cursor_and_order(self):
+        service = ApiService()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            run_ids = [
+                service.analyze_folder({"folder_path": str(root), "mode": "analyze"})["run_id"]
+                for _ in range(5)
+            ]
+
+        first = service.list_runs({"limit": "2"})
+        self.assertEqual([run["run_id"] for run in first["runs"]], run_ids[:2])
+        self.assertEqual(first["next_cursor"], run_ids[1])
+
+        second = service.list_runs({"limit": 2, "cursor": first["next_cursor"]})
+        third = service.list_runs({"limit": 2, "cursor": second["next_cursor"]})
+        self.assertEqual([run["run_id"] for run in second["runs"]], run_ids[2:4])
+        self.assertEqual([run["run_id"] for run in third["runs"]], run_ids[4:])
+        self.assertIsNone(third["next_cursor"])
+
+        newest = service.list_runs({"limit": 2, "order": "desc"})
+        self.assertEqual([run["run_id"] for run in newest["runs"]], [run_ids[4], run_ids[3]])
+        older = service.list_runs({"limit": 2, "order": "desc", "cursor": newest["next_cursor"]})
+        self.assertEqual([run["run_id"] for run in older["runs"]], [run_ids[2], run_ids[1]])
+
+        with self.assertRaisesRegex(ValueError, "limit must be an integer between 1 and 500"):
+            service.list_runs({"limit": "0"})
+        with self.assertRaisesRegex(ValueError, "order must be asc or desc"):
+            service.list_runs({"order": "newest"})
+
+    def test_list_runs_without_limit_returns_every_run(self):
+        service = ApiService()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            for _ in range(105):
+                service.analyze_folder({"folder_path": str(root), "mode": "analyze"})
+
+        history = service.list_runs({"order": "desc"})
+
+        self.assertEqual(len(history["runs"]), 105)
+        self.assertEqual(history["runs"][0]["run_id"], "run_0105")
+        self.assertIsNone(history["next_cursor"])
+
+    def test_list_runs_state_index_follows_transitions(self):
+        service = ApiService()
+        service._generate_note_candidate_response = lambda note, prompt: (
+            '{"proposals":[{"note_id":"a","change_type":"tag_enrichment",'
+            '"risk_tier":"low","confidence":0.91,"details":{"reason":"add_missing_tags"}}]}'
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            run = service.analyze_folder({"folder_path": str(root), "mode": "analyze"})
+
+        self.assertEqual(len(service.list_runs({"state": "ready_safe_auto"})["runs"]), 1)
+        service.approve_run(run["run_id"], {})
+
+        self.assertEqual(service.list_runs({"state": "ready_safe_auto"})["runs"], [])
+        self.assertEqual(service._run_ids_by_state["approved"], [run["run_id"]])
+        self.assertEqual(service._proposal_positions_by_status[run["run_id"]], {"approved": [0]})
+
+    def test_list_runs_filters_by_creation_time(self):
+        service = ApiService()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            with patch("mind_lite.api.service._now", return_value="2026-01-01T00:00:00+00:00"):
+                early = service.analyze_folder({"folder_path": str(root), "mode": "analyze"})
+            with patch("mind_lite.api.service._now", return_value="2026-03-01T00:00:00+00:00"):
+                late = service.analyze_folder({"folder_path": str(root), "mode": "analyze"})
+
+        after = service.list_runs({"created_after": "2026-02-01T00:00:00Z"})
+        before = service.list_runs({"created_before": "2026-02-01"})
+        self.assertEqual([run["run_id"] for run in after["runs"]], [late["run_id"]])
+        self.assertEqual([run["run_id"] for run in before["runs"]], [early["run_id"]])
+        with self.assertRaisesRegex(ValueError, "created_after must be an ISO 8601 timestamp"):
+            service.list_runs({"created_after": "last week"})
+
+    def test_list_runs_orders_run_ids_numerically_and_bisects_the_time_window(self):
+        from mind_lite.api import pagination
+
+        service = ApiService()
+        service._run_counter = 9990
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            for day in range(1, 21):
+                with patch("mind_lite.api.service._now", return_value=f"2026-01-{day:02d}T00:00:00+00:00"):
+                    service.analyze_folder({"folder_path": str(root), "mode": "analyze"})
+
+        newest = service.list_runs({"order": "desc", "limit": 3})
+        self.assertEqual([run["run_id"] for run in newest["runs"]], ["run_10010", "run_10009", "run_10008"])
+
+        with patch(
+            "mind_lite.api.service.parse_timestamp", wraps=pagination.parse_timestamp
+        ) as parse_timestamp:
+            window = service.list_runs(
+                {"created_after": "2026-01-08T12:00:00Z", "created_before": "2026-01-12", "order": "desc"}
+            )
+
+        self.assertEqual([run["run_id"] for run in window["runs"]], ["run_10001", "run_10000", "run_9999"])
+        self.assertLess(parse_timestamp.call_count, 15)
+
+    def test_list_runs_returns_read_only_nested_state(self):
         service = ApiService()
         with tempfile.TemporaryDirectory() as temp_dir:
             root = Path(temp_dir)
@@ -833,7 +1006,8 @@ class ApiServiceTests(unittest.TestCase):
             listed = service.list_runs()
             original_count = listed["runs"][0]["profile"]["note_count"]
 
-            listed["runs"][0]["profile"]["note_count"] = 123
+            with self.assertRaisesRegex(TypeError, "read-only"):
+                listed["runs"][0]["profile"]["note_count"] = 123
             reread = service.get_run(run["run_id"])
 
             self.assertEqual(reread["profile"]["note_count"], original_count)
@@ -1088,6 +1262,53 @@ class ApiServiceTests(unittest.TestCase):
         self.assertTrue(second["idempotency"]["duplicate"])
         self.assertEqual(second["answer"]["text"], first["answer"]["text"])
 
+    def test_ask_stream_sends_citations_then_tokens_then_trace(self):
+        service = ApiService()
+        events = iter(
+            [
+                {"type": "token", "content": "Focus "},
+                {"type": "token", "content": "on Atlas."},
+                {
+                    "type": "done",
+                    "success": True,
+                    "content": "Focus on Atlas.",
+                    "provider": "lmstudio",
+                    "model": "local",
+                },
+            ]
+        )
+
+        with patch("mind_lite.llm.stream_answer", return_value=events):
+            stream = list(service.ask_stream({"query": "What should I work on?"}))
+
+        self.assertEqual([e["event"] for e in stream], ["citations", "token", "token", "trace"])
+        self.assertEqual(stream[0]["data"]["citations"], [])
+        self.assertEqual(stream[1]["data"], {"text": "Focus "})
+        trace = stream[-1]["data"]
+        self.assertEqual(trace["answer"]["text"], "Focus on Atlas.")
+        self.assertTrue(trace["llm_trace"]["success"])
+        self.assertIn("provider_trace", trace)
+
+    def test_ask_stream_validates_before_streaming(self):
+        service = ApiService()
+
+        with self.assertRaises(ValueError):
+            service.ask_stream({"query": ""})
+
+    def test_ask_with_event_id_of_an_abandoned_stream_is_answered_again(self):
+        service = ApiService()
+
+        stream = service.ask_stream({"query": "hello", "event_id": "evt-1"})
+        self.assertEqual(next(stream)["event"], "citations")
+        stream.close()
+
+        retried = service.ask({"query": "hello", "event_id": "evt-1"})
+        replayed = service.ask({"query": "hello", "event_id": "evt-1"})
+
+        self.assertFalse(retried["idempotency"]["duplicate"])
+        self.assertTrue(replayed["idempotency"]["duplicate"])
+        self.assertEqual(replayed["answer"], retried["answer"])
+
     def test_ask_blocks_cloud_fallback_when_sensitivity_fails(self):
         service = ApiService()
 
@@ -1866,6 +2087,465 @@ class ApiServiceStatePersistenceTests(unittest.TestCase):
             self.assertEqual(replayed["artifact"], first["artifact"])
 
 
+
+    def test_imports_legacy_json_state_file_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            state_file = root / "state.json"
+            state_file.write_text(
+                json.dumps(
+                    {
+                        "run_counter": 1,
+                        "runs": {"run_0001": {"run_id": "run_0001", "state": "awaiting_review"}},
+                        "proposals": {"run_0001": []},
+                        "revision_queue": [{"draft_id": "d1"}, {"draft_id": "d2"}],
+                        "ask_replay": {"evt_1": {"answer": {"text": "cached"}}},
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+            imported = ApiService(state_file=str(state_file))
+            self.assertEqual(imported.get_run("run_0001")["state"], "awaiting_review")
+            state_file.write_text("{}", encoding="utf-8")
+
+            reloaded = ApiService(state_file=str(state_file))
+            self.assertEqual(reloaded.get_run("run_0001")["state"], "awaiting_review")
+            self.assertEqual(
+                [item["draft_id"] for item in reloaded.list_revision_queue()["items"]],
+                ["d1", "d2"],
+            )
+            self.assertEqual(reloaded._ask_response_by_event["evt_1"]["answer"]["text"], "cached")
+            self.assertEqual(reloaded._next_run_id()[0], "run_0002")
+
+    def test_mutations_write_only_the_entities_they_touch(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            service = ApiService(state_file=str(root / "state.json"))
+            for index in range(3):
+                service.mark_for_revision(
+                    {"draft_id": f"draft_{index}", "title": "T", "prepared_content": "C"}
+                )
+
+            with patch.object(StateStore, "put", autospec=True, side_effect=StateStore.put) as put:
+                service.mark_for_revision({"draft_id": "draft_3", "title": "T", "prepared_content": "C"})
+
+            self.assertEqual([call.args[1:3] for call in put.call_args_list], [("revision_queue", "3")])
+
+    def test_confirmed_draft_leaves_persisted_gom_queue(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = Path(temp_dir) / "state.json"
+            service = ApiService(state_file=str(state_file))
+            for draft_id in ("draft_a", "draft_b", "draft_c"):
+                service.mark_for_gom({"draft_id": draft_id, "title": "T", "prepared_content": "C"})
+            service.confirm_gom({"draft_id": "draft_b", "published_url": "https://gom.example/b"})
+
+            reloaded = ApiService(state_file=str(state_file))
+
+        self.assertEqual(
+            [item["draft_id"] for item in reloaded.list_gom_queue()["items"]],
+            ["draft_a", "draft_c"],
+        )
+        self.assertEqual(reloaded.list_published()["items"][0]["draft_id"], "draft_b")
+
+
+def _wait_for_job(service, job_id, states=("completed", "failed", "cancelled"), timeout=5.0):
+    import time
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = service.get_job(job_id)
+        if job["state"] in states:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id} did not finish: {service.get_job(job_id)}")
+
+
+class ApiServiceJobTests(unittest.TestCase):
+    def test_submit_job_validates_type_and_payload_before_queueing(self):
+        service = ApiService()
+
+        with self.assertRaisesRegex(ValueError, "type must be one of"):
+            service.submit_job({"type": "reindex_everything", "payload": {}})
+        with self.assertRaisesRegex(ValueError, "vault_path is required"):
+            service.submit_job({"type": "rag_index_vault", "payload": {}})
+        with self.assertRaisesRegex(ValueError, "note_id is required"):
+            service.submit_job({"type": "organize_classify", "payload": {"notes": [{}]}})
+
+        self.assertEqual(service.list_jobs()["count"], 0)
+
+    def test_classify_job_matches_synchronous_results(self):
+        service = ApiService()
+        payload = {"notes": [{"note_id": "n1", "title": "Atlas"}, {"note_id": "n2", "title": "Misc"}]}
+
+        with patch(
+            "mind_lite.organize.classify_llm.classify_note",
+            return_value={"primary": "project", "secondary": [], "confidence": 0.9},
+        ):
+            job = service.submit_job({"type": "organize_classify", "payload": payload})
+            done = _wait_for_job(service, job["job_id"])
+            expected = service.organize_classify(payload)
+
+        self.assertEqual(done["state"], "completed")
+        self.assertEqual(done["result"], expected)
+        self.assertEqual(done["progress"]["completed"], 2)
+        self.assertEqual(done["progress"]["total"], 2)
+
+    def test_index_vault_job_reports_indexing_progress(self):
+        from unittest.mock import MagicMock
+
+        service = ApiService()
+
+        def index_vault(vault_path, incremental, progress):
+            progress({"files_done": 1, "files_total": 2, "chunks_embedded": 5})
+            progress({"files_done": 2, "files_total": 2, "chunks_embedded": 9})
+            return {"files_indexed": 2}
+
+        service._rag_sqlite_store = MagicMock()
+        service._rag_embedder = MagicMock()
+        service._rag_qdrant_index = MagicMock()
+        service._rag_retrieval = MagicMock()
+        service._rag_indexing = MagicMock()
+        service._rag_indexing.index_vault.side_effect = index_vault
+
+        job = service.submit_job({"type": "rag_index_vault", "payload": {"vault_path": "/vault"}})
+        done = _wait_for_job(service, job["job_id"])
+
+        self.assertEqual(done["result"], {"files_indexed": 2})
+        self.assertEqual(done["progress"]["completed"], 2)
+        self.assertEqual(done["progress"]["chunks_embedded"], 9)
+
+    def test_cancelled_index_job_removes_the_vectors_it_upserted(self):
+        import threading
+        from unittest.mock import MagicMock
+
+        from mind_lite.bench.fakes import HashEmbedder
+        from mind_lite.rag.indexing import IndexingService
+        from mind_lite.rag.local_index import LocalVectorIndex
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            vault = root / "vault"
+            vault.mkdir()
+            for index in range(6):
+                (vault / f"note{index}.md").write_text(f"Note {index} about topic {index}.", encoding="utf-8")
+            store = SqliteStore(str(root / "rag.db"))
+            store.init_schema()
+            vectors = LocalVectorIndex(str(root / "vectors"), index_type="flat")
+            vectors.ensure_collection(vector_size=32)
+            embedder = HashEmbedder(dimensions=32)
+
+            reached, release = threading.Event(), threading.Event()
+            calls = []
+            embed = embedder.embed_texts_array
+
+            def embed_and_pause(texts, normalize=False):
+                calls.append(texts)
+                if len(calls) == 4:
+                    reached.set()
+                    release.wait(5)
+                return embed(texts, normalize=normalize)
+
+            embedder.embed_texts_array = embed_and_pause
+            service = ApiService()
+            service._rag_sqlite_store = store
+            service._rag_embedder = embedder
+            service._rag_qdrant_index = vectors
+            service._rag_retrieval = MagicMock()
+            service._rag_indexing = IndexingService(store, vectors, embedder, embed_batch_size=1)
+
+            job = service.submit_job({"type": "rag_index_vault", "payload": {"vault_path": str(vault)}})
+            self.assertTrue(reached.wait(5))
+            self.assertEqual(vectors.count(), 3)
+            service.cancel_job(job["job_id"])
+            release.set()
+            cancelled = _wait_for_job(service, job["job_id"])
+
+            self.assertEqual(cancelled["state"], "cancelled")
+            self.assertEqual(store.get_document_fingerprints(), {})
+            self.assertEqual(vectors.count(), 0)
+
+            service.resume_job(job["job_id"])
+            resumed = _wait_for_job(service, job["job_id"])
+            store.close()
+
+        self.assertEqual(resumed["state"], "completed")
+        self.assertEqual(resumed["result"]["files_indexed"], 6)
+        self.assertEqual(vectors.count(), 6)
+
+    def test_analyze_folders_job_continues_its_checkpointed_run(self):
+        from unittest.mock import MagicMock
+
+        service = ApiService()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            folder_one = root / "one"
+            folder_two = root / "two"
+            folder_one.mkdir()
+            folder_two.mkdir()
+            (folder_one / "a.md").write_text("# A", encoding="utf-8")
+            (folder_two / "b.md").write_text("# B", encoding="utf-8")
+            folder_paths = [str(folder_one), str(folder_two)]
+
+            run = service._start_batch_run(folder_paths)
+            run["batches"].append(
+                {
+                    "batch_id": "batch_0001",
+                    "folder_path": str(folder_one),
+                    "run_id": None,
+                    "state": "awaiting_review",
+                    "proposal_count": 0,
+                    "diagnostics_count": 0,
+                    "snapshot_id": None,
+                }
+            )
+            run["batch_completed"] = 1
+            service._store_run(run)
+            job = MagicMock()
+            job.checkpoint = {"run_id": run["run_id"]}
+
+            with patch.object(service, "_analyze_folder_run", wraps=service._analyze_folder_run) as analyze:
+                result = service._run_analyze_folders_job({"folder_paths": folder_paths}, job)
+
+        self.assertEqual(result["run_id"], run["run_id"])
+        self.assertEqual([call.args[0] for call in analyze.call_args_list], [str(folder_two)])
+        self.assertEqual(service.get_run(run["run_id"])["batch_completed"], 2)
+        job.report_progress.assert_called_once_with(2, 2)
+
+    def test_interrupted_classify_job_resumes_after_restart(self):
+        import threading
+        import time
+
+        release = threading.Event()
+        calls = []
+
+        def classify(note):
+            calls.append(note["note_id"])
+            if note["note_id"] == "n2" and calls.count("n2") == 1:
+                release.wait(5)
+            return {"primary": "area", "secondary": [], "confidence": 0.6}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_file = Path(temp_dir) / "state.json"
+            payload = {"notes": [{"note_id": "n1"}, {"note_id": "n2"}]}
+
+            with patch("mind_lite.organize.classify_llm.classify_note", side_effect=classify):
+                first = ApiService(state_file=str(state_file), job_persist_interval_seconds=0.0)
+                job = first.submit_job({"type": "organize_classify", "payload": payload})
+                while calls.count("n2") == 0:
+                    time.sleep(0.005)
+
+                restarted = ApiService(state_file=str(state_file))
+                done = _wait_for_job(restarted, job["job_id"])
+                release.set()
+                _wait_for_job(first, job["job_id"])
+
+        self.assertEqual(done["state"], "completed")
+        self.assertEqual(done["resumed_count"], 1)
+        self.assertEqual([item["note_id"] for item in done["result"]["results"]], ["n1", "n2"])
+        self.assertEqual(calls, ["n1", "n2", "n2"])
+
+
+class ApiServiceConcurrencyTests(unittest.TestCase):
+    """Hammer one ``ApiService`` from many threads, as ``ThreadingHTTPServer`` does."""
+
+    def setUp(self):
+        import sys
+
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        import sys
+
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run_concurrently(self, worker, count, threads=16):
+        from concurrent.futures import ThreadPoolExecutor
+
+        results, errors = [], []
+
+        def call(index):
+            try:
+                results.append(worker(index))
+            except ValueError as exc:
+                errors.append(str(exc))
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(call, range(count)))
+        return results, errors
+
+    def _yielding(self, func):
+        """Wrap ``func`` so every call ends with a thread switch, widening check-then-act windows."""
+        import time
+
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            time.sleep(0.0005)
+            return result
+
+        return wrapper
+
+    def _service_with_safe_auto_proposals(self):
+        service = ApiService()
+        service._generate_note_candidate_response = lambda note, prompt: (
+            '{"proposals":[{"note_id":"a","change_type":"tag_enrichment",'
+            '"risk_tier":"low","confidence":0.91,"details":{}}]}'
+        )
+        return service
+
+    def test_concurrent_analyze_assigns_unique_run_ids_without_lost_runs(self):
+        service = self._service_with_safe_auto_proposals()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            runs, errors = self._run_concurrently(
+                lambda _: service.analyze_folder({"folder_path": str(root), "mode": "analyze"}), 200
+            )
+
+        run_ids = [run["run_id"] for run in runs]
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(run_ids)), 200)
+        self.assertEqual(service._run_counter, 200)
+        self.assertEqual(service._run_ids, sorted(run_ids))
+        self.assertEqual(service._run_ids_by_state["ready_safe_auto"], sorted(run_ids))
+        self.assertEqual(len(service.list_runs({"limit": 500})["runs"]), 200)
+
+    def test_concurrent_approve_and_apply_succeed_exactly_once(self):
+        service = self._service_with_safe_auto_proposals()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            run_id = service.analyze_folder({"folder_path": str(root), "mode": "analyze"})["run_id"]
+
+        from mind_lite.contracts.run_lifecycle import validate_transition
+
+        with patch("mind_lite.api.service.validate_transition", self._yielding(validate_transition)):
+            approved, approve_errors = self._run_concurrently(lambda _: service.approve_run(run_id, {}), 50)
+            applied, apply_errors = self._run_concurrently(lambda _: service.apply_run(run_id, {}), 50)
+
+        self.assertEqual(len(approved), 1)
+        self.assertEqual(len(approve_errors), 49)
+        self.assertEqual(len(applied), 1)
+        self.assertEqual(len(apply_errors), 49)
+        self.assertEqual(len(service._snapshot_store.export_run_records(run_id)), 1)
+        self.assertEqual(service.list_runs({"state": "applied"})["runs"][0]["run_id"], run_id)
+
+    def test_concurrent_publish_queue_keeps_every_update_once(self):
+        service = ApiService()
+
+        def mark(index):
+            draft = index // 5
+            return service.mark_for_gom(
+                {
+                    "draft_id": f"draft-{draft}",
+                    "title": f"Draft {draft}",
+                    "prepared_content": "Body",
+                    "event_id": f"mark-{draft}",
+                }
+            )
+
+        from mind_lite.contracts.idempotency_replay import apply_event
+
+        with patch("mind_lite.api.service.apply_event", self._yielding(apply_event)):
+            marked, errors = self._run_concurrently(mark, 200)
+        self.assertEqual(errors, [])
+        self.assertEqual(sum(not item["idempotency"]["duplicate"] for item in marked), 40)
+        self.assertEqual(service.list_gom_queue()["count"], 40)
+
+        confirmed, errors = self._run_concurrently(
+            lambda index: service.confirm_gom(
+                {"draft_id": f"draft-{index}", "published_url": f"https://gom.example/{index}"}
+            ),
+            40,
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(len(confirmed), 40)
+        self.assertEqual(service.list_gom_queue()["count"], 0)
+        self.assertEqual(service.list_published()["count"], 40)
+
+    def test_concurrent_asks_with_one_event_id_share_the_first_answer(self):
+        import threading
+        import time
+
+        service = ApiService()
+        calls = []
+
+        def generate_answer(query, citations, config):
+            calls.append(query)
+            time.sleep(0.05)
+            return {"success": True, "content": f"answer {len(calls)}", "provider": "local", "model": "m"}
+
+        with patch("mind_lite.llm.generate_answer", generate_answer):
+            first = service.ask_stream({"query": "q", "event_id": "evt-abandoned"})
+            next(first)
+            waiting, waiting_errors = [], []
+
+            def retry():
+                try:
+                    waiting.append(service.ask({"query": "q", "event_id": "evt-abandoned"}))
+                except ValueError as exc:
+                    waiting_errors.append(str(exc))
+
+            waiter = threading.Thread(target=retry)
+            waiter.start()
+            time.sleep(0.02)
+            self.assertEqual(waiting, [])
+            first.close()
+            waiter.join()
+
+            answers, errors = self._run_concurrently(
+                lambda _: service.ask({"query": "q", "event_id": "evt-shared"}), 40
+            )
+
+        self.assertEqual(waiting_errors, [])
+        self.assertFalse(waiting[0]["idempotency"]["duplicate"])
+        self.assertEqual(errors, [])
+        self.assertEqual(sum(not item["idempotency"]["duplicate"] for item in answers), 1)
+        self.assertEqual({item["answer"]["text"] for item in answers}, {answers[0]["answer"]["text"]})
+        self.assertEqual(len(calls), 2)
+
+    def test_failed_replayable_write_can_be_retried(self):
+        service = ApiService()
+        payload = {"draft_id": "d1", "title": "Draft", "prepared_content": "Body", "event_id": "mark-1"}
+
+        with self.assertRaises(ValueError):
+            service.mark_for_gom({**payload, "title": ""})
+        marked = service.mark_for_gom(payload)
+        with self.assertRaises(ValueError):
+            service.links_apply({"source_note_id": "n1", "links": [], "event_id": "links-1"})
+        applied = service.links_apply(
+            {"source_note_id": "n1", "links": [{"target_note_id": "n2", "confidence": 0.9}], "event_id": "links-1"}
+        )
+
+        self.assertFalse(marked["idempotency"]["duplicate"])
+        self.assertEqual(applied["applied_count"], 1)
+
+    def test_concurrent_persisted_writes_survive_restart(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            state_file = root / "state.db"
+            service = ApiService(state_file=str(state_file))
+            service._generate_note_candidate_response = lambda note, prompt: '{"proposals": []}'
+
+            runs, errors = self._run_concurrently(
+                lambda _: service.analyze_folder({"folder_path": str(root), "mode": "analyze"}), 60
+            )
+            service._job_manager.shutdown()
+            service._state_store.close()
+
+            reloaded = ApiService(state_file=str(state_file))
+            reloaded_ids = [run["run_id"] for run in reloaded.list_runs({"limit": 500})["runs"]]
+            reloaded._job_manager.shutdown()
+            reloaded._state_store.close()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(reloaded_ids, sorted(run["run_id"] for run in runs))
+        self.assertEqual(reloaded._run_counter, 60)
+
+
 class TestOrganizeClassifyLLM:
     def test_uses_llm_classification(self, monkeypatch):
         from mind_lite.api.service import ApiService
@@ -68,6 +68,61 @@ class HttpServerTests(unittest.TestCase):
         self.assertEqual(resp.status, 200)
         self.assertEqual(body, {"status": "ready"})
 
+    def test_unknown_path_returns_not_found(self):
+        conn = HTTPConnection(self.host, self.port, timeout=2)
+        conn.request("GET", "/does-not-exist")
+        resp = conn.getresponse()
+        body = json.loads(resp.read().decode("utf-8"))
+        conn.close()
+
+        self.assertEqual(resp.status, 404)
+        self.assertEqual(body, {"error": "not found"})
+        self.assertTrue(resp.getheader("Server-Timing", "").startswith("app;dur="))
+
+    def test_large_responses_are_gzipped_when_accepted(self):
+        import gzip
+
+        notes = [{"note_id": f"n{index}", "title": f"Project note {index}", "folder": "inbox"} for index in range(30)]
+        conn = HTTPConnection(self.host, self.port, timeout=2)
+        conn.request(
+            "POST",
+            "/organize/classify",
+            body=json.dumps({"notes": notes}),
+            headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"},
+        )
+        resp = conn.getresponse()
+        raw = resp.read()
+        conn.close()
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(int(resp.getheader("Content-Length")), len(raw))
+        self.assertEqual(len(json.loads(gzip.decompress(raw))["results"]), 30)
+
+    def test_api_token_is_required_except_for_health(self):
+        server = create_server(host="127.0.0.1", port=0, api_token="secret")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        host, port = server.server_address
+
+        def status(path, headers=None):
+            conn = HTTPConnection(host, port, timeout=2)
+            conn.request("GET", path, headers=headers or {})
+            resp = conn.getresponse()
+            resp.read()
+            conn.close()
+            return resp.status
+
+        try:
+            self.assertEqual(status("/health"), 200)
+            self.assertEqual(status("/runs"), 401)
+            self.assertEqual(status("/runs", {"Authorization": "Bearer wrong"}), 401)
+            self.assertEqual(status("/runs", {"Authorization": "Bearer secret"}), 200)
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join(timeout=1)
+
     def test_metrics_endpoint(self):
         conn = HTTPConnection(self.host, self.port, timeout=2)
         conn.request("GET", "/metrics")
@@ -79,6 +134,20 @@ class HttpServerTests(unittest.TestCase):
         self.assertIn("mind_lite_runs_total", body)
         self.assertIn("mind_lite_proposals_total", body)
 
+    def test_metrics_endpoint_reports_request_latency_per_route(self):
+        conn = HTTPConnection(self.host, self.port, timeout=2)
+        conn.request("GET", "/runs/run_missing")
+        conn.getresponse().read()
+        conn.request("GET", "/metrics")
+        resp = conn.getresponse()
+        body = resp.read().decode("utf-8")
+        conn.close()
+
+        self.assertIn(
+            'mind_lite_http_request_duration_seconds_count{route="GET /runs/{run_id}",status="404"}',
+            body,
+        )
+
     def test_metrics_endpoint_includes_publish_counts(self):
         conn = HTTPConnection(self.host, self.port, timeout=2)
         conn.request(
@@ -232,6 +301,70 @@ class HttpServerTests(unittest.TestCase):
             self.assertEqual(filtered_body["runs"][0]["run_id"], second_run["run_id"])
             self.assertNotEqual(filtered_body["runs"][0]["run_id"], first_run["run_id"])
 
+    def test_concurrent_clients_get_unique_run_ids(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+
+            def analyze(_):
+                conn = HTTPConnection(self.host, self.port, timeout=10)
+                conn.request(
+                    "POST",
+                    "/onboarding/analyze-folder",
+                    body=json.dumps({"folder_path": str(root), "mode": "analyze"}),
+                    headers={"Content-Type": "application/json"},
+                )
+                resp = conn.getresponse()
+                body = json.loads(resp.read().decode("utf-8"))
+                conn.close()
+                return resp.status, body["run_id"]
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(analyze, range(40)))
+
+        conn = HTTPConnection(self.host, self.port, timeout=2)
+        conn.request("GET", "/runs?limit=500")
+        listed = json.loads(conn.getresponse().read().decode("utf-8"))
+        conn.close()
+
+        run_ids = [run_id for _, run_id in results]
+        self.assertEqual({status for status, _ in results}, {200})
+        self.assertEqual(len(set(run_ids)), 40)
+        self.assertEqual(sorted(run["run_id"] for run in listed["runs"]), sorted(run_ids))
+
+    def test_runs_endpoint_pages_with_cursor(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "a.md").write_text("# A", encoding="utf-8")
+            conn = HTTPConnection(self.host, self.port, timeout=2)
+            run_ids = []
+            for _ in range(3):
+                conn.request(
+                    "POST",
+                    "/onboarding/analyze-folder",
+                    body=json.dumps({"folder_path": str(root), "mode": "analyze"}),
+                    headers={"Content-Type": "application/json"},
+                )
+                run_ids.append(json.loads(conn.getresponse().read().decode("utf-8"))["run_id"])
+
+        conn.request("GET", "/runs?order=desc&limit=2")
+        first_resp = conn.getresponse()
+        first_page = json.loads(first_resp.read().decode("utf-8"))
+        conn.request("GET", f"/runs?order=desc&limit=2&cursor={first_page['next_cursor']}")
+        second_page = json.loads(conn.getresponse().read().decode("utf-8"))
+        conn.request("GET", "/runs?limit=abc")
+        bad_resp = conn.getresponse()
+        bad_resp.read()
+        conn.close()
+
+        self.assertEqual(first_resp.status, 200)
+        self.assertEqual([run["run_id"] for run in first_page["runs"]], [run_ids[2], run_ids[1]])
+        self.assertEqual([run["run_id"] for run in second_page["runs"]], [run_ids[0]])
+        self.assertIsNone(second_page["next_cursor"])
+        self.assertEqual(bad_resp.status, 400)
+
     def test_analyze_and_get_run_endpoints(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             root = Path(temp_dir)
@@ -1183,6 +1316,48 @@ class HttpServerTests(unittest.TestCase):
         self.assertTrue(second_body["idempotency"]["duplicate"])
         self.assertEqual(second_body["answer"]["text"], first_body["answer"]["text"])
 
+    def test_ask_stream_endpoint_emits_server_sent_events(self):
+        events = iter(
+            [
+                {"type": "token", "content": "Hello"},
+                {"type": "done", "success": True, "content": "Hello", "provider": "lmstudio", "model": "m"},
+            ]
+        )
+        conn = HTTPConnection(self.host, self.port, timeout=2)
+        with patch("mind_lite.llm.stream_answer", return_value=events):
+            conn.request(
+                "POST",
+                "/ask/stream",
+                body=json.dumps({"query": "Say hello"}),
+                headers={"Content-Type": "application/json"},
+            )
+            resp = conn.getresponse()
+            raw = resp.read().decode("utf-8")
+        conn.close()
+
+        frames = [frame for frame in raw.split("\n\n") if frame]
+        names = [frame.split("\n")[0] for frame in frames]
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.getheader("Content-Type"), "text/event-stream")
+        self.assertEqual(names, ["event: citations", "event: token", "event: trace"])
+        trace = json.loads(frames[-1].split("\n", 1)[1][len("data: "):])
+        self.assertEqual(trace["answer"]["text"], "Hello")
+
+    def test_ask_stream_endpoint_rejects_invalid_payload(self):
+        conn = HTTPConnection(self.host, self.port, timeout=2)
+        conn.request(
+            "POST",
+            "/ask/stream",
+            body=json.dumps({}),
+            headers={"Content-Type": "application/json"},
+        )
+        resp = conn.getresponse()
+        body = json.loads(resp.read().decode("utf-8"))
+        conn.close()
+
+        self.assertEqual(resp.status, 400)
+        self.assertIn("error", body)
+
     def test_ask_endpoint_requires_query(self):
         conn = HTTPConnection(self.host, self.port, timeout=2)
         conn.request(
@@ -1888,5 +2063,51 @@ class HttpServerTests(unittest.TestCase):
         self.assertIn("error", body)
 
 
+    def test_jobs_endpoints_submit_poll_and_reject_unknown_ids(self):
+        def request(method, path, payload=None):
+            conn = HTTPConnection(self.host, self.port, timeout=2)
+            conn.request(
+                method,
+                path,
+                body=json.dumps(payload) if payload is not None else None,
+                headers={"Content-Type": "application/json"},
+            )
+            resp = conn.getresponse()
+            body = json.loads(resp.read().decode("utf-8"))
+            conn.close()
+            return resp.status, body
+
+        status, job = request(
+            "POST",
+            "/jobs",
+            {"type": "organize_classify", "payload": {"notes": [{"note_id": "n1", "title": "Atlas"}]}},
+        )
+        self.assertEqual(status, 202)
+        self.assertEqual(job["state"], "queued")
+
+        deadline = time.monotonic() + 5
+        while True:
+            status, polled = request("GET", f"/jobs/{job['job_id']}")
+            if polled["state"] == "completed" or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        self.assertEqual(status, 200)
+        self.assertEqual(polled["result"]["results"][0]["primary_para"], "project")
+        self.assertEqual(polled["progress"]["completed"], 1)
+
+        status, listing = request("GET", "/jobs")
+        self.assertEqual(listing["count"], 1)
+
+        status, body = request("POST", f"/jobs/{job['job_id']}/cancel", {})
+        self.assertEqual(status, 409)
+        self.assertIn("already completed", body["error"])
+
+        status, body = request("GET", "/jobs/job_9999")
+        self.assertEqual(status, 404)
+
+        status, body = request("POST", "/jobs", {"type": "organize_classify", "payload": {"notes": []}})
+        self.assertEqual(status, 400)
+
+
 if __name__ == "__main__":
     unittest.main()
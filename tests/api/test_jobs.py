@@ -0,0 +1,209 @@
+import threading
+import time
+import unittest
+
+from mind_lite.api.jobs import JobCancelled, JobManager
+
+
+def wait_for_state(manager, job_id, states, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["state"] in states:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id} never reached {states}: {manager.get(job_id)['state']}")
+
+
+class JobManagerTests(unittest.TestCase):
+    def test_submit_runs_job_and_records_result(self):
+        manager = JobManager({"echo": lambda payload, job: {"echo": payload["value"]}})
+
+        job = manager.submit("echo", {"value": 3})
+        self.assertEqual(job["job_id"], "job_0001")
+        self.assertEqual(job["state"], "queued")
+
+        done = wait_for_state(manager, "job_0001", {"completed"})
+        self.assertEqual(done["result"], {"echo": 3})
+        self.assertIsNotNone(done["finished_at"])
+        manager.shutdown()
+
+    def test_submit_rejects_unknown_type(self):
+        manager = JobManager({"echo": lambda payload, job: {}})
+
+        with self.assertRaisesRegex(ValueError, "job type must be one of echo"):
+            manager.submit("other", {})
+
+    def test_failed_job_records_error(self):
+        def fail(payload, job):
+            raise RuntimeError("disk full")
+
+        manager = JobManager({"fail": fail})
+        manager.submit("fail", {})
+
+        failed = wait_for_state(manager, "job_0001", {"failed"})
+        self.assertEqual(failed["error"], "disk full")
+        manager.shutdown()
+
+    def test_progress_reports_eta_from_elapsed_time(self):
+        now = [100.0]
+        release = threading.Event()
+        reported = threading.Event()
+
+        def work(payload, job):
+            now[0] += 10.0
+            job.report_progress(1, 4, chunks_embedded=32)
+            reported.set()
+            release.wait(5)
+            return {}
+
+        manager = JobManager({"work": work}, clock=lambda: now[0])
+        manager.submit("work", {})
+        reported.wait(5)
+
+        progress = manager.get("job_0001")["progress"]
+        self.assertEqual(progress["completed"], 1)
+        self.assertEqual(progress["total"], 4)
+        self.assertEqual(progress["chunks_embedded"], 32)
+        self.assertEqual(progress["eta_seconds"], 30.0)
+        release.set()
+        wait_for_state(manager, "job_0001", {"completed"})
+        manager.shutdown()
+
+    def test_cancel_running_job_stops_at_next_progress_report(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def work(payload, job):
+            job.save_checkpoint(step=1)
+            started.set()
+            release.wait(5)
+            job.report_progress(1, 2)
+            raise AssertionError("cancellation should have stopped the job")
+
+        manager = JobManager({"work": work})
+        manager.submit("work", {})
+        started.wait(5)
+
+        manager.cancel("job_0001")
+        release.set()
+
+        cancelled = wait_for_state(manager, "job_0001", {"cancelled"})
+        self.assertIsNone(cancelled["error"])
+        with self.assertRaisesRegex(ValueError, "already cancelled"):
+            manager.cancel("job_0001")
+        manager.shutdown()
+
+    def test_resume_restarts_from_saved_checkpoint(self):
+        seen_checkpoints = []
+
+        def work(payload, job):
+            seen_checkpoints.append(dict(job.checkpoint))
+            done = job.checkpoint.get("done", 0)
+            for step in range(done, 3):
+                job.save_checkpoint(done=step + 1)
+                if step == 1 and len(seen_checkpoints) == 1:
+                    raise JobCancelled(job.job_id)
+            return {"done": job.checkpoint["done"]}
+
+        manager = JobManager({"work": work})
+        manager.submit("work", {})
+        wait_for_state(manager, "job_0001", {"cancelled"})
+
+        resumed = manager.resume("job_0001")
+        self.assertEqual(resumed["resumed_count"], 1)
+        done = wait_for_state(manager, "job_0001", {"completed"})
+
+        self.assertEqual(seen_checkpoints, [{}, {"done": 2}])
+        self.assertEqual(done["result"], {"done": 3})
+        manager.shutdown()
+
+    def test_import_records_requeues_interrupted_jobs(self):
+        records = {
+            "counter": 2,
+            "jobs": {
+                "job_0001": {
+                    "job_id": "job_0001",
+                    "type": "work",
+                    "state": "completed",
+                    "payload": {},
+                    "result": {"ok": True},
+                    "checkpoint": {},
+                },
+                "job_0002": {
+                    "job_id": "job_0002",
+                    "type": "work",
+                    "state": "running",
+                    "payload": {"value": 7},
+                    "progress": {"completed": 1, "total": 2, "eta_seconds": 5.0},
+                    "result": None,
+                    "error": None,
+                    "resumed_count": 0,
+                    "checkpoint": {"done": 1},
+                },
+            },
+        }
+
+        manager = JobManager({"work": lambda payload, job: {"resumed_from": job.checkpoint["done"]}})
+        interrupted = manager.import_records(records)
+        self.assertEqual(interrupted, ["job_0002"])
+        self.assertEqual(manager.get("job_0002")["state"], "queued")
+
+        manager.resume_interrupted(interrupted)
+        done = wait_for_state(manager, "job_0002", {"completed"})
+        self.assertEqual(done["result"], {"resumed_from": 1})
+        self.assertEqual(done["resumed_count"], 1)
+        self.assertEqual(manager.submit("work", {})["job_id"], "job_0003")
+        manager.shutdown()
+
+    def test_records_are_read_only_and_replaced_on_update(self):
+        release = threading.Event()
+        manager = JobManager({"work": lambda payload, job: release.wait(5) and {}})
+
+        queued = manager.submit("work", {"value": 1})
+        with self.assertRaisesRegex(TypeError, "read-only"):
+            queued["payload"]["value"] = 2
+
+        release.set()
+        done = wait_for_state(manager, "job_0001", {"completed"})
+        self.assertEqual(queued["state"], "queued")
+        self.assertIs(manager.get("job_0001"), done)
+        manager.shutdown()
+
+    def test_update_checkpoint_is_throttled_and_flushed_when_the_job_stops(self):
+        now = [100.0]
+        changes = []
+        release = threading.Event()
+        updated = threading.Event()
+
+        def work(payload, job):
+            for step in range(1, 51):
+                job.update_checkpoint(done=step)
+            updated.set()
+            release.wait(5)
+            return {}
+
+        manager = JobManager({"work": work}, on_change=changes.append, clock=lambda: now[0])
+        manager.submit("work", {})
+        updated.wait(5)
+
+        self.assertEqual(manager.export_record("job_0001")["checkpoint"], {})
+        self.assertEqual(len(changes), 2)
+        release.set()
+        wait_for_state(manager, "job_0001", {"completed"})
+        self.assertEqual(manager.export_record("job_0001")["checkpoint"], {"done": 50})
+        manager.shutdown()
+
+    def test_export_records_includes_checkpoints(self):
+        manager = JobManager({"work": lambda payload, job: job.save_checkpoint(done=1) or {}})
+        manager.submit("work", {})
+        wait_for_state(manager, "job_0001", {"completed"})
+
+        records = manager.export_records()
+        self.assertEqual(records["counter"], 1)
+        self.assertEqual(records["jobs"]["job_0001"]["checkpoint"], {"done": 1})
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
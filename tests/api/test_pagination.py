@@ -0,0 +1,70 @@
+import unittest
+
+from mind_lite.api.pagination import index_add, index_remove, page_keys, parse_limit
+
+
+class PaginationTests(unittest.TestCase):
+    def test_page_keys_walks_from_cursor_in_both_directions(self):
+        keys = ["a", "b", "c", "d"]
+
+        self.assertEqual(page_keys(keys, limit=2), (["a", "b"], "b"))
+        self.assertEqual(page_keys(keys, limit=2, after="b"), (["c", "d"], None))
+        self.assertEqual(page_keys(keys, limit=3, descending=True), (["d", "c", "b"], "b"))
+        self.assertEqual(page_keys(keys, limit=3, after="b", descending=True), (["a"], None))
+        self.assertEqual(page_keys(keys, limit=None, after="bb"), (["c", "d"], None))
+
+    def test_page_keys_only_visits_keys_up_to_the_page(self):
+        visited = []
+
+        def accept(key):
+            visited.append(key)
+            return key % 2 == 0
+
+        page, cursor = page_keys(range(1000), limit=2, accept=accept)
+
+        self.assertEqual(page, [0, 2])
+        self.assertEqual(cursor, 2)
+        self.assertEqual(visited, [0, 1, 2])
+
+    def test_index_add_and_remove_return_sorted_copies(self):
+        keys = []
+        for key in ("run_0003", "run_0001", "run_0002", "run_0001"):
+            keys = index_add(keys, key)
+        before = keys
+        keys = index_remove(keys, "run_0002")
+        keys = index_remove(keys, "run_0009")
+
+        self.assertEqual(keys, ["run_0001", "run_0003"])
+        self.assertEqual(before, ["run_0001", "run_0002", "run_0003"])
+
+    def test_order_and_bounds_restrict_the_walk(self):
+        def order(key):
+            return len(key), key
+
+        keys = []
+        for key in ("run_9999", "run_10001", "run_10000", "run_9998"):
+            keys = index_add(keys, key, order)
+
+        self.assertEqual(keys, ["run_9998", "run_9999", "run_10000", "run_10001"])
+        self.assertEqual(index_remove(keys, "run_10000", order), ["run_9998", "run_9999", "run_10001"])
+        self.assertEqual(
+            page_keys(keys, limit=2, after="run_9999", order=order), (["run_10000", "run_10001"], None)
+        )
+        self.assertEqual(
+            page_keys(keys, limit=1, descending=True, order=order, lo=1, hi=3), (["run_10000"], "run_10000")
+        )
+        self.assertEqual(
+            page_keys(keys, limit=5, after="run_10000", descending=True, order=order, lo=1, hi=3),
+            (["run_9999"], None),
+        )
+
+    def test_parse_limit_accepts_query_strings(self):
+        self.assertEqual(parse_limit("25"), 25)
+        self.assertEqual(parse_limit(None), 100)
+        self.assertIsNone(parse_limit(None, default=None))
+        with self.assertRaisesRegex(ValueError, "limit must be an integer"):
+            parse_limit("1000")
+
+
+if __name__ == "__main__":
+    unittest.main()
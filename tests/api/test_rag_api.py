@@ -56,6 +56,7 @@ class RAGApiTests(unittest.TestCase):
         service._rag_embedder = mock_embedder
         service._rag_qdrant_index = MagicMock()
         service._rag_sqlite_store = MagicMock()
+        service._rag_sqlite_store.get_document_fingerprints.return_value = {}
         service._rag_sqlite_store.get_status_summary.return_value = {
             "documents_count": 1,
             "chunks_count": 1,
@@ -101,6 +102,19 @@ class RAGApiTests(unittest.TestCase):
         self.assertEqual(len(result["citations"]), 1)
         self.assertEqual(result["citations"][0]["note_id"], "notes/test.md")
 
+    def test_rag_retrieve_passes_mode_and_rejects_unknown_modes(self):
+        from mind_lite.api.service import ApiService
+
+        service = ApiService()
+        service._rag_retrieval = MagicMock()
+        service._rag_retrieval.retrieve.return_value = []
+
+        service.rag_retrieve({"query": "ATLAS-42", "mode": "lexical"})
+        service._rag_retrieval.retrieve.assert_called_once_with("ATLAS-42", top_k=5, mode="lexical")
+
+        with self.assertRaises(ValueError):
+            service.rag_retrieve({"query": "ATLAS-42", "mode": "fuzzy"})
+
     def test_rag_index_vault_delegates_to_index_folder(self):
         from mind_lite.api.service import ApiService
 
@@ -120,6 +134,7 @@ class RAGApiTests(unittest.TestCase):
         service._rag_embedder = mock_embedder
         service._rag_qdrant_index = MagicMock()
         service._rag_sqlite_store = MagicMock()
+        service._rag_sqlite_store.get_document_fingerprints.return_value = {}
         service._rag_sqlite_store.get_status_summary.return_value = {
             "documents_count": 1,
             "chunks_count": 1,
@@ -0,0 +1,57 @@
+import copy
+import json
+import unittest
+
+from mind_lite.api.records import FrozenDict, FrozenList, freeze, thaw
+
+
+class RecordsTests(unittest.TestCase):
+    def test_freeze_converts_nested_containers(self):
+        record = freeze({"run_id": "run_0001", "batches": [{"state": "applied"}], "pair": (1, 2)})
+
+        self.assertIsInstance(record, FrozenDict)
+        self.assertIsInstance(record["batches"], FrozenList)
+        self.assertIsInstance(record["batches"][0], FrozenDict)
+        self.assertEqual(record["pair"], [1, 2])
+        self.assertEqual(record, {"run_id": "run_0001", "batches": [{"state": "applied"}], "pair": [1, 2]})
+
+    def test_frozen_values_reject_mutation(self):
+        record = freeze({"profile": {"note_count": 2}, "items": [1]})
+
+        mutations = [
+            lambda: record.__setitem__("state", "applied"),
+            lambda: record.update(state="applied"),
+            lambda: record.pop("profile"),
+            lambda: record["profile"].__setitem__("note_count", 3),
+            lambda: record["items"].append(2),
+            lambda: record["items"].__setitem__(0, 5),
+        ]
+        for mutate in mutations:
+            with self.assertRaisesRegex(TypeError, "read-only"):
+                mutate()
+        self.assertEqual(record, {"profile": {"note_count": 2}, "items": [1]})
+
+    def test_freeze_reuses_frozen_parts_and_copies_are_free(self):
+        record = freeze({"profile": {"note_count": 2}, "state": "analyzing"})
+        updated = freeze({**record, "state": "applied"})
+
+        self.assertIs(updated["profile"], record["profile"])
+        self.assertIs(freeze(record), record)
+        self.assertIs(copy.deepcopy(record), record)
+
+    def test_frozen_records_serialise_as_json(self):
+        record = freeze({"b": [1, {"c": None}], "a": "x"})
+
+        self.assertEqual(json.loads(json.dumps(record)), {"b": [1, {"c": None}], "a": "x"})
+
+    def test_thaw_returns_mutable_copy(self):
+        record = freeze({"batches": [{"state": "applied"}]})
+        working = thaw(record)
+
+        working["batches"][0]["state"] = "rolled_back"
+        self.assertEqual(record["batches"][0]["state"], "applied")
+        self.assertNotIsInstance(working, FrozenDict)
+
+
+if __name__ == "__main__":
+    unittest.main()
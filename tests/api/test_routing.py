@@ -0,0 +1,187 @@
+import gzip
+import json
+import unittest
+
+from mind_lite.api.routing import (
+    BodySchema,
+    Field,
+    Request,
+    Response,
+    Router,
+    bearer_auth_middleware,
+    gzip_middleware,
+    not_found_when,
+    timing_middleware,
+)
+
+
+def _request(method, path, body=None, headers=None):
+    raw_body = json.dumps(body).encode("utf-8") if body is not None else b""
+    return Request(method=method, path=path, headers=headers or {}, raw_body=raw_body)
+
+
+class RouterTests(unittest.TestCase):
+    def test_matches_exact_paths_before_patterns(self):
+        router = Router()
+        router.get("/runs/{run_id}", lambda request: {"run_id": request.params["run_id"]})
+        router.get("/runs/latest", lambda request: {"latest": True})
+        router.get("/runs/{run_id}/proposals", lambda request: {"proposals_for": request.params["run_id"]})
+
+        self.assertEqual(router.dispatch(_request("GET", "/runs/latest")).payload, {"latest": True})
+        self.assertEqual(router.dispatch(_request("GET", "/runs/run_0001")).payload, {"run_id": "run_0001"})
+        self.assertEqual(
+            router.dispatch(_request("GET", "/runs/run_0001/proposals")).payload,
+            {"proposals_for": "run_0001"},
+        )
+        self.assertEqual(router.dispatch(_request("GET", "/runs/a/b")).status, 404)
+        self.assertEqual(router.dispatch(_request("POST", "/runs/latest")).status, 404)
+
+    def test_validates_body_schema_before_calling_handler(self):
+        calls = []
+        router = Router()
+        router.post(
+            "/links/propose",
+            lambda request: calls.append(request.body) or {"ok": True},
+            body=BodySchema((Field("source_note_id"), Field("candidate_notes", kind="list"))),
+        )
+
+        invalid_json = router.dispatch(Request("POST", "/links/propose", raw_body=b"[1"))
+        not_object = router.dispatch(_request("POST", "/links/propose", [1]))
+        missing = router.dispatch(_request("POST", "/links/propose", {"candidate_notes": [{}]}))
+        empty_list = router.dispatch(_request("POST", "/links/propose", {"source_note_id": "n1", "candidate_notes": []}))
+        accepted = router.dispatch(_request("POST", "/links/propose", {"source_note_id": "n1", "candidate_notes": [{}]}))
+
+        self.assertEqual(invalid_json.payload, {"error": "invalid json"})
+        self.assertEqual(not_object.payload, {"error": "invalid json"})
+        self.assertEqual(missing.payload, {"error": "source_note_id is required"})
+        self.assertEqual(empty_list.payload, {"error": "candidate_notes must be a non-empty list"})
+        self.assertEqual(accepted.status, 200)
+        self.assertEqual(calls, [{"source_note_id": "n1", "candidate_notes": [{}]}])
+
+    def test_optional_field_is_checked_only_when_present(self):
+        router = Router()
+        router.post("/ask", lambda request: {"ok": True}, body=BodySchema((Field("event_id", required=False),)))
+
+        self.assertEqual(router.dispatch(_request("POST", "/ask", {})).status, 200)
+        self.assertEqual(
+            router.dispatch(_request("POST", "/ask", {"event_id": " "})).payload,
+            {"error": "event_id must be a non-empty string"},
+        )
+
+    def test_maps_handler_errors_and_success_status(self):
+        def cancel(request):
+            raise ValueError(request.params["job_id"])
+
+        router = Router()
+        router.post("/jobs/{job_id}/cancel", cancel, error_status=not_found_when("unknown job id", 409))
+        router.post("/jobs", lambda request: {"job_id": "job_0001"}, status=202)
+
+        unknown = router.dispatch(_request("POST", "/jobs/unknown job id: x/cancel", {}))
+        conflict = router.dispatch(_request("POST", "/jobs/done/cancel", {}))
+        created = router.dispatch(_request("POST", "/jobs", {}))
+
+        self.assertEqual((unknown.status, conflict.status, created.status), (404, 409, 202))
+        self.assertEqual(conflict.payload, {"error": "done"})
+
+    def test_middleware_wraps_every_request_outermost_first(self):
+        order = []
+
+        def tag(name):
+            def middleware(request, call_next):
+                order.append(f"{name}:before")
+                response = call_next(request)
+                order.append(f"{name}:after")
+                return response
+
+            return middleware
+
+        router = Router([tag("outer")])
+        router.use(tag("inner"))
+        router.get("/health", lambda request: order.append("handler") or {"status": "ok"})
+
+        router.dispatch(_request("GET", "/health"))
+        router.dispatch(_request("GET", "/missing"))
+
+        self.assertEqual(
+            order,
+            ["outer:before", "inner:before", "handler", "inner:after", "outer:after"]
+            + ["outer:before", "inner:before", "inner:after", "outer:after"],
+        )
+
+
+class MiddlewareTests(unittest.TestCase):
+    def test_timing_middleware_records_route_name_and_status(self):
+        recorded = []
+        router = Router([timing_middleware(lambda *item: recorded.append(item))])
+        router.get("/runs/{run_id}", lambda request: {"run_id": request.params["run_id"]})
+
+        response = router.dispatch(_request("GET", "/runs/run_0001"))
+        router.dispatch(_request("GET", "/missing"))
+
+        self.assertTrue(response.headers["Server-Timing"].startswith("app;dur="))
+        self.assertEqual([(name, status) for name, status, _ in recorded], [("GET /runs/{run_id}", 200), ("unmatched", 404)])
+        self.assertTrue(all(seconds >= 0 for _, _, seconds in recorded))
+
+    def test_timing_middleware_times_streams_until_their_first_event(self):
+        import time
+
+        recorded = []
+
+        def events():
+            time.sleep(0.05)
+            yield {"event": "token", "data": {"text": "a"}}
+            yield {"event": "done", "data": {}}
+
+        router = Router([timing_middleware(lambda *item: recorded.append(item))])
+        router.post("/ask/stream", lambda request: Response(200, events(), "text/event-stream"))
+
+        response = router.dispatch(_request("POST", "/ask/stream", {}))
+        self.assertEqual(recorded, [])
+        frames = list(response.payload)
+
+        self.assertEqual(len(frames), 2)
+        self.assertEqual([(name, status) for name, status, _ in recorded], [("POST /ask/stream", 200)])
+        self.assertGreaterEqual(recorded[0][2], 0.05)
+        self.assertNotIn("Server-Timing", response.headers)
+
+    def test_gzip_middleware_compresses_large_bodies_for_accepting_clients(self):
+        router = Router([gzip_middleware(min_bytes=64)])
+        router.get("/large", lambda request: {"items": ["x" * 10] * 50})
+        router.get("/small", lambda request: {"ok": True})
+
+        compressed = router.dispatch(_request("GET", "/large", headers={"accept-encoding": "gzip, deflate"}))
+        plain = router.dispatch(_request("GET", "/large"))
+        small = router.dispatch(_request("GET", "/small", headers={"accept-encoding": "gzip"}))
+
+        self.assertEqual(compressed.headers["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(compressed.encode())), {"items": ["x" * 10] * 50})
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertNotIn("Content-Encoding", small.headers)
+
+    def test_gzip_middleware_leaves_event_streams_alone(self):
+        router = Router([gzip_middleware(min_bytes=0)])
+        router.post("/ask/stream", lambda request: Response(200, iter(()), "text/event-stream"))
+
+        response = router.dispatch(_request("POST", "/ask/stream", {}, headers={"accept-encoding": "gzip"}))
+
+        self.assertTrue(response.is_stream)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_bearer_auth_middleware_rejects_missing_or_wrong_token(self):
+        router = Router([bearer_auth_middleware("secret")])
+        router.get("/health", lambda request: {"status": "ok"})
+        router.get("/runs", lambda request: {"runs": []})
+
+        self.assertEqual(router.dispatch(_request("GET", "/health")).status, 200)
+        self.assertEqual(router.dispatch(_request("GET", "/runs")).status, 401)
+        self.assertEqual(
+            router.dispatch(_request("GET", "/runs", headers={"authorization": "Bearer wrong"})).status, 401
+        )
+        self.assertEqual(
+            router.dispatch(_request("GET", "/runs", headers={"authorization": "Bearer secret"})).payload,
+            {"runs": []},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from mind_lite.api.state_store import SCHEMA_VERSION, StateStore, state_db_path
+
+
+class StateStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = StateStore(Path(self._tmp.name) / "state.db")
+        self.store.init_schema()
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_state_db_path_uses_db_sibling_of_json_state_file(self):
+        self.assertEqual(state_db_path("data/state.json"), Path("data/state.db"))
+        self.assertEqual(state_db_path("data/state.db"), Path("data/state.db"))
+
+    def test_init_schema_records_version(self):
+        version = self.store._connection().execute("PRAGMA user_version").fetchone()[0]
+        self.assertEqual(version, SCHEMA_VERSION)
+        self.assertTrue(self.store.is_empty())
+
+    def test_updates_keep_insertion_order(self):
+        self.store.put("runs", "run_0002", {"state": "queued"})
+        self.store.put("runs", "run_0001", {"state": "queued"})
+        self.store.put("runs", "run_0002", {"state": "applied"})
+
+        self.assertEqual(
+            self.store.load("runs"),
+            [("run_0002", {"state": "applied"}), ("run_0001", {"state": "queued"})],
+        )
+
+    def test_delete_and_replace_kind(self):
+        self.store.put("gom_queue", "0", {"draft_id": "a"})
+        self.store.put("gom_queue", "1", {"draft_id": "b"})
+        self.store.put("runs", "run_0001", {"state": "queued"})
+
+        self.store.replace_kind("gom_queue", [("0", {"draft_id": "b"})])
+        self.store.delete("runs", "run_0001")
+
+        self.assertEqual(self.store.load("gom_queue"), [("0", {"draft_id": "b"})])
+        self.assertEqual(self.store.load("runs"), [])
+
+    def test_meta_round_trip(self):
+        self.assertEqual(self.store.get_meta("run_counter", 0), 0)
+        self.store.set_meta("run_counter", 7)
+        self.assertEqual(self.store.get_meta("run_counter"), 7)
+        self.assertFalse(self.store.is_empty())
+
+    def test_failed_transaction_rolls_back_every_write(self):
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.store.put("runs", "run_0001", {"state": "queued"})
+                self.store.set_meta("run_counter", 1)
+                raise RuntimeError("crash")
+
+        self.assertTrue(self.store.is_empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import threading
+import unittest
+
+
+class LoadProfileTests(unittest.TestCase):
+    def test_parse_mix_reads_weights_and_defaults_to_one(self):
+        from mind_lite.bench.load import parse_mix
+
+        self.assertEqual(parse_mix("ask=1, rag_retrieve=3,health"), (("ask", 1.0), ("rag_retrieve", 3.0), ("health", 1.0)))
+        with self.assertRaises(ValueError):
+            parse_mix("ask=often")
+
+    def test_invalid_profiles_are_rejected(self):
+        from mind_lite.bench.load import LoadProfile
+
+        with self.assertRaises(ValueError):
+            LoadProfile(concurrency=0)
+        with self.assertRaises(ValueError):
+            LoadProfile(rate_per_second=0)
+        with self.assertRaises(ValueError):
+            LoadProfile(mix=(("unknown", 1.0),))
+        with self.assertRaises(ValueError):
+            LoadProfile(mix=(("ask", 0.0),))
+
+
+class RunLoadTests(unittest.TestCase):
+    def setUp(self):
+        from mind_lite.api.http_server import create_server
+
+        self.server = create_server(host="127.0.0.1", port=0, api_token="secret")
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.host, self.port = self.server.server_address
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=1)
+
+    def test_closed_loop_reports_throughput_and_errors_per_endpoint(self):
+        from mind_lite.bench.load import LoadProfile, run_load
+
+        profile = LoadProfile(
+            concurrency=2, duration_seconds=0.3, warmup_seconds=0.05, mix=(("health", 1.0), ("runs", 1.0))
+        )
+        result = run_load(self.host, self.port, profile, ["unused"])
+
+        health = result["endpoints"]["health"]
+        runs = result["endpoints"]["runs"]
+        self.assertGreater(health["requests"], 0)
+        self.assertEqual(health["errors"], 0)
+        self.assertGreater(health["throughput_per_second"], 0)
+        self.assertEqual(runs["error_rate"], 1.0)
+        self.assertEqual(runs["error_kinds"], {"http_401": runs["requests"]})
+        self.assertEqual(result["overall"]["requests"], health["requests"] + runs["requests"])
+        self.assertIn("p99_ms", result["overall"]["latency"])
+
+    def test_open_loop_sends_at_the_requested_rate(self):
+        from mind_lite.bench.load import LoadProfile, run_load
+
+        profile = LoadProfile(
+            concurrency=2, duration_seconds=0.5, warmup_seconds=0.0, rate_per_second=40, mix=(("health", 1.0),)
+        )
+        result = run_load(self.host, self.port, profile, ["unused"])
+
+        self.assertAlmostEqual(result["overall"]["requests"], 20, delta=3)
+        self.assertEqual(result["overall"]["not_sent"], 0)
+        self.assertEqual(result["overall"]["errors"], 0)
+
+
+class RunProfilesTests(unittest.TestCase):
+    def test_run_profiles_serves_ask_and_retrieve_offline(self):
+        from mind_lite.bench import VaultSpec
+        from mind_lite.bench.load import LoadProfile, run_profiles
+
+        report = run_profiles(
+            [LoadProfile(concurrency=2, duration_seconds=0.3, warmup_seconds=0.0)],
+            vault=VaultSpec(notes=10, min_words=40, max_words=80),
+            queries=5,
+        )
+
+        (step,) = report["steps"]
+        self.assertEqual(step["profile"]["concurrency"], 2)
+        self.assertEqual(step["overall"]["errors"], 0)
+        self.assertGreater(step["endpoints"]["ask"]["requests"], 0)
+        self.assertGreater(step["endpoints"]["rag_retrieve"]["requests"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import unittest
+
+
+class BenchSuiteTests(unittest.TestCase):
+    def test_run_suite_reports_every_scenario_offline(self):
+        from mind_lite.bench import BenchConfig, VaultSpec, run_suite
+
+        state_file = os.environ.get("MIND_LITE_STATE_FILE")
+        report = run_suite(
+            BenchConfig(vault=VaultSpec(notes=12, min_words=40, max_words=120), repeat=1, warmup=0, queries=3)
+        )
+
+        self.assertEqual(os.environ.get("MIND_LITE_STATE_FILE"), state_file)
+        self.assertEqual(json.loads(json.dumps(report))["config"]["scenarios"], list(report["config"]["scenarios"]))
+        self.assertEqual(report["vault"]["notes"], 12)
+        self.assertEqual(
+            {scenario: sorted(results) for scenario, results in report["scenarios"].items()},
+            {
+                "analyze_folder": ["default"],
+                "chunk_documents": ["default"],
+                "index_folder": ["full", "incremental_unchanged"],
+                "retrieve": ["hybrid", "lexical", "vector"],
+                "ask": ["default"],
+                "http": ["ask", "health", "rag_retrieve"],
+            },
+        )
+        self.assertEqual(report["scenarios"]["ask"]["default"]["latency"]["count"], 3)
+        self.assertGreater(report["scenarios"]["index_folder"]["full"]["items_per_call"], 0)
+
+    def test_stub_llm_answers_ask_with_usage(self):
+        from mind_lite.bench import stub_llm
+        from mind_lite.llm.lmstudio import call_lmstudio
+
+        with stub_llm():
+            result = call_lmstudio("Summarise my notes", base_url="http://llm.invalid")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["usage"]["prompt_tokens"], 3)
+
+    def test_hash_embedder_is_deterministic_and_word_sensitive(self):
+        from mind_lite.bench import HashEmbedder
+
+        embedder = HashEmbedder(dimensions=64)
+        vectors = embedder.embed_texts_array(["project atlas", "project atlas", "garden recipe"], normalize=True)
+
+        self.assertEqual(vectors.shape, (3, 64))
+        self.assertEqual(vectors[0].tolist(), vectors[1].tolist())
+        self.assertGreater(float(vectors[0] @ vectors[1]), float(vectors[0] @ vectors[2]))
+        self.assertEqual(embedder.embed_query("project atlas"), embedder.embed_texts(["project atlas"])[0])
+
+    def test_compare_reports_flags_p50_regressions(self):
+        from mind_lite.bench import compare_reports
+
+        def report(p50):
+            return {"scenarios": {"ask": {"default": {"latency": {"p50_ms": p50}}}}}
+
+        rows = compare_reports(report(10.0), report(12.0), threshold=0.1)
+
+        self.assertEqual(rows, [
+            {
+                "measurement": "ask.default",
+                "baseline_p50_ms": 10.0,
+                "current_p50_ms": 12.0,
+                "change": 0.2,
+                "regressed": True,
+            }
+        ])
+        self.assertFalse(compare_reports(report(10.0), report(10.5))[0]["regressed"])
+
+    def test_percentile_interpolates_between_ranks(self):
+        from mind_lite.bench import percentile, summarize
+
+        self.assertEqual(percentile([4, 1, 3, 2], 50), 2.5)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 95), 4.8)
+        self.assertEqual(summarize([0.001, 0.003])["p50_ms"], 2.0)
+        self.assertEqual(summarize([]), {"count": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class VaultGeneratorTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_same_spec_produces_identical_files(self):
+        from mind_lite.bench.vault import VaultSpec, generate_vault
+
+        spec = VaultSpec(notes=25, seed=7)
+        first = generate_vault(self.root / "a", spec)
+        second = generate_vault(self.root / "b", spec)
+
+        self.assertEqual([p.relative_to(self.root / "a") for p in first], [p.relative_to(self.root / "b") for p in second])
+        self.assertEqual([p.read_bytes() for p in first], [p.read_bytes() for p in second])
+
+        other = generate_vault(self.root / "c", VaultSpec(notes=25, seed=8))
+        self.assertNotEqual([p.read_bytes() for p in first], [p.read_bytes() for p in other])
+
+    def test_link_and_tag_density_follow_the_spec(self):
+        from mind_lite.bench.vault import VaultSpec, generate_vault
+        from mind_lite.onboarding.analyze_readonly import analyze_folder
+
+        generate_vault(self.root, VaultSpec(notes=200, links_per_note=4.0, tags_per_note=1.5, min_words=50, max_words=60))
+        profile = analyze_folder(str(self.root))
+
+        self.assertEqual(profile.note_count, 200)
+        self.assertEqual(profile.link_density, 4.0)
+        mean_tags = sum(len(note.tags) for note in profile.notes) / 200
+        self.assertAlmostEqual(mean_tags, 1.5, delta=0.15)
+
+    def test_links_point_at_other_notes_in_the_vault(self):
+        import re
+
+        from mind_lite.bench.vault import VaultSpec, generate_vault
+
+        paths = generate_vault(self.root, VaultSpec(notes=40, links_per_note=2.0))
+        titles = {path.stem for path in paths}
+
+        for path in paths:
+            targets = re.findall(r"\[\[([^\]]+)\]\]", path.read_text(encoding="utf-8"))
+            self.assertEqual(len(targets), 2)
+            self.assertTrue(set(targets) <= titles - {path.stem})
+
+    def test_invalid_spec_is_rejected(self):
+        from mind_lite.bench.vault import VaultSpec
+
+        with self.assertRaises(ValueError):
+            VaultSpec(notes=0)
+        with self.assertRaises(ValueError):
+            VaultSpec(min_words=100, max_words=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
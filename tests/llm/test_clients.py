@@ -0,0 +1,97 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+class ProviderClientRegistryTests(unittest.TestCase):
+    def test_get_reuses_one_pooled_client_per_provider(self):
+        from mind_lite.llm.clients import ProviderClientRegistry, ProviderClientSettings
+
+        registry = ProviderClientRegistry(
+            {
+                "lmstudio": ProviderClientSettings(timeout=12.0, max_connections=3),
+                "openrouter": ProviderClientSettings(timeout=40.0),
+            }
+        )
+        try:
+            client = registry.get("lmstudio")
+
+            self.assertIs(registry.get("lmstudio"), client)
+            self.assertIsNot(registry.get("openrouter"), client)
+            self.assertEqual(client.timeout.read, 12.0)
+            self.assertEqual(client.timeout.connect, 5.0)
+        finally:
+            registry.close()
+
+    def test_configure_replaces_client_and_close_recreates_lazily(self):
+        from mind_lite.llm.clients import ProviderClientRegistry, ProviderClientSettings
+
+        registry = ProviderClientRegistry({"lmstudio": ProviderClientSettings(timeout=12.0)})
+        first = registry.get("lmstudio")
+
+        registry.configure("lmstudio", ProviderClientSettings(timeout=3.0))
+        second = registry.get("lmstudio")
+        registry.close()
+
+        self.assertTrue(first.is_closed)
+        self.assertEqual(second.timeout.read, 3.0)
+        self.assertTrue(second.is_closed)
+        self.assertFalse(registry.get("lmstudio").is_closed)
+        registry.close()
+
+    def test_install_swaps_in_a_custom_client(self):
+        import httpx
+
+        from mind_lite.llm.clients import ProviderClientRegistry, ProviderClientSettings
+
+        registry = ProviderClientRegistry({"lmstudio": ProviderClientSettings(timeout=12.0)})
+        original = registry.get("lmstudio")
+        stub = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(204)))
+
+        self.assertIs(registry.install("lmstudio", stub), original)
+        self.assertEqual(registry.get("lmstudio").get("http://stub/").status_code, 204)
+        with self.assertRaises(ValueError):
+            registry.install("unknown", stub)
+        registry.close()
+        original.close()
+
+    def test_unknown_provider_is_rejected(self):
+        from mind_lite.llm.clients import ProviderClientRegistry
+
+        with self.assertRaises(ValueError):
+            ProviderClientRegistry({}).get("nope")
+
+    def test_default_settings_read_env_overrides(self):
+        from mind_lite.llm.clients import default_client_settings
+
+        with patch.dict(
+            os.environ,
+            {"MIND_LITE_OPENROUTER_TIMEOUT": "90", "MIND_LITE_LLM_MAX_CONNECTIONS": "4"},
+        ):
+            settings = default_client_settings()
+
+        self.assertEqual(settings["openrouter"].timeout, 90.0)
+        self.assertTrue(settings["openrouter"].http2)
+        self.assertEqual(settings["lmstudio"].max_connections, 4)
+
+    def test_provider_calls_go_through_shared_client(self):
+        from mind_lite.llm.lmstudio import call_lmstudio
+        from mind_lite.organize.classify_llm import _call_llm
+
+        response = MagicMock()
+        response.json.return_value = {"choices": [{"message": {"content": "ok"}}]}
+        client = MagicMock()
+        client.post.return_value = response
+
+        with patch("mind_lite.llm.lmstudio.get_http_client", return_value=client):
+            result = call_lmstudio("prompt")
+        with patch("mind_lite.llm.clients.get_http_client", return_value=client):
+            raw = _call_llm("prompt")
+
+        self.assertEqual(result["content"], "ok")
+        self.assertEqual(raw, "ok")
+        self.assertEqual(client.post.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import json
 import os
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -75,6 +78,120 @@ class LlmConfigTests(unittest.TestCase):
             self.assertEqual(config.lmstudio_url, "http://custom:5678")
 
 
+
+class LlmConfigServiceTests(unittest.TestCase):
+    def test_recently_used_is_written_on_flush_only(self):
+        from mind_lite.llm.config import LlmConfigService
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "llm_config.json"
+            service = LlmConfigService(path, write_delay_seconds=60)
+
+            service.record_recently_used("lmstudio", "lmstudio:local")
+            self.assertFalse(path.exists())
+            self.assertEqual(
+                service.get().recently_used, [{"provider": "lmstudio", "model": "lmstudio:local"}]
+            )
+
+            service.flush()
+            data = json.loads(path.read_text())
+            self.assertEqual(data["recently_used"][0]["model"], "lmstudio:local")
+            self.assertEqual(os.listdir(tmp), ["llm_config.json"])
+
+    def test_delayed_writes_are_coalesced(self):
+        from mind_lite.llm.config import LlmConfigService
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "llm_config.json"
+            service = LlmConfigService(path, write_delay_seconds=0.05)
+
+            with patch("mind_lite.llm.config.os.replace", wraps=os.replace) as mock_replace:
+                for index in range(10):
+                    service.record_recently_used("openrouter", f"model-{index % 3}")
+                deadline = time.monotonic() + 5
+                while not path.exists() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+            self.assertEqual(mock_replace.call_count, 1)
+            data = json.loads(path.read_text())
+            self.assertEqual(data["recently_used"][0]["model"], "model-0")
+            self.assertEqual(len(data["recently_used"]), 3)
+
+    def test_external_edit_is_reloaded_when_mtime_changes(self):
+        from mind_lite.llm.config import LlmConfig, LlmConfigService
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "llm_config.json"
+            service = LlmConfigService(path)
+            service.save(LlmConfig(active_model="lmstudio:local"))
+            self.assertEqual(service.get().active_model, "lmstudio:local")
+
+            path.write_text(json.dumps(LlmConfig(active_model="other:model").to_dict()))
+            os.utime(path, ns=(time.time_ns() + 1_000_000_000,) * 2)
+
+            self.assertEqual(service.get().active_model, "other:model")
+
+    def test_get_returns_a_copy(self):
+        from mind_lite.llm.config import LlmConfigService
+
+        with tempfile.TemporaryDirectory() as tmp:
+            service = LlmConfigService(Path(tmp) / "llm_config.json", write_delay_seconds=60)
+            service.record_recently_used("p1", "m1")
+
+            service.get().recently_used.append({"provider": "x", "model": "y"})
+
+            self.assertEqual(len(service.get().recently_used), 1)
+
+    def test_concurrent_recently_used_updates_keep_five_distinct_entries(self):
+        from mind_lite.llm.config import LlmConfigService
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "llm_config.json"
+            service = LlmConfigService(path, write_delay_seconds=60)
+
+            def record(worker):
+                for index in range(50):
+                    service.record_recently_used("p", f"m{(worker + index) % 8}")
+
+            threads = [threading.Thread(target=record, args=(worker,)) for worker in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            service.flush()
+
+            recent = json.loads(path.read_text())["recently_used"]
+            self.assertEqual(len(recent), 5)
+            self.assertEqual(len({entry["model"] for entry in recent}), 5)
+
+    def test_update_keeps_concurrent_recently_used_entries(self):
+        from dataclasses import replace
+
+        from mind_lite.llm.config import LlmConfigService
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "llm_config.json"
+            service = LlmConfigService(path, write_delay_seconds=60)
+            service.record_recently_used("lmstudio", "lmstudio:local")
+
+            def change(current):
+                service_thread = threading.Thread(target=service.record_recently_used, args=("openrouter", "m1"))
+                service_thread.start()
+                service_thread.join(0.05)
+                return replace(current, active_model="openrouter:m1", active_provider="openrouter")
+
+            updated = service.update(change)
+            deadline = time.monotonic() + 5
+            while len(service.get().recently_used) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            service.flush()
+
+            data = json.loads(path.read_text())
+            self.assertEqual(updated.active_model, "openrouter:m1")
+            self.assertEqual(data["active_model"], "openrouter:m1")
+            self.assertEqual([entry["model"] for entry in data["recently_used"]], ["m1", "lmstudio:local"])
+
+
 class LlmModelsTests(unittest.TestCase):
     def test_model_catalog_has_required_categories(self):
         from mind_lite.llm.models import MODEL_CATALOG
@@ -153,5 +270,96 @@ class LlmPromptsTests(unittest.TestCase):
         self.assertNotIn("notes/5.md", prompt)
 
 
+
+class LlmStreamingTests(unittest.TestCase):
+    def test_iter_completion_deltas_parses_openai_stream(self):
+        from mind_lite.llm.streaming import iter_completion_deltas
+
+        lines = [
+            ": keep-alive",
+            'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+            'data: {"choices": [{"delta": {"content": "Hel"}}]}',
+            "",
+            'data: {"choices": [{"delta": {"content": "lo"}}]}',
+            "data: not-json",
+            "data: [DONE]",
+            'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+        ]
+
+        self.assertEqual(list(iter_completion_deltas(lines)), ["Hel", "lo"])
+
+    def test_stream_lmstudio_yields_tokens_then_done(self):
+        from unittest.mock import MagicMock
+
+        from mind_lite.llm.lmstudio import stream_lmstudio
+
+        response = MagicMock()
+        response.iter_lines.return_value = [
+            'data: {"choices": [{"delta": {"content": "Hi"}}]}',
+            'data: {"choices": [{"delta": {"content": " there"}}]}',
+            "data: [DONE]",
+        ]
+        stream_cm = MagicMock()
+        stream_cm.__enter__.return_value = response
+
+        client = MagicMock()
+        client.stream.return_value = stream_cm
+        with patch("mind_lite.llm.lmstudio.get_http_client", return_value=client):
+            events = list(stream_lmstudio("prompt", model="m"))
+
+        self.assertTrue(client.stream.call_args.kwargs["json"]["stream"])
+        self.assertEqual([e["content"] for e in events if e["type"] == "token"], ["Hi", " there"])
+        self.assertEqual(events[-1]["type"], "done")
+        self.assertTrue(events[-1]["success"])
+        self.assertEqual(events[-1]["content"], "Hi there")
+
+    def test_stream_lmstudio_reports_usage_and_records_llm_metrics(self):
+        from unittest.mock import MagicMock
+
+        from mind_lite.llm.config import LlmConfig
+        from mind_lite.llm.generate import stream_answer
+        from mind_lite.metrics import LLM_REQUESTS, LLM_TOKENS, STAGE_SECONDS
+
+        response = MagicMock()
+        response.iter_lines.return_value = [
+            'data: {"choices": [{"delta": {"content": "Hi"}}]}',
+            'data: {"choices": [], "usage": {"prompt_tokens": 9, "completion_tokens": 1}}',
+            "data: [DONE]",
+        ]
+        stream_cm = MagicMock()
+        stream_cm.__enter__.return_value = response
+        client = MagicMock()
+        client.stream.return_value = stream_cm
+        config = LlmConfig(active_provider="lmstudio", active_model="lmstudio:local-model")
+
+        with (
+            patch.object(LLM_REQUESTS, "_values", {}),
+            patch.object(LLM_TOKENS, "_values", {}),
+            patch.object(STAGE_SECONDS, "_values", {}),
+            patch("mind_lite.llm.lmstudio.get_http_client", return_value=client),
+            patch("mind_lite.llm.generate.record_recently_used"),
+        ):
+            events = list(stream_answer("question", [], config))
+
+            self.assertEqual(events[-1]["usage"], {"prompt_tokens": 9, "completion_tokens": 1})
+            self.assertEqual(LLM_REQUESTS.value(provider="lmstudio", outcome="success"), 1)
+            self.assertEqual(LLM_TOKENS.value(provider="lmstudio", kind="prompt"), 9)
+            self.assertEqual(STAGE_SECONDS.count(pipeline="query", stage="prompt_build"), 1)
+            self.assertEqual(STAGE_SECONDS.count(pipeline="query", stage="llm_call"), 1)
+
+    def test_stream_lmstudio_reports_connection_errors(self):
+        from mind_lite.llm.lmstudio import stream_lmstudio
+
+        from unittest.mock import MagicMock
+
+        client = MagicMock()
+        client.stream.side_effect = RuntimeError("refused")
+        with patch("mind_lite.llm.lmstudio.get_http_client", return_value=client):
+            events = list(stream_lmstudio("prompt"))
+
+        self.assertEqual(len(events), 1)
+        self.assertFalse(events[0]["success"])
+        self.assertEqual(events[0]["error"], "refused")
+
 if __name__ == "__main__":
     unittest.main()
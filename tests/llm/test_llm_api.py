@@ -124,5 +124,24 @@ class LlmGenerateTests(unittest.TestCase):
             self.assertTrue(result["success"])
 
 
+    def test_stream_answer_forwards_events_and_records_recent_model(self):
+        from mind_lite.llm.generate import stream_answer
+        from mind_lite.llm.config import LlmConfig
+
+        config = LlmConfig(active_provider="lmstudio", active_model="lmstudio:local")
+        events = [
+            {"type": "token", "content": "A"},
+            {"type": "done", "success": True, "content": "A", "provider": "lmstudio"},
+        ]
+
+        with patch("mind_lite.llm.generate.stream_lmstudio", return_value=iter(events)) as mock_lm, patch(
+            "mind_lite.llm.generate.record_recently_used"
+        ) as mock_record:
+            result = list(stream_answer("Test query", [], config))
+
+        self.assertEqual(result, events)
+        self.assertEqual(mock_lm.call_args.kwargs["model"], "local")
+        mock_record.assert_called_once_with("lmstudio", "lmstudio:local")
+
 if __name__ == "__main__":
     unittest.main()
@@ -13,6 +13,17 @@ class RagConfigTests(unittest.TestCase):
         self.assertEqual(cfg.collection_name, "mind_lite_chunks")
         self.assertEqual(cfg.sqlite_path, ".mind_lite/rag.db")
         self.assertEqual(cfg.embed_model, "sentence-transformers/all-MiniLM-L6-v2")
+        self.assertEqual(cfg.embed_batch_size, 256)
+        self.assertEqual(cfg.index_read_workers, 4)
+        self.assertEqual(cfg.index_queue_size, 64)
+        self.assertEqual(cfg.embed_cache_path, ".mind_lite/embedding_cache.db")
+        self.assertEqual(cfg.embed_cache_max_entries, 500000)
+        self.assertEqual(cfg.vector_backend, "qdrant")
+        self.assertEqual(cfg.local_index_path, ".mind_lite/vectors")
+        self.assertEqual(cfg.local_index_type, "ivf")
+        self.assertEqual(cfg.ivf_nprobe, 16)
+        self.assertTrue(cfg.hydrate_chunks)
+        self.assertEqual(cfg.retrieval_mode, "vector")
 
     def test_env_overrides_defaults(self):
         from mind_lite.rag.config import get_rag_config
@@ -24,6 +35,12 @@ class RagConfigTests(unittest.TestCase):
                 "MIND_LITE_RAG_COLLECTION": "custom_chunks",
                 "MIND_LITE_RAG_SQLITE_PATH": "data/rag.sqlite3",
                 "MIND_LITE_EMBED_MODEL": "custom-model",
+                "MIND_LITE_EMBED_BATCH_SIZE": "64",
+                "MIND_LITE_INDEX_READ_WORKERS": "16",
+                "MIND_LITE_INDEX_QUEUE_SIZE": "8",
+                "MIND_LITE_VECTOR_BACKEND": "local",
+                "MIND_LITE_IVF_NPROBE": "4",
+                "MIND_LITE_RAG_HYDRATE": "false",
             },
             clear=False,
         ):
@@ -33,6 +50,12 @@ class RagConfigTests(unittest.TestCase):
         self.assertEqual(cfg.collection_name, "custom_chunks")
         self.assertEqual(cfg.sqlite_path, "data/rag.sqlite3")
         self.assertEqual(cfg.embed_model, "custom-model")
+        self.assertEqual(cfg.embed_batch_size, 64)
+        self.assertEqual(cfg.index_read_workers, 16)
+        self.assertEqual(cfg.index_queue_size, 8)
+        self.assertEqual(cfg.vector_backend, "local")
+        self.assertEqual(cfg.ivf_nprobe, 4)
+        self.assertFalse(cfg.hydrate_chunks)
 
 
 if __name__ == "__main__":
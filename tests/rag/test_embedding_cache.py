@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class EmbeddingCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.tmpdir) / "cache.db")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_put_and_get_roundtrip_by_model_and_hash(self):
+        from mind_lite.rag.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(self.db_path)
+        cache.put_many("model-a", {"h1": [0.5, 0.25], "h2": [1.0, -1.0]})
+
+        found = cache.get_many("model-a", ["h1", "h2", "h3"])
+        other_model = cache.get_many("model-b", ["h1"])
+
+        self.assertEqual({k: v.tolist() for k, v in found.items()}, {"h1": [0.5, 0.25], "h2": [1.0, -1.0]})
+        self.assertEqual(other_model, {})
+
+    def test_stats_track_hits_and_misses(self):
+        from mind_lite.rag.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(self.db_path)
+        cache.put_many("m", {"h1": [0.1]})
+        cache.get_many("m", ["h1", "h2"])
+
+        stats = cache.stats()
+
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_eviction_drops_least_recently_used(self):
+        from mind_lite.rag.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(self.db_path, max_entries=2)
+        cache.put_many("m", {"old": [0.1]})
+        cache.put_many("m", {"recent": [0.2]})
+        cache.get_many("m", ["old"])
+        cache.put_many("m", {"new": [0.3]})
+
+        self.assertEqual(set(cache.get_many("m", ["old", "recent", "new"])), {"old", "new"})
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_cache_persists_across_instances(self):
+        from mind_lite.rag.embedding_cache import EmbeddingCache
+
+        EmbeddingCache(self.db_path).put_many("m", {"h": [0.75]})
+
+        found = EmbeddingCache(self.db_path).get_many("m", ["h"])
+        self.assertEqual(found["h"].tolist(), [0.75])
+
+
+    def test_entry_count_is_tracked_without_scanning_the_table(self):
+        import sqlite3
+
+        from mind_lite.rag.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(self.db_path, max_entries=3)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        cache.put_many("m", {"a": [0.1], "b": [0.2]})
+        cache.put_many("m", {"b": [0.3], "c": [0.4]})
+        cache.put_many("m", {"d": [0.5]})
+        stats = cache.stats()
+        cache._conn.set_trace_callback(None)
+
+        self.assertEqual((stats["entries"], stats["evictions"]), (3, 1))
+        self.assertFalse(any("COUNT(" in statement or "MAX(" in statement for statement in statements))
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0], 3)
+        conn.close()
+        cache.close()
+        self.assertEqual(EmbeddingCache(self.db_path, max_entries=3).stats()["entries"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
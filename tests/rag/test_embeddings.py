@@ -69,6 +69,64 @@ class EmbeddingTests(unittest.TestCase):
         self.assertEqual(vectors, [])
         adapter._model.encode.assert_not_called()
 
+    def test_cache_skips_encoding_for_known_chunks(self):
+        import shutil
+        import tempfile
+        from pathlib import Path
+
+        from mind_lite.rag.embedding_cache import EmbeddingCache
+        from mind_lite.rag.embeddings import EmbeddingAdapter
+
+        import numpy as np
+
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        cache = EmbeddingCache(str(Path(tmpdir) / "cache.db"))
+
+        mock_model = MagicMock()
+        mock_model.encode.side_effect = lambda texts: np.array([[float(len(t))] for t in texts])
+
+        adapter = EmbeddingAdapter(model_name="test-model", cache=cache)
+        adapter._model = mock_model
+
+        first = adapter.embed_texts(["header", "body one", "header"])
+        mock_model.encode.assert_called_once_with(["header", "body one"])
+
+        mock_model.encode.reset_mock()
+        second = adapter.embed_texts(["header", "body two"])
+
+        mock_model.encode.assert_called_once_with(["body two"])
+        self.assertEqual(first, [[6.0], [8.0], [6.0]])
+        self.assertEqual(second, [[6.0], [8.0]])
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_embed_texts_array_returns_float32_matrix(self):
+        import numpy as np
+
+        from mind_lite.rag.embeddings import EmbeddingAdapter
+
+        mock_model = MagicMock()
+        mock_model.encode.return_value = np.array([[3.0, 4.0], [0.0, 0.0]], dtype=np.float64)
+
+        adapter = EmbeddingAdapter(model_name="test-model")
+        adapter._model = mock_model
+        vectors = adapter.embed_texts_array(["a", "b"], normalize=True)
+
+        self.assertIsInstance(vectors, np.ndarray)
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual(vectors.shape, (2, 2))
+        np.testing.assert_allclose(vectors[0], [0.6, 0.8], rtol=1e-6)
+        np.testing.assert_array_equal(vectors[1], [0.0, 0.0])
+
+    def test_embed_texts_array_handles_empty_input(self):
+        from mind_lite.rag.embeddings import EmbeddingAdapter
+
+        adapter = EmbeddingAdapter(model_name="test-model")
+        adapter._model = MagicMock()
+
+        self.assertEqual(adapter.embed_texts_array([]).shape[0], 0)
+        adapter._model.encode.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
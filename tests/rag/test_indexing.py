@@ -104,6 +104,25 @@ class IndexingTests(unittest.TestCase):
 
         mock_qdrant.upsert_chunks.assert_called()
 
+    def test_index_folder_records_stage_timings(self):
+        (self.fixture_dir / "note1.md").write_text("Alpha beta gamma delta epsilon zeta eta theta.")
+
+        from mind_lite.metrics import STAGE_SECONDS
+        from mind_lite.rag.indexing import IndexingService
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(Path(self.tmpdir) / "test.db"))
+        store.init_schema()
+        mock_embedder = MagicMock()
+        mock_embedder.embed_texts.return_value = [[0.1] * 384]
+        service = IndexingService(sqlite_store=store, qdrant_index=MagicMock(), embedder=mock_embedder)
+
+        with patch.object(STAGE_SECONDS, "_values", {}):
+            service.index_folder(str(self.fixture_dir))
+
+            for stage in ("read", "chunk", "embed", "upsert", "store"):
+                self.assertEqual(STAGE_SECONDS.count(pipeline="index", stage=stage), 1, stage)
+
     def test_reindex_removes_stale_chunks_after_content_change(self):
         doc_path = self.fixture_dir / "note1.md"
         doc_path.write_text("Original content alpha beta gamma delta epsilon zeta eta theta.")
@@ -150,6 +169,383 @@ class IndexingTests(unittest.TestCase):
 
         self.assertNotEqual(old_chunk_ids, new_chunk_ids)
 
+    def _build_service(self, mock_qdrant=None, mock_embedder=None):
+        from mind_lite.rag.indexing import IndexingService
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        db_path = str(Path(self.tmpdir) / "test.db")
+        store = SqliteStore(db_path)
+        store.init_schema()
+
+        if mock_embedder is None:
+            mock_embedder = MagicMock()
+            mock_embedder.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+
+        service = IndexingService(
+            sqlite_store=store,
+            qdrant_index=mock_qdrant if mock_qdrant is not None else MagicMock(),
+            embedder=mock_embedder,
+        )
+        return service, store, mock_embedder
+
+    def test_incremental_reindex_skips_unchanged_notes(self):
+        (self.fixture_dir / "a.md").write_text("Alpha beta gamma delta.")
+        (self.fixture_dir / "b.md").write_text("Epsilon zeta eta theta.")
+
+        service, _, mock_embedder = self._build_service()
+
+        first = service.index_folder(str(self.fixture_dir))
+        self.assertEqual(first["files_new"], 2)
+        self.assertEqual(first["files_skipped"], 0)
+
+        mock_embedder.embed_texts.reset_mock()
+        second = service.index_folder(str(self.fixture_dir))
+
+        self.assertEqual(second["files_indexed"], 0)
+        self.assertEqual(second["files_skipped"], 2)
+        self.assertEqual(second["files_new"], 0)
+        self.assertEqual(second["files_updated"], 0)
+        mock_embedder.embed_texts.assert_not_called()
+
+    def test_incremental_reindex_only_reembeds_changed_notes(self):
+        import os
+
+        note_a = self.fixture_dir / "a.md"
+        note_b = self.fixture_dir / "b.md"
+        note_a.write_text("Alpha beta gamma delta.")
+        note_b.write_text("Epsilon zeta eta theta.")
+
+        service, _, mock_embedder = self._build_service()
+        service.index_folder(str(self.fixture_dir))
+
+        note_b.write_text("Epsilon zeta eta theta iota kappa.")
+        stat = note_b.stat()
+        os.utime(note_b, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        mock_embedder.embed_texts.reset_mock()
+        result = service.index_folder(str(self.fixture_dir))
+
+        self.assertEqual(result["files_updated"], 1)
+        self.assertEqual(result["files_skipped"], 1)
+        self.assertEqual(result["files_indexed"], 1)
+        embedded = [text for call in mock_embedder.embed_texts.call_args_list for text in call.args[0]]
+        self.assertEqual(embedded, ["Epsilon zeta eta theta iota kappa."])
+
+    def test_touched_note_with_same_content_is_skipped_by_hash(self):
+        import os
+
+        note = self.fixture_dir / "a.md"
+        note.write_text("Alpha beta gamma delta.")
+
+        service, store, mock_embedder = self._build_service()
+        service.index_folder(str(self.fixture_dir))
+
+        stat = note.stat()
+        touched_mtime = stat.st_mtime_ns + 5_000_000_000
+        os.utime(note, ns=(stat.st_atime_ns, touched_mtime))
+
+        mock_embedder.embed_texts.reset_mock()
+        result = service.index_folder(str(self.fixture_dir))
+
+        self.assertEqual(result["files_skipped"], 1)
+        mock_embedder.embed_texts.assert_not_called()
+        fingerprint = store.get_document_fingerprints()[str(note)]
+        self.assertEqual(fingerprint["mtime_ns"], touched_mtime)
+
+    def test_full_reindex_ignores_fingerprints(self):
+        (self.fixture_dir / "a.md").write_text("Alpha beta gamma delta.")
+
+        service, _, mock_embedder = self._build_service()
+        service.index_folder(str(self.fixture_dir))
+
+        mock_embedder.embed_texts.reset_mock()
+        result = service.index_folder(str(self.fixture_dir), incremental=False)
+
+        self.assertEqual(result["files_updated"], 1)
+        self.assertEqual(result["files_skipped"], 0)
+        mock_embedder.embed_texts.assert_called_once()
+
+    def test_deleted_note_is_purged_from_sqlite_and_vectors(self):
+        note_a = self.fixture_dir / "a.md"
+        note_b = self.fixture_dir / "b.md"
+        note_a.write_text("Alpha beta gamma delta.")
+        note_b.write_text("Epsilon zeta eta theta.")
+
+        mock_qdrant = MagicMock()
+        service, store, _ = self._build_service(mock_qdrant=mock_qdrant)
+        service.index_folder(str(self.fixture_dir))
+        stale_ids = store.get_chunk_ids_for_document(str(note_b))
+
+        note_b.unlink()
+        result = service.index_folder(str(self.fixture_dir))
+
+        self.assertEqual(result["files_deleted"], 1)
+        self.assertEqual(result["chunks_deleted"], len(stale_ids))
+        self.assertEqual(set(store.get_document_fingerprints()), {str(note_a)})
+        self.assertEqual(store.get_chunk_ids_for_document(str(note_b)), [])
+        mock_qdrant.delete_chunks.assert_called_once_with(stale_ids)
+
+    def test_renamed_note_moves_vectors_without_reembedding(self):
+        note_a = self.fixture_dir / "a.md"
+        note_a.write_text("Alpha beta gamma delta.")
+
+        mock_qdrant = MagicMock()
+        mock_qdrant.move_chunks.return_value = []
+        service, store, mock_embedder = self._build_service(mock_qdrant=mock_qdrant)
+        service.index_folder(str(self.fixture_dir))
+        old_ids = store.get_chunk_ids_for_document(str(note_a))
+
+        renamed = self.fixture_dir / "renamed.md"
+        note_a.rename(renamed)
+        mock_embedder.embed_texts.reset_mock()
+        result = service.index_folder(str(self.fixture_dir))
+
+        self.assertEqual(result["files_renamed"], 1)
+        self.assertEqual(result["files_deleted"], 0)
+        self.assertEqual(result["files_indexed"], 0)
+        mock_embedder.embed_texts.assert_not_called()
+        self.assertEqual(set(store.get_document_fingerprints()), {str(renamed)})
+
+        moves = mock_qdrant.move_chunks.call_args.args[0]
+        self.assertEqual([m["old_chunk_id"] for m in moves], old_ids)
+        self.assertEqual([m["chunk_id"] for m in moves], store.get_chunk_ids_for_document(str(renamed)))
+        self.assertTrue(all(m["payload"]["note_path"] == str(renamed) for m in moves))
+
+    def test_updated_note_drops_stale_vectors(self):
+        import os
+
+        note = self.fixture_dir / "a.md"
+        note.write_text("Alpha beta gamma delta.")
+
+        mock_qdrant = MagicMock()
+        service, store, _ = self._build_service(mock_qdrant=mock_qdrant)
+        service.index_folder(str(self.fixture_dir))
+        old_ids = store.get_chunk_ids_for_document(str(note))
+
+        note.write_text("Completely different words here.")
+        stat = note.stat()
+        os.utime(note, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        result = service.index_folder(str(self.fixture_dir))
+
+        self.assertEqual(result["chunks_deleted"], 1)
+        mock_qdrant.delete_chunks.assert_called_once_with(old_ids)
+
+    def test_reconciliation_is_scoped_to_indexed_folder(self):
+        sub = self.fixture_dir / "sub"
+        sub.mkdir()
+        (self.fixture_dir / "root.md").write_text("Root note words.")
+        (sub / "child.md").write_text("Child note words.")
+
+        service, store, _ = self._build_service()
+        service.index_folder(str(self.fixture_dir))
+
+        result = service.index_folder(str(sub))
+
+        self.assertEqual(result["files_deleted"], 0)
+        self.assertEqual(len(store.get_document_fingerprints()), 2)
+
+    def test_embedding_batches_span_multiple_notes(self):
+        from mind_lite.rag.indexing import IndexingService
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        for name in ("a", "b", "c"):
+            (self.fixture_dir / f"{name}.md").write_text(f"Note {name} short body.")
+
+        store = SqliteStore(str(Path(self.tmpdir) / "test.db"))
+        store.init_schema()
+        mock_embedder = MagicMock()
+        mock_embedder.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+        mock_qdrant = MagicMock()
+
+        service = IndexingService(
+            sqlite_store=store,
+            qdrant_index=mock_qdrant,
+            embedder=mock_embedder,
+            embed_batch_size=2,
+        )
+        result = service.index_folder(str(self.fixture_dir))
+
+        batch_sizes = [len(call.args[0]) for call in mock_embedder.embed_texts.call_args_list]
+        self.assertEqual(batch_sizes, [2, 1])
+        self.assertEqual(result["embedding_batches"], 2)
+        self.assertEqual(mock_qdrant.upsert_chunks.call_count, 2)
+        self.assertEqual(store.get_status_summary()["documents_count"], 3)
+
+    def test_document_rows_written_only_after_embedding(self):
+        (self.fixture_dir / "a.md").write_text("Alpha beta gamma delta.")
+
+        mock_embedder = MagicMock()
+        mock_embedder.embed_texts.side_effect = RuntimeError("encoder crashed")
+        service, store, _ = self._build_service(mock_embedder=mock_embedder)
+
+        with self.assertRaises(RuntimeError):
+            service.index_folder(str(self.fixture_dir))
+
+        self.assertEqual(store.get_document_fingerprints(), {})
+
+    def test_rejects_non_positive_batch_size(self):
+        from mind_lite.rag.indexing import IndexingService
+
+        with self.assertRaises(ValueError):
+            IndexingService(
+                sqlite_store=MagicMock(),
+                qdrant_index=MagicMock(),
+                embedder=MagicMock(),
+                embed_batch_size=0,
+            )
+
+    def test_parallel_readers_preserve_file_order(self):
+        from mind_lite.rag.indexing import IndexingService
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        names = [f"note{i:02d}" for i in range(12)]
+        for name in names:
+            (self.fixture_dir / f"{name}.md").write_text(f"{name} body words.")
+
+        store = SqliteStore(str(Path(self.tmpdir) / "test.db"))
+        store.init_schema()
+        mock_embedder = MagicMock()
+        mock_embedder.embed_texts.side_effect = lambda texts: [[0.1] * 384 for _ in texts]
+
+        service = IndexingService(
+            sqlite_store=store,
+            qdrant_index=MagicMock(),
+            embedder=mock_embedder,
+            read_workers=4,
+            read_queue_size=3,
+        )
+        result = service.index_folder(str(self.fixture_dir))
+
+        embedded = [text for call in mock_embedder.embed_texts.call_args_list for text in call.args[0]]
+        self.assertEqual(embedded, [f"{name} body words." for name in names])
+        self.assertEqual(result["files_new"], 12)
+
+    def test_reader_queue_applies_backpressure(self):
+        import threading
+        import time
+
+        for i in range(20):
+            (self.fixture_dir / f"n{i:02d}.md").write_text(f"note {i}")
+
+        service, _, _ = self._build_service()
+        service.read_workers = 2
+        service.read_queue_size = 4
+
+        lock = threading.Lock()
+        loaded_count = 0
+        original_load = service._load_note
+
+        def counting_load(*args, **kwargs):
+            nonlocal loaded_count
+            with lock:
+                loaded_count += 1
+            return original_load(*args, **kwargs)
+
+        service._load_note = counting_load
+
+        files = service._collect_markdown_files(str(self.fixture_dir))
+        iterator = service._iter_loaded_notes(files, {}, incremental=True)
+        next(iterator)
+        time.sleep(0.05)
+
+        with lock:
+            self.assertLessEqual(loaded_count, service.read_queue_size)
+        self.assertEqual(len(list(iterator)), 19)
+
+    def test_reader_errors_propagate(self):
+        (self.fixture_dir / "bad.md").write_bytes(b"\xff\xfe invalid utf-8")
+
+        service, store, _ = self._build_service()
+
+        with self.assertRaises(UnicodeDecodeError):
+            service.index_folder(str(self.fixture_dir))
+        self.assertEqual(store.get_document_fingerprints(), {})
+
+    def test_array_embedder_flows_matrix_to_vector_index(self):
+        import numpy as np
+
+        from mind_lite.rag.embeddings import EmbeddingAdapter
+        from mind_lite.rag.indexing import IndexingService
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        (self.fixture_dir / "a.md").write_text("Alpha beta gamma.")
+        (self.fixture_dir / "b.md").write_text("Delta epsilon zeta.")
+
+        store = SqliteStore(str(Path(self.tmpdir) / "test.db"))
+        store.init_schema()
+        embedder = EmbeddingAdapter(model_name="test-model")
+        embedder._model = MagicMock()
+        embedder._model.encode.side_effect = lambda texts: np.full((len(texts), 3), 2.0)
+        mock_qdrant = MagicMock()
+
+        service = IndexingService(
+            sqlite_store=store,
+            qdrant_index=mock_qdrant,
+            embedder=embedder,
+            normalize_embeddings=True,
+        )
+        service.index_folder(str(self.fixture_dir))
+
+        call = mock_qdrant.upsert_chunks.call_args
+        vectors = call.kwargs["vectors"]
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual(vectors.shape, (2, 3))
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), [1.0, 1.0], rtol=1e-6)
+        self.assertTrue(all("embedding" not in chunk for chunk in call.args[0]))
+
+    def test_index_run_rolls_back_sqlite_writes_on_failure(self):
+        (self.fixture_dir / "a.md").write_text("Alpha beta gamma delta.")
+        (self.fixture_dir / "b.md").write_text("Epsilon zeta eta theta.")
+
+        mock_qdrant = MagicMock()
+        mock_qdrant.delete_chunks.side_effect = RuntimeError("vector store down")
+        service, store, _ = self._build_service(mock_qdrant=mock_qdrant)
+        service.index_folder(str(self.fixture_dir))
+
+        (self.fixture_dir / "a.md").write_text("Alpha rewritten with new words entirely.")
+        (self.fixture_dir / "b.md").unlink()
+        with self.assertRaises(RuntimeError):
+            service.index_folder(str(self.fixture_dir))
+
+        fingerprints = store.get_document_fingerprints()
+        self.assertEqual(len(fingerprints), 2)
+        self.assertEqual(store.get_status_summary()["last_run"]["files_indexed"], 2)
+
+    def test_index_version_is_bumped_only_when_the_index_changes(self):
+        (self.fixture_dir / "a.md").write_text("Alpha beta gamma delta.")
+
+        service, store, _ = self._build_service()
+        self.assertEqual(store.get_index_version(), 0)
+
+        service.index_folder(str(self.fixture_dir))
+        self.assertEqual(store.get_index_version(), 1)
+
+        service.index_folder(str(self.fixture_dir))
+        self.assertEqual(store.get_index_version(), 1)
+
+        (self.fixture_dir / "a.md").unlink()
+        service.index_folder(str(self.fixture_dir))
+        self.assertEqual(store.get_index_version(), 2)
+
+    def test_concurrent_index_run_is_refused(self):
+        (self.fixture_dir / "a.md").write_text("Alpha beta gamma delta.")
+
+        service, store, _ = self._build_service()
+        refused = []
+
+        def progress(update):
+            if not refused:
+                try:
+                    service.index_folder(str(self.fixture_dir))
+                except ValueError as error:
+                    refused.append(str(error))
+
+        result = service.index_folder(str(self.fixture_dir), progress=progress)
+
+        self.assertEqual(refused, ["index already running"])
+        self.assertEqual(result["files_indexed"], 1)
+        self.assertEqual(service.index_folder(str(self.fixture_dir))["files_skipped"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,259 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class LocalVectorIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.index_dir = str(Path(self.tmpdir) / "vectors")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _chunk(self, chunk_id, embedding, note_path="doc.md"):
+        return {"chunk_id": chunk_id, "embedding": embedding, "payload": {"note_path": note_path}}
+
+    def test_search_returns_exact_cosine_top_k(self):
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        index = LocalVectorIndex(self.index_dir)
+        index.ensure_collection(vector_size=3)
+        index.upsert_chunks(
+            [
+                self._chunk("a", [1.0, 0.0, 0.0]),
+                self._chunk("b", [0.7, 0.7, 0.0]),
+                self._chunk("c", [0.0, 0.0, 5.0]),
+            ]
+        )
+
+        results = index.search(query_vector=[2.0, 0.1, 0.0], top_k=2)
+
+        self.assertEqual([r["chunk_id"] for r in results], ["a", "b"])
+        self.assertAlmostEqual(results[0]["score"], 0.99875, places=4)
+        self.assertEqual(results[0]["payload"], {"note_path": "doc.md"})
+
+    def test_upsert_accepts_ndarray_and_overwrites_existing_ids(self):
+        import numpy as np
+
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        index = LocalVectorIndex(self.index_dir)
+        index.ensure_collection(vector_size=2)
+        index.upsert_chunks([{"chunk_id": "a", "payload": {}}], vectors=np.array([[1.0, 0.0]]))
+        index.upsert_chunks([{"chunk_id": "a", "payload": {"v": 2}}], vectors=np.array([[0.0, 1.0]]))
+
+        results = index.search(query_vector=[0.0, 1.0], top_k=5)
+
+        self.assertEqual(index.count(), 1)
+        self.assertEqual(results[0]["chunk_id"], "a")
+        self.assertAlmostEqual(results[0]["score"], 1.0, places=5)
+        self.assertEqual(results[0]["payload"], {"v": 2})
+
+    def test_delete_chunks_excludes_ids_from_search_and_reuses_rows(self):
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        index = LocalVectorIndex(self.index_dir)
+        index.ensure_collection(vector_size=2)
+        index.upsert_chunks([self._chunk("a", [1.0, 0.0]), self._chunk("b", [0.0, 1.0])])
+        index.delete_chunks(["a", "missing"])
+
+        self.assertEqual([r["chunk_id"] for r in index.search([1.0, 0.0], top_k=5)], ["b"])
+
+        index.upsert_chunks([self._chunk("c", [1.0, 0.0])])
+        self.assertEqual(index._row_by_id["c"], 0)
+
+    def test_index_persists_across_instances(self):
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        index = LocalVectorIndex(self.index_dir)
+        index.ensure_collection(vector_size=2)
+        index.upsert_chunks([self._chunk("a", [1.0, 0.0]), self._chunk("b", [0.0, 1.0])])
+        index.delete_chunks(["b"])
+
+        reopened = LocalVectorIndex(self.index_dir)
+        results = reopened.search([0.0, 1.0], top_k=5)
+
+        self.assertEqual([r["chunk_id"] for r in results], ["a"])
+        with self.assertRaises(ValueError):
+            reopened.ensure_collection(vector_size=3)
+
+    def test_writes_share_one_wal_connection(self):
+        from unittest.mock import patch
+
+        from mind_lite.rag import local_index
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        with patch.object(local_index.sqlite3, "connect", wraps=local_index.sqlite3.connect) as connect:
+            index = LocalVectorIndex(self.index_dir)
+            index.ensure_collection(vector_size=2)
+            for i in range(5):
+                index.upsert_chunks([self._chunk(f"c{i}", [1.0, float(i)])])
+            index.delete_chunks(["c0"])
+
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual(index._connection().execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        index.close()
+        self.assertEqual([r["chunk_id"] for r in LocalVectorIndex(self.index_dir).search([1.0, 0.0], top_k=1)], ["c1"])
+
+    def test_move_chunks_reuses_stored_vectors(self):
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        index = LocalVectorIndex(self.index_dir)
+        index.ensure_collection(vector_size=2)
+        index.upsert_chunks([self._chunk("old:0", [0.0, 1.0], "old.md")])
+
+        missing = index.move_chunks(
+            [
+                {"old_chunk_id": "old:0", "chunk_id": "new:0", "payload": {"note_path": "new.md"}},
+                {"old_chunk_id": "old:1", "chunk_id": "new:1", "payload": {"note_path": "new.md"}},
+            ]
+        )
+
+        results = index.search([0.0, 1.0], top_k=5)
+        self.assertEqual(missing, ["new:1"])
+        self.assertEqual([r["chunk_id"] for r in results], ["new:0"])
+        self.assertEqual(results[0]["payload"], {"note_path": "new.md"})
+
+    def test_search_on_empty_index_returns_empty_list(self):
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        index = LocalVectorIndex(self.index_dir)
+        index.ensure_collection(vector_size=2)
+
+        self.assertEqual(index.search([1.0, 0.0], top_k=3), [])
+
+    def test_create_vector_index_selects_local_backend(self):
+        from mind_lite.rag.config import RagConfig
+        from mind_lite.rag.local_index import LocalVectorIndex
+        from mind_lite.rag.vector_index import create_vector_index
+
+        cfg = RagConfig(
+            qdrant_url="http://unused",
+            collection_name="chunks",
+            sqlite_path=str(Path(self.tmpdir) / "rag.db"),
+            embed_model="m",
+            vector_backend="local",
+            local_index_path=self.index_dir,
+        )
+
+        self.assertIsInstance(create_vector_index(cfg), LocalVectorIndex)
+
+        with self.assertRaises(ValueError):
+            create_vector_index(RagConfig("u", "c", "p", "m", vector_backend="faiss"))
+
+    def _clustered_vectors(self, count, dims=16, clusters=8, seed=1):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        centers = rng.normal(size=(clusters, dims))
+        labels = rng.integers(0, clusters, size=count)
+        return (centers[labels] + 0.05 * rng.normal(size=(count, dims))).astype(np.float32)
+
+    def _ivf_index(self, **kwargs):
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        options = {"index_type": "ivf", "nlist": 8, "nprobe": 2, "ivf_min_points": 100}
+        options.update(kwargs)
+        index = LocalVectorIndex(self.index_dir, **options)
+        index.ensure_collection(vector_size=16)
+        return index
+
+    def test_ivf_trains_after_min_points_and_matches_flat_top_hit(self):
+        vectors = self._clustered_vectors(400)
+        index = self._ivf_index()
+        index.upsert_chunks([{"chunk_id": "seed", "payload": {}}], vectors=vectors[:1])
+        self.assertIsNone(index._ivf)
+
+        index.upsert_chunks(
+            [{"chunk_id": f"c{i}", "payload": {}} for i in range(1, 400)], vectors=vectors[1:]
+        )
+
+        self.assertIsNotNone(index._ivf)
+        self.assertTrue((Path(self.index_dir) / "centroids.npy").exists())
+        for i in (3, 150, 399):
+            results = index.search(vectors[i], top_k=1)
+            self.assertEqual(results[0]["chunk_id"], f"c{i}")
+
+    def test_ivf_nprobe_covering_all_lists_is_exact(self):
+        import numpy as np
+
+        vectors = self._clustered_vectors(300)
+        index = self._ivf_index()
+        index.upsert_chunks(
+            [{"chunk_id": f"c{i}", "payload": {}} for i in range(300)], vectors=vectors
+        )
+        query = np.random.default_rng(7).normal(size=16)
+
+        exact = np.argsort(-(vectors / np.linalg.norm(vectors, axis=1, keepdims=True)) @ query)[:10]
+        results = index.search(query, top_k=10, nprobe=index._ivf.nlist)
+
+        self.assertEqual([r["chunk_id"] for r in results], [f"c{i}" for i in exact])
+
+    def test_ivf_inserts_deletes_and_compaction(self):
+        vectors = self._clustered_vectors(300)
+        index = self._ivf_index(compact_ratio=0.5, ivf_retrain_growth=100.0)
+        index.upsert_chunks(
+            [{"chunk_id": f"c{i}", "payload": {}} for i in range(200)], vectors=vectors[:200]
+        )
+        index.upsert_chunks(
+            [{"chunk_id": f"c{i}", "payload": {}} for i in range(200, 300)], vectors=vectors[200:]
+        )
+        self.assertEqual(index.search(vectors[250], top_k=1)[0]["chunk_id"], "c250")
+
+        index.delete_chunks(["c250", "c10"])
+        self.assertEqual(index._ivf.tombstones, 2)
+        all_lists = index._ivf.nlist
+        ids = [r["chunk_id"] for r in index.search(vectors[250], top_k=300, nprobe=all_lists)]
+        self.assertNotIn("c250", ids)
+        self.assertEqual(len(ids), 298)
+
+        index.compact()
+        self.assertEqual(index._ivf.tombstones, 0)
+        self.assertEqual(index._ivf.entries, 298)
+
+    def test_ivf_reupserted_and_readded_rows_are_returned_once(self):
+        vectors = self._clustered_vectors(200)
+        index = self._ivf_index(nlist=4)
+        index.upsert_chunks(
+            [{"chunk_id": f"c{i}", "payload": {}} for i in range(200)], vectors=vectors
+        )
+        index.upsert_chunks(
+            [{"chunk_id": f"c{i}", "payload": {}} for i in range(5)], vectors=vectors[:5]
+        )
+        index.delete_chunks(["c5"])
+        index.upsert_chunks([{"chunk_id": "c5", "payload": {}}], vectors=vectors[5:6])
+
+        for query in (vectors[0], vectors[5]):
+            ids = [r["chunk_id"] for r in index.search(query, top_k=20, nprobe=4)]
+            self.assertEqual(len(ids), len(set(ids)))
+            self.assertEqual(len(ids), 20)
+        self.assertEqual(index._ivf.tombstones, 1)
+
+    def test_ivf_state_persists_across_instances(self):
+        vectors = self._clustered_vectors(300)
+        index = self._ivf_index()
+        index.upsert_chunks(
+            [{"chunk_id": f"c{i}", "payload": {}} for i in range(300)], vectors=vectors
+        )
+        expected = index._ivf.assignments[:300].copy()
+
+        reopened = self._ivf_index()
+
+        self.assertIsNotNone(reopened._ivf)
+        self.assertEqual(reopened._ivf.assignments[:300].tolist(), expected.tolist())
+        self.assertEqual(reopened.search(vectors[42], top_k=1)[0]["chunk_id"], "c42")
+
+    def test_ivf_rejects_invalid_options(self):
+        from mind_lite.rag.local_index import LocalVectorIndex
+
+        with self.assertRaises(ValueError):
+            LocalVectorIndex(self.index_dir, index_type="hnsw")
+        with self.assertRaises(ValueError):
+            LocalVectorIndex(self.index_dir, index_type="ivf", nprobe=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
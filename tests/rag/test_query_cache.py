@@ -0,0 +1,53 @@
+import unittest
+
+
+class LRUCacheTests(unittest.TestCase):
+    def test_get_returns_none_on_miss_and_tracks_stats(self):
+        from mind_lite.rag.query_cache import LRUCache
+
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(
+            cache.stats(),
+            {"hits": 1, "misses": 1, "evictions": 0, "entries": 1, "max_entries": 2},
+        )
+
+    def test_put_evicts_least_recently_used(self):
+        from mind_lite.rag.query_cache import LRUCache
+
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_entries_expire_after_ttl(self):
+        from mind_lite.rag.query_cache import LRUCache
+
+        now = [100.0]
+        cache = LRUCache(max_entries=4, ttl_seconds=10, clock=lambda: now[0])
+        cache.put("a", 1)
+
+        now[0] = 105.0
+        self.assertEqual(cache.get("a"), 1)
+        now[0] = 111.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_rejects_non_positive_size(self):
+        from mind_lite.rag.query_cache import LRUCache
+
+        with self.assertRaises(ValueError):
+            LRUCache(max_entries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
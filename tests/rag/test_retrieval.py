@@ -99,6 +99,29 @@ class RetrievalTests(unittest.TestCase):
         self.assertEqual(results[0]["score"], 0.95)
         self.assertEqual(results[1]["score"], 0.85)
 
+    def test_retrieve_records_query_stage_timings(self):
+        from unittest.mock import patch
+
+        from mind_lite.metrics import STAGE_SECONDS
+        from mind_lite.rag.retrieval import RetrievalService
+
+        store = MagicMock()
+        store.get_index_version.return_value = 1
+        store.get_chunks_by_ids.return_value = {"c1": {"note_path": "notes/a.md", "content": "Alpha"}}
+        mock_qdrant = MagicMock()
+        mock_qdrant.search.return_value = [{"chunk_id": "c1", "score": 0.9, "payload": {}}]
+        mock_embedder = MagicMock()
+        mock_embedder.embed_query.return_value = [0.1] * 384
+        service = RetrievalService(sqlite_store=store, qdrant_index=mock_qdrant, embedder=mock_embedder)
+
+        with patch.object(STAGE_SECONDS, "_values", {}):
+            service.retrieve("alpha", top_k=1)
+            service.retrieve("alpha", top_k=1)
+
+            self.assertEqual(STAGE_SECONDS.count(pipeline="query", stage="embed_query"), 1)
+            self.assertEqual(STAGE_SECONDS.count(pipeline="query", stage="vector_search"), 1)
+            self.assertEqual(STAGE_SECONDS.count(pipeline="query", stage="hydrate"), 1)
+
     def test_retrieve_citation_includes_required_fields(self):
         from mind_lite.rag.retrieval import RetrievalService
         from mind_lite.rag.sqlite_store import SqliteStore
@@ -178,6 +201,215 @@ class RetrievalTests(unittest.TestCase):
 
         self.assertEqual(results, [])
 
+    def test_retrieve_hydrates_all_hits_with_one_store_lookup(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        mock_store = MagicMock()
+        mock_store.get_chunks_by_ids.return_value = {
+            "b:0": {"note_path": "b.md", "content": "beta"},
+            "a:0": {"note_path": "a.md", "content": "alpha"},
+        }
+        mock_qdrant = MagicMock()
+        mock_qdrant.search.return_value = [
+            {"chunk_id": "a:0", "score": 0.9, "payload": {}},
+            {"chunk_id": "gone:0", "score": 0.8, "payload": {}},
+            {"chunk_id": "b:0", "score": 0.7, "payload": {}},
+        ]
+        mock_embedder = MagicMock()
+        mock_embedder.embed_query.return_value = [0.1] * 384
+
+        service = RetrievalService(
+            sqlite_store=mock_store,
+            qdrant_index=mock_qdrant,
+            embedder=mock_embedder,
+        )
+
+        results = service.retrieve("query", top_k=3)
+
+        mock_store.get_chunks_by_ids.assert_called_once_with(["a:0", "gone:0", "b:0"])
+        self.assertEqual([r["chunk_id"] for r in results], ["a:0", "b:0"])
+        self.assertEqual(results[0]["excerpt"], "alpha")
+
+    def test_retrieve_without_hydration_trusts_payload(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        mock_store = MagicMock()
+        mock_store.get_chunks_by_ids.return_value = {
+            "b:0": {"note_path": "b.md", "content": "beta from sqlite"},
+        }
+        mock_qdrant = MagicMock()
+        mock_qdrant.search.return_value = [
+            {"chunk_id": "a:0", "score": 0.9, "payload": {"note_path": "a.md", "content": "alpha"}},
+            {"chunk_id": "b:0", "score": 0.7, "payload": {"note_path": "b.md"}},
+        ]
+        mock_embedder = MagicMock()
+        mock_embedder.embed_query.return_value = [0.1] * 384
+
+        service = RetrievalService(
+            sqlite_store=mock_store,
+            qdrant_index=mock_qdrant,
+            embedder=mock_embedder,
+            hydrate=False,
+        )
+
+        results = service.retrieve("query", top_k=2)
+
+        mock_store.get_chunks_by_ids.assert_called_once_with(["b:0"])
+        self.assertEqual(results[0]["path"], "a.md")
+        self.assertEqual(results[0]["excerpt"], "alpha")
+        self.assertEqual(results[1]["excerpt"], "beta from sqlite")
+
+
+    def _store_with_chunks(self, contents):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(Path(self.tmpdir) / "test.db"))
+        store.init_schema()
+        for note, content in contents.items():
+            store.upsert_document(note, f"hash_{note}", 1)
+            store.replace_chunks_for_document(
+                note,
+                [{"chunk_id": f"{note}:0", "note_path": note, "chunk_index": 0, "content": content, "start_offset": 0, "end_offset": 1, "token_count": 1}],
+            )
+        return store
+
+    def test_lexical_mode_skips_embedder_and_matches_identifiers(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        store = self._store_with_chunks(
+            {"a.md": "Kickoff notes for ATLAS-42 launch.", "b.md": "General planning notes."}
+        )
+        mock_qdrant = MagicMock()
+        mock_embedder = MagicMock()
+
+        service = RetrievalService(sqlite_store=store, qdrant_index=mock_qdrant, embedder=mock_embedder)
+        results = service.retrieve("ATLAS-42", top_k=5, mode="lexical")
+
+        self.assertEqual([r["chunk_id"] for r in results], ["a.md:0"])
+        self.assertEqual(results[0]["excerpt"], "Kickoff notes for ATLAS-42 launch.")
+        mock_embedder.embed_query.assert_not_called()
+        mock_qdrant.search.assert_not_called()
+
+    def test_hybrid_mode_fuses_vector_and_lexical_rankings(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        store = self._store_with_chunks(
+            {
+                "a.md": "Semantic overview of the roadmap.",
+                "b.md": "Ticket ATLAS-42 roadmap owner.",
+                "c.md": "Unrelated gardening notes.",
+            }
+        )
+        mock_qdrant = MagicMock()
+        mock_qdrant.search.return_value = [
+            {"chunk_id": "c.md:0", "score": 0.9, "payload": {}},
+            {"chunk_id": "b.md:0", "score": 0.8, "payload": {}},
+            {"chunk_id": "a.md:0", "score": 0.7, "payload": {}},
+        ]
+        mock_embedder = MagicMock()
+        mock_embedder.embed_query.return_value = [0.1] * 384
+
+        service = RetrievalService(
+            sqlite_store=store, qdrant_index=mock_qdrant, embedder=mock_embedder, mode="hybrid"
+        )
+        results = service.retrieve("ATLAS-42 roadmap", top_k=2)
+
+        self.assertEqual([r["chunk_id"] for r in results], ["b.md:0", "a.md:0"])
+        self.assertAlmostEqual(results[0]["score"], 1 / 62 + 1 / 61)
+        mock_qdrant.search.assert_called_once_with(query_vector=[0.1] * 384, top_k=8)
+
+    def test_hybrid_mode_reports_the_vector_error_when_both_searches_fail(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        store = MagicMock()
+        store.search_lexical.side_effect = RuntimeError("fts unavailable")
+        mock_qdrant = MagicMock()
+        mock_qdrant.search.side_effect = ConnectionError("vector index unreachable")
+        mock_embedder = MagicMock()
+        mock_embedder.embed_query.return_value = [0.1] * 384
+
+        service = RetrievalService(
+            sqlite_store=store, qdrant_index=mock_qdrant, embedder=mock_embedder, mode="hybrid"
+        )
+
+        with self.assertRaisesRegex(ConnectionError, "vector index unreachable"):
+            service.retrieve("ATLAS-42", top_k=2)
+        store.search_lexical.assert_called_once()
+
+    def test_rejects_unknown_mode(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        with self.assertRaises(ValueError):
+            RetrievalService(sqlite_store=MagicMock(), qdrant_index=MagicMock(), embedder=MagicMock(), mode="sparse")
+
+
+    def test_repeated_queries_are_served_from_cache_until_index_version_changes(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        store = self._store_with_chunks({"a.md": "Alpha notes."})
+        mock_qdrant = MagicMock()
+        mock_qdrant.search.return_value = [{"chunk_id": "a.md:0", "score": 0.9, "payload": {}}]
+        mock_embedder = MagicMock()
+        mock_embedder.embed_query.return_value = [0.1] * 384
+
+        service = RetrievalService(sqlite_store=store, qdrant_index=mock_qdrant, embedder=mock_embedder)
+        first = service.retrieve("alpha", top_k=3)
+        first[0]["excerpt"] = "mutated by caller"
+        second = service.retrieve("alpha", top_k=3)
+
+        self.assertEqual(second[0]["excerpt"], "Alpha notes.")
+        self.assertEqual(mock_qdrant.search.call_count, 1)
+
+        store.bump_index_version()
+        service.retrieve("alpha", top_k=3)
+
+        self.assertEqual(mock_qdrant.search.call_count, 2)
+        self.assertEqual(mock_embedder.embed_query.call_count, 1)
+        stats = service.cache_stats()
+        self.assertEqual(stats["query_vector"]["hits"], 1)
+        self.assertEqual(stats["retrieval_result"]["hits"], 1)
+
+    def test_result_computed_across_an_index_change_is_not_cached(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        store = self._store_with_chunks({"a.md": "Alpha notes."})
+        mock_qdrant = MagicMock()
+        mock_embedder = MagicMock()
+        mock_embedder.embed_query.return_value = [0.1] * 384
+        service = RetrievalService(sqlite_store=store, qdrant_index=mock_qdrant, embedder=mock_embedder)
+
+        def search_while_index_changes(query_vector, top_k):
+            if mock_qdrant.search.call_count == 1:
+                store.bump_index_version()
+                service.retrieve("other", top_k=top_k)
+            return [{"chunk_id": "a.md:0", "score": 0.9, "payload": {}}]
+
+        mock_qdrant.search.side_effect = search_while_index_changes
+        service.retrieve("alpha", top_k=3)
+        service.retrieve("alpha", top_k=3)
+
+        self.assertEqual(mock_qdrant.search.call_count, 3)
+        self.assertEqual(service.cache_stats()["retrieval_result"]["hits"], 0)
+
+    def test_cache_can_be_disabled(self):
+        from mind_lite.rag.retrieval import RetrievalService
+
+        mock_store = MagicMock()
+        mock_store.get_chunks_by_ids.return_value = {}
+        mock_qdrant = MagicMock()
+        mock_qdrant.search.return_value = []
+        mock_embedder = MagicMock()
+        mock_embedder.embed_query.return_value = [0.1] * 384
+
+        service = RetrievalService(
+            sqlite_store=mock_store, qdrant_index=mock_qdrant, embedder=mock_embedder, query_cache_size=0
+        )
+        service.retrieve("alpha")
+        service.retrieve("alpha")
+
+        self.assertEqual(mock_embedder.embed_query.call_count, 2)
+        self.assertEqual(service.cache_stats(), {})
+
 
 if __name__ == "__main__":
     unittest.main()
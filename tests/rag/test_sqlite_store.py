@@ -176,6 +176,240 @@ class SQLiteStoreTests(unittest.TestCase):
         self.assertEqual(status["chunks_count"], 1)
         self.assertEqual(status["last_run"]["status"], "completed")
 
+    def test_document_fingerprints_track_file_stat(self):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+
+        store.upsert_document("notes/a.md", "hash_a", 10, mtime_ns=111, size_bytes=42)
+        store.upsert_document("notes/b.md", "hash_b", 20)
+        store.touch_document("notes/b.md", mtime_ns=222, size_bytes=84)
+
+        fingerprints = store.get_document_fingerprints()
+
+        self.assertEqual(
+            fingerprints["notes/a.md"],
+            {"content_hash": "hash_a", "mtime_ns": 111, "size_bytes": 42},
+        )
+        self.assertEqual(
+            fingerprints["notes/b.md"],
+            {"content_hash": "hash_b", "mtime_ns": 222, "size_bytes": 84},
+        )
+
+    def test_init_schema_adds_stat_columns_to_existing_database(self):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute(
+            """
+            CREATE TABLE documents (
+                note_path TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                token_count INTEGER NOT NULL,
+                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        conn.execute("INSERT INTO documents (note_path, content_hash, token_count) VALUES ('a.md', 'h', 1)")
+        conn.commit()
+        conn.close()
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+
+        fingerprints = store.get_document_fingerprints()
+        self.assertEqual(fingerprints["a.md"], {"content_hash": "h", "mtime_ns": None, "size_bytes": None})
+
+    def test_delete_documents_removes_rows_and_returns_chunk_ids(self):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+
+        for name in ("a", "b"):
+            store.upsert_document(f"notes/{name}.md", f"hash_{name}", 1)
+            store.replace_chunks_for_document(
+                f"notes/{name}.md",
+                [{"chunk_id": f"{name}:0:h", "note_path": f"notes/{name}.md", "chunk_index": 0, "content": "x", "start_offset": 0, "end_offset": 1, "token_count": 1}],
+            )
+
+        deleted = store.delete_documents(["notes/a.md"])
+
+        self.assertEqual(deleted, ["a:0:h"])
+        status = store.get_status_summary()
+        self.assertEqual(status["documents_count"], 1)
+        self.assertEqual(status["chunks_count"], 1)
+
+    def test_rename_document_rewrites_paths_and_chunk_ids(self):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+
+        store.upsert_document("old.md", "hash", 1, mtime_ns=1, size_bytes=1)
+        store.replace_chunks_for_document(
+            "old.md",
+            [{"chunk_id": "old.md:0:h", "note_path": "old.md", "chunk_index": 0, "content": "x", "start_offset": 0, "end_offset": 1, "token_count": 1}],
+        )
+
+        store.rename_document("old.md", "new.md", {"old.md:0:h": "new.md:0:h"}, mtime_ns=2, size_bytes=3)
+
+        self.assertEqual(
+            store.get_document_fingerprints(),
+            {"new.md": {"content_hash": "hash", "mtime_ns": 2, "size_bytes": 3}},
+        )
+        self.assertEqual(store.get_chunk_ids_for_document("new.md"), ["new.md:0:h"])
+        self.assertEqual(store.get_chunks_for_document("old.md"), [])
+
+    def test_get_chunks_by_ids_returns_known_rows_on_reused_connection(self):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+        store.upsert_document("a.md", "hash", 1)
+        store.replace_chunks_for_document(
+            "a.md",
+            [
+                {"chunk_id": f"a.md:{i}:h", "note_path": "a.md", "chunk_index": i, "content": f"c{i}", "start_offset": 0, "end_offset": 1, "token_count": 1}
+                for i in range(3)
+            ],
+        )
+
+        chunks = store.get_chunks_by_ids(["a.md:2:h", "missing", "a.md:0:h", "a.md:2:h"])
+
+        self.assertEqual(set(chunks), {"a.md:2:h", "a.md:0:h"})
+        self.assertEqual(chunks["a.md:2:h"]["content"], "c2")
+        self.assertEqual(store.get_chunks_by_ids([]), {})
+        store.get_chunks_by_ids(["a.md:1:h"])
+        self.assertEqual(store.open_connections, 1)
+
+    def test_short_lived_threads_do_not_leak_connections(self):
+        import threading
+
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(self.db_path), pool_size=2)
+        store.init_schema()
+        versions = []
+
+        def read():
+            versions.append(store.get_index_version())
+
+        for _ in range(20):
+            threads = [threading.Thread(target=read) for _ in range(15)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(versions, [0] * 300)
+        self.assertLessEqual(store.open_connections, 2)
+        store.close()
+        self.assertEqual(store.open_connections, 0)
+
+    def test_connections_use_wal_and_tuned_pragmas(self):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(self.db_path), cache_size_kib=2048, mmap_size=1_048_576)
+        store.init_schema()
+        with store._connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -2048)
+        store.close()
+
+    def test_transaction_groups_writes_and_rolls_back_on_error(self):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+
+        with self.assertRaises(RuntimeError):
+            with store.transaction():
+                store.upsert_document("a.md", "hash_a", 1)
+                store.upsert_document("b.md", "hash_b", 1)
+                raise RuntimeError("boom")
+        self.assertEqual(store.get_document_fingerprints(), {})
+
+        with store.transaction():
+            store.upsert_document("a.md", "hash_a", 1)
+            reader = sqlite3.connect(str(self.db_path))
+            self.assertEqual(reader.execute("SELECT COUNT(*) FROM documents").fetchone()[0], 0)
+            reader.close()
+        self.assertEqual(set(store.get_document_fingerprints()), {"a.md"})
+
+
+    def test_init_schema_records_version_and_creates_indexes(self):
+        from mind_lite.rag.sqlite_store import SCHEMA_VERSION, SqliteStore
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+        store.init_schema()
+
+        conn = sqlite3.connect(str(self.db_path))
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM chunks WHERE note_path = ?", ("a.md",)
+        ).fetchall()
+        conn.close()
+
+        self.assertEqual(store.schema_version(), SCHEMA_VERSION)
+        self.assertIn("idx_chunks_note_path", indexes)
+        self.assertTrue(any("idx_chunks_note_path" in row[-1] for row in plan))
+
+    def test_init_schema_upgrades_unversioned_database_in_place(self):
+        from mind_lite.rag.sqlite_store import SCHEMA_VERSION, SqliteStore
+
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute(
+            "CREATE TABLE documents (note_path TEXT PRIMARY KEY, content_hash TEXT NOT NULL, token_count INTEGER NOT NULL, indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.execute(
+            "CREATE TABLE chunks (chunk_id TEXT PRIMARY KEY, note_path TEXT NOT NULL, chunk_index INTEGER NOT NULL, content TEXT NOT NULL, start_offset INTEGER NOT NULL, end_offset INTEGER NOT NULL, token_count INTEGER NOT NULL)"
+        )
+        conn.execute("INSERT INTO documents (note_path, content_hash, token_count) VALUES ('a.md', 'h', 1)")
+        conn.execute("INSERT INTO chunks VALUES ('a.md:0:h', 'a.md', 0, 'x', 0, 1, 1)")
+        conn.commit()
+        conn.close()
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+
+        self.assertEqual(store.schema_version(), SCHEMA_VERSION)
+        self.assertEqual(store.get_chunk_ids_for_document("a.md"), ["a.md:0:h"])
+        self.assertEqual([hit["chunk_id"] for hit in store.search_lexical("x")], ["a.md:0:h"])
+        self.assertEqual(store.delete_documents(["a.md"]), ["a.md:0:h"])
+        self.assertEqual(store.search_lexical("x"), [])
+
+
+    def test_lexical_index_keys_on_explicit_chunk_id_column_and_survives_vacuum(self):
+        from mind_lite.rag.sqlite_store import SqliteStore
+
+        store = SqliteStore(str(self.db_path))
+        store.init_schema()
+        for name, words in (("a.md", "alpha apple"), ("b.md", "bravo banana"), ("c.md", "charlie cherry")):
+            store.upsert_document(name, f"hash_{name}", 2)
+            store.replace_chunks_for_document(
+                name,
+                [{"chunk_id": f"{name}:0:h", "note_path": name, "chunk_index": 0, "content": words, "start_offset": 0, "end_offset": 1, "token_count": 2}],
+            )
+        store.delete_documents(["a.md"])
+        store.close()
+
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("VACUUM")
+        conn.close()
+
+        conn = sqlite3.connect(str(self.db_path))
+        columns = {row[1]: row for row in conn.execute("PRAGMA table_info(chunks)")}
+        fts_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'chunks_fts'").fetchone()[0]
+        conn.close()
+
+        self.assertEqual((columns["id"][2], columns["id"][5]), ("INTEGER", 1))
+        self.assertIn("content_rowid = 'id'", fts_sql)
+        self.assertEqual([hit["chunk_id"] for hit in store.search_lexical("cherry")], ["c.md:0:h"])
+        self.assertEqual([hit["chunk_id"] for hit in store.search_lexical("banana")], ["b.md:0:h"])
 
 if __name__ == "__main__":
     unittest.main()
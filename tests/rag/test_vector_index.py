@@ -113,6 +113,55 @@ class VectorIndexTests(unittest.TestCase):
         call_args = mock_client.delete.call_args
         self.assertEqual(call_args.kwargs["points_selector"].points, ["doc:0:hash1", "doc:1:hash2"])
 
+    def test_move_chunks_reuses_vectors_under_new_ids(self):
+        from mind_lite.rag.vector_index import QdrantIndex
+
+        mock_client = MagicMock()
+        record = MagicMock()
+        record.id = "old.md:0:h"
+        record.vector = [0.3] * 384
+        mock_client.retrieve.return_value = [record]
+
+        index = QdrantIndex(client=mock_client, collection_name="test_collection")
+        missing = index.move_chunks(
+            [
+                {"old_chunk_id": "old.md:0:h", "chunk_id": "new.md:0:h", "payload": {"note_path": "new.md"}},
+                {"old_chunk_id": "old.md:1:h", "chunk_id": "new.md:1:h", "payload": {"note_path": "new.md"}},
+            ]
+        )
+
+        self.assertEqual(missing, ["new.md:1:h"])
+        points = mock_client.upsert.call_args.kwargs["points"]
+        self.assertEqual([p.id for p in points], ["new.md:0:h"])
+        self.assertEqual(points[0].vector, [0.3] * 384)
+        self.assertEqual(
+            mock_client.delete.call_args.kwargs["points_selector"].points,
+            ["old.md:0:h", "old.md:1:h"],
+        )
+
+    def test_upsert_chunks_passes_array_batch_without_point_structs(self):
+        import numpy as np
+
+        from mind_lite.rag.vector_index import QdrantIndex
+
+        mock_client = MagicMock()
+        vectors = np.ones((2, 4), dtype=np.float32)
+
+        index = QdrantIndex(client=mock_client, collection_name="test_collection")
+        index.upsert_chunks(
+            [
+                {"chunk_id": "doc:0:h1", "payload": {"note_path": "doc.md"}},
+                {"chunk_id": "doc:1:h2", "payload": {"note_path": "doc.md"}},
+            ],
+            vectors=vectors,
+        )
+
+        mock_client.upsert.assert_not_called()
+        kwargs = mock_client.upload_collection.call_args.kwargs
+        self.assertIs(kwargs["vectors"], vectors)
+        self.assertEqual(kwargs["ids"], ["doc:0:h1", "doc:1:h2"])
+        self.assertEqual(kwargs["payload"], [{"note_path": "doc.md"}, {"note_path": "doc.md"}])
+
 
 if __name__ == "__main__":
     unittest.main()
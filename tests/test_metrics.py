@@ -0,0 +1,96 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets_sum_and_count(self):
+        from mind_lite.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, route="GET /runs")
+        histogram.observe(0.5, route="GET /runs")
+        histogram.observe(2.0, route="GET /runs")
+
+        lines = registry.render()
+
+        self.assertEqual(lines[:2], ["# HELP latency_seconds Latency", "# TYPE latency_seconds histogram"])
+        self.assertIn('latency_seconds_bucket{route="GET /runs",le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{route="GET /runs",le="1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{route="GET /runs",le="+Inf"} 3', lines)
+        self.assertIn('latency_seconds_sum{route="GET /runs"} 2.55', lines)
+        self.assertIn('latency_seconds_count{route="GET /runs"} 3', lines)
+
+    def test_counter_and_gauge_track_labelled_values(self):
+        from mind_lite.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests", ("outcome",))
+        gauge = registry.gauge("entries", "Entries")
+        counter.inc(outcome="error")
+        counter.inc(2, outcome="error")
+        gauge.set(5)
+        gauge.dec()
+
+        self.assertEqual(counter.value(outcome="error"), 3)
+        self.assertIn('requests_total{outcome="error"} 3', registry.render())
+        self.assertIn("entries 4", registry.render())
+        with self.assertRaises(ValueError):
+            counter.inc(-1, outcome="error")
+        with self.assertRaises(ValueError):
+            counter.inc(route="x")
+
+    def test_registering_an_existing_name_returns_the_same_metric(self):
+        from mind_lite.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests")
+
+        self.assertIs(registry.counter("requests_total", "Requests"), counter)
+        with self.assertRaises(ValueError):
+            registry.gauge("requests_total", "Requests")
+
+    def test_label_values_are_escaped(self):
+        from mind_lite.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors", ("reason",)).inc(reason='bad "quote"\n')
+
+        self.assertIn('errors_total{reason="bad \\"quote\\"\\n"} 1', registry.render())
+
+    def test_concurrent_observations_are_not_lost(self):
+        from mind_lite.metrics import MetricsRegistry
+
+        histogram = MetricsRegistry().histogram("work_seconds", "Work")
+
+        def observe():
+            for _ in range(1000):
+                histogram.observe(0.01)
+
+        threads = [threading.Thread(target=observe) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(histogram.count(), 8000)
+
+    def test_record_llm_result_counts_outcome_and_usage_per_provider(self):
+        from mind_lite.metrics import LLM_REQUESTS, LLM_TOKENS, record_llm_result
+
+        with patch.object(LLM_REQUESTS, "_values", {}), patch.object(LLM_TOKENS, "_values", {}):
+            record_llm_result(
+                {"success": True, "provider": "lmstudio", "usage": {"prompt_tokens": 12, "completion_tokens": 5}}
+            )
+            record_llm_result({"success": False, "provider": "openrouter", "error": "HTTP 500"})
+
+            self.assertEqual(LLM_REQUESTS.value(provider="lmstudio", outcome="success"), 1)
+            self.assertEqual(LLM_REQUESTS.value(provider="openrouter", outcome="error"), 1)
+            self.assertEqual(LLM_TOKENS.value(provider="lmstudio", kind="prompt"), 12)
+            self.assertEqual(LLM_TOKENS.value(provider="lmstudio", kind="completion"), 5)
+            self.assertEqual(LLM_TOKENS.value(provider="openrouter", kind="prompt"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()